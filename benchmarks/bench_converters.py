@@ -0,0 +1,26 @@
+"""Markdown and HTML exam converters."""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.utils.md_to_json import parse_markdown_exam
+
+
+@pytest.mark.benchmark(group="parse_markdown_exam")
+@pytest.mark.parametrize("questions", [100, 1000, 10000])
+def bench_parse_markdown_exam(benchmark, exam_file, questions):
+    with open(exam_file(questions, "md"), encoding="utf-8") as f:
+        md_text = f.read()
+    title, parsed = benchmark(parse_markdown_exam, md_text)
+    assert len(parsed) == questions
+
+
+@pytest.mark.benchmark(group="parse_html_exam")
+@pytest.mark.parametrize("questions", [100, 1000, 5000])
+def bench_parse_html_exam(benchmark, exam_file, questions):
+    pytest.importorskip("bs4")
+    from src.utils.html_to_json import parse_html_exam
+    with open(exam_file(questions, "html"), encoding="utf-8") as f:
+        html_text = f.read()
+    title, parsed = benchmark(parse_html_exam, html_text)
+    assert len(parsed) == questions
@@ -0,0 +1,31 @@
+"""Grading answers through QuizViewModel."""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("PyQt6")
+
+from src.models.quiz_state import QuizState
+from src.viewmodels.quiz_viewmodel import QuizViewModel
+
+# Questions graded per benchmark; each round grades the next question
+MAX_ROUNDS = 500
+
+
+@pytest.mark.benchmark(group="validate_answer")
+@pytest.mark.parametrize("questions", [100, 1000, 10000])
+def bench_validate_answer(benchmark, qapp, exam_data, stores, questions):
+    outcome_store, scheduler = stores
+    viewmodel = QuizViewModel(QuizState(exam_data(questions)), outcome_store=outcome_store, scheduler=scheduler)
+
+    rounds_run = 0
+
+    def next_question():
+        nonlocal rounds_run
+        rounds_run += 1
+        # The first call can't move yet; later ones move past the question just graded
+        viewmodel.next_question()
+        viewmodel.select_option(0, True)
+
+    benchmark.pedantic(viewmodel.validate_answer, setup=next_question, rounds=min(questions - 1, MAX_ROUNDS))
+    # --benchmark-disable runs a single round
+    assert len(viewmodel.quiz_state.answered_questions) == rounds_run
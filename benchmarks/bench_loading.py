@@ -0,0 +1,29 @@
+"""Opening exam files."""
+import shutil
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("PyQt6")
+
+from src.utils import lazy_exam
+from src.utils.data_loader import load_exam_data
+
+# Each round is a cold open, so the lazy variant builds its offset index every time
+ROUNDS = 5
+
+
+@pytest.mark.benchmark(group="load_exam_data")
+@pytest.mark.parametrize("lazy", [False, True], ids=["eager", "lazy"])
+@pytest.mark.parametrize("questions", [1000, 10000, 50000])
+def bench_load_exam_data(benchmark, qapp, exam_file, tmp_path, monkeypatch, questions, lazy):
+    path = exam_file(questions)
+    # Offset indexes go to a temporary folder instead of data/exam_index/
+    index_dir = tmp_path / "exam_index"
+    monkeypatch.setattr(lazy_exam, "INDEX_DIR", str(index_dir))
+
+    def cold_open():
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+    exam_data = benchmark.pedantic(load_exam_data, args=(path, lazy), setup=cold_open, rounds=ROUNDS)
+    assert len(exam_data['questions']) == questions
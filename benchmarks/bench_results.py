@@ -0,0 +1,30 @@
+"""Saving results files."""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("PyQt6")
+
+from src.utils.outcome_store import OutcomeRecorder
+from src.utils.results_store import ResultsStore
+from src.viewmodels import results_viewmodel
+from src.viewmodels.results_viewmodel import ResultsViewModel
+from src.viewmodels.timer_viewmodel import TimerViewModel
+
+
+@pytest.mark.benchmark(group="save_results_to_file")
+@pytest.mark.parametrize("questions", [100, 1000, 10000])
+def bench_save_results_to_file(benchmark, answered_quiz, stores, tmp_path, monkeypatch, questions):
+    results_dir = tmp_path / "results"
+    results_store = ResultsStore(str(results_dir), store_path=str(tmp_path / "results_aggregate.json"))
+    monkeypatch.setattr(results_viewmodel, "RESULTS_DIR", str(results_dir))
+    monkeypatch.setattr(results_viewmodel, "get_results_store", lambda: results_store)
+    # The item analysis rerun reads data/ on a worker thread and isn't part of the save
+    monkeypatch.setattr(results_viewmodel, "refresh_item_analysis", lambda: None)
+
+    quiz_state = answered_quiz(questions)
+    outcome_store, _ = stores
+    recorder = OutcomeRecorder(outcome_store, quiz_state)
+    viewmodel = ResultsViewModel(quiz_state, TimerViewModel(quiz_state), recorder)
+
+    benchmark(viewmodel.save_results_to_file)
+    assert any(results_dir.glob("quiz_results_*.json"))
@@ -0,0 +1,49 @@
+"""Keystroke latency of the test dialog's SearchIndex."""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.utils.search_index import SearchIndex, parse_query
+
+EXAMS = 20
+
+
+@pytest.fixture(scope="module")
+def exams(exam_file):
+    """Listing entries for generated exams, as ExamRepository.list_exams returns them."""
+    return [{
+        'filename': f"exam_{questions}.json",
+        'filepath': exam_file(questions),
+        'title': f"Synthetic Exam {questions}",
+        'question_count': questions,
+        'type_counts': {'singleChoice': questions},
+        'content_hash': f"{questions:040x}"
+    } for questions in range(100, 100 + EXAMS)]
+
+
+def build_index(exams, tmp_path, sessions: int) -> SearchIndex:
+    session_summaries = [{
+        'session_date': f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00",
+        'exam_title': exams[i % EXAMS]['title'],
+        'exam_ref': {'content_hash': exams[i % EXAMS]['content_hash']},
+        'quiz_mode': {'score': i % 40, 'total_answered': 40},
+        '_filepath': f"session_{i}.json"
+    } for i in range(sessions)]
+    results = [{
+        'exam_info': {'title': exams[i % EXAMS]['title'], 'exam_file_path': exams[i % EXAMS]['filepath']},
+        'session_info': {'completion_date': f"2025-{i % 12 + 1:02d}-15T12:00:00"},
+        'performance': {'accuracy_percentage': i % 100, 'incorrect_count': i % 3},
+        '_filepath': f"quiz_results_{i}.json"
+    } for i in range(sessions // 5)]
+    return SearchIndex(exams, session_summaries, results, terms_dir=str(tmp_path / "terms"))
+
+
+@pytest.mark.benchmark(group="search_keystroke")
+@pytest.mark.parametrize("query", ["s", "synthetic exam 11", "score:>=80 has:incorrect",
+                                   "from:2025-03 to:2025-06 service"])
+@pytest.mark.parametrize("sessions", [1000, 50000])
+def bench_search_keystroke(benchmark, exams, tmp_path, sessions, query):
+    index = build_index(exams, tmp_path, sessions)
+    parsed = parse_query(query)
+    rows = benchmark(index.search, parsed)
+    assert set(rows) == {'exams', 'sessions', 'results'}
@@ -0,0 +1,74 @@
+"""Session and results persistence in SessionManager."""
+import json
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.utils import results_store
+from src.utils.results_store import build_results_data
+from src.utils.session_manager import SessionManager
+
+
+def session_data_for(quiz_state) -> dict:
+    """A session file's contents, as SessionViewModel.build_session_data writes them."""
+    return {
+        'session_date': "2025-01-01T12:00:00",
+        'exam_title': quiz_state.exam_data['title'],
+        'exam_ref': None,
+        'total_questions': len(quiz_state.exam_data['questions']),
+        'quiz_mode': quiz_state.engine.progress_snapshot(),
+        'journal_seq': 0,
+        'timer_data': {'elapsed_seconds': 600, 'completed': False, 'auto_saved': True,
+                       'emergency_saved': False, 'quit_by_user': False}
+    }
+
+
+@pytest.mark.benchmark(group="save_session")
+@pytest.mark.parametrize("questions", [100, 1000, 10000])
+def bench_save_session(benchmark, answered_quiz, tmp_path, questions):
+    manager = SessionManager(str(tmp_path / "sessions"))
+    session_data = session_data_for(answered_quiz(questions))
+    filepath = str(tmp_path / "sessions" / "session_20250101_120000.json")
+    benchmark(manager.save_session, session_data, filepath)
+
+
+@pytest.mark.benchmark(group="find_study_sessions")
+@pytest.mark.parametrize("sessions", [10, 100, 1000])
+def bench_find_study_sessions(benchmark, answered_quiz, tmp_path, sessions):
+    manager = SessionManager(str(tmp_path / "sessions"))
+    session_data = session_data_for(answered_quiz(50))
+    for i in range(sessions):
+        session_data['session_date'] = f"2025-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}"
+        manager.save_session(session_data, str(tmp_path / "sessions" / f"session_20250101_{i:06d}.json"))
+    found = benchmark(manager.find_study_sessions)
+    assert len(found) == sessions
+
+
+@pytest.mark.benchmark(group="aggregate_all_incorrect_answers")
+@pytest.mark.parametrize("results", [10, 100, 1000])
+def bench_aggregate_all_incorrect_answers(benchmark, answered_quiz, tmp_path, monkeypatch, results):
+    # The results folder's aggregate goes under a temporary data folder
+    monkeypatch.setattr(results_store, "DATA_DIR", str(tmp_path / "data"))
+    quiz_state = answered_quiz(50)
+    engine = quiz_state.engine
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    answered = sorted(quiz_state.answered_questions)
+    for i in range(results):
+        results_data = build_results_data(
+            dict(engine.results(), time_taken="00:10:00", time_taken_seconds=600,
+                 average_answer_seconds=12.0, slowest_questions=[]),
+            title=quiz_state.exam_data['title'],
+            exam_file_path=None,
+            shuffle_enabled=False,
+            questions_answered=answered,
+            answered_question_indices=answered,
+            completion_date=f"2025-01-01T12:{i // 60 % 60:02d}:{i % 60:02d}"
+        )
+        with open(results_dir / f"quiz_results_20250101_{i:06d}.json", 'w') as f:
+            json.dump(results_data, f, indent=2)
+
+    manager = SessionManager(str(tmp_path / "sessions"))
+    incorrect = benchmark(manager.aggregate_all_incorrect_answers, str(results_dir))
+    assert len(incorrect) == results * len(engine.wrong_answers)
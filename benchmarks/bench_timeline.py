@@ -0,0 +1,30 @@
+"""Updating and repainting the practice mode QuestionTimelineWidget after an answer."""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("PyQt6")
+
+from src.components.styles import Styles
+from src.components.widgets.question_timeline import QuestionTimelineWidget
+
+
+@pytest.mark.benchmark(group="timeline_answer")
+@pytest.mark.parametrize("questions", [100, 2000, 10000])
+def bench_timeline_answer(benchmark, qapp, questions):
+    timeline = QuestionTimelineWidget(Styles(), questions)
+    timeline.resize(800, timeline.height())
+    timeline.show()
+    qapp.processEvents()
+    answered = 0
+
+    def answer():
+        # What the footer does after each answer and the move to the next question, then the repaint
+        nonlocal answered
+        position = answered
+        answered += 1
+        timeline.mark_answered(position, wrong=position % 3 == 0)
+        timeline.update_current_index(position + 1)
+        qapp.processEvents()
+
+    benchmark.pedantic(answer, rounds=min(questions - 1, 200))
+    timeline.close()
@@ -0,0 +1,116 @@
+"""
+Shared fixtures for the pytest-benchmark suite.
+
+Baselines are saved under benchmarks/.baselines/<machine id>/ whatever directory
+pytest is run from. Once a baseline exists for this machine, every run is compared
+with the latest one and fails when a benchmark's median regresses by more than
+REGRESSION_THRESHOLD (see README.md).
+"""
+import glob
+import os
+from typing import Callable, Dict
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from src.utils.exam_generator import generate_exam, generate_exam_data
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_DIR = os.path.join(BENCHMARKS_DIR, ".baselines")
+DEFAULT_STORAGE = "file://./.benchmarks"
+
+# Passed to --benchmark-compare-fail when a baseline exists and no threshold was given
+REGRESSION_THRESHOLD = "median:25%"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Point storage at benchmarks/.baselines and compare with the latest baseline if there is one."""
+    if not config.pluginmanager.hasplugin("benchmark"):
+        return
+    from pytest_benchmark.utils import get_machine_id, parse_compare_fail
+
+    option = config.option
+    if option.benchmark_storage == DEFAULT_STORAGE:
+        option.benchmark_storage = f"file://{BASELINE_DIR}"
+    else:
+        return  # custom storage: compare only when asked to
+
+    saving = option.benchmark_save or option.benchmark_autosave
+    has_baseline = bool(glob.glob(os.path.join(BASELINE_DIR, get_machine_id(), "*.json")))
+    if has_baseline and not saving and not option.benchmark_compare:
+        option.benchmark_compare = True
+        if not option.benchmark_compare_fail:
+            option.benchmark_compare_fail = [parse_compare_fail(REGRESSION_THRESHOLD)]
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The QApplication, on Qt's offscreen platform."""
+    pytest.importorskip("PyQt6")
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture(scope="session")
+def exam_file(tmp_path_factory) -> Callable[..., str]:
+    """Factory for generated exam files, cached per (questions, format) for the session."""
+    directory = tmp_path_factory.mktemp("exams")
+    paths: Dict = {}
+
+    def make(questions: int, fmt: str = "json") -> str:
+        if (questions, fmt) not in paths:
+            path = str(directory / f"exam_{questions}.{fmt}")
+            generate_exam(path, questions)
+            paths[(questions, fmt)] = path
+        return paths[(questions, fmt)]
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def exam_data() -> Callable[[int], Dict]:
+    """Factory for generated in-memory exams, cached per size for the session."""
+    exams: Dict[int, Dict] = {}
+
+    def make(questions: int) -> Dict:
+        if questions not in exams:
+            exams[questions] = generate_exam_data(questions)
+        return exams[questions]
+
+    return make
+
+
+@pytest.fixture
+def stores(tmp_path):
+    """An outcome store and review schedule in a temporary directory, so data/ is never touched."""
+    from src.utils.outcome_store import OutcomeStore
+    from src.utils.review_scheduler import ReviewScheduler
+    return (OutcomeStore(str(tmp_path / "outcomes")),
+            ReviewScheduler(str(tmp_path / "review_schedule.json")))
+
+
+@pytest.fixture
+def answered_quiz(qapp, exam_data) -> Callable[..., object]:
+    """Factory for a QuizState over a generated exam with every question answered.
+
+    Every `wrong_every`-th answer is wrong. Answers go straight to the engine, so
+    no outcome or review listeners run while the fixture is built.
+    """
+    from src.models.quiz_state import QuizState
+
+    def make(questions: int, wrong_every: int = 3):
+        quiz_state = QuizState(exam_data(questions))
+        engine = quiz_state.engine
+        for position in range(engine.get_total_questions()):
+            question = engine.get_current_question()
+            answer = question['answer']
+            selected = list(answer) if isinstance(answer, list) else [answer]
+            if position % wrong_every == 0:
+                selected = [next(key for key in question['options'] if key not in selected)]
+            engine.validate(selected)
+            engine.next()
+        return quiz_state
+
+    return make
@@ -0,0 +1,204 @@
+"""
+Simulated-learner benchmark for QuizState and QuizViewModel.
+
+Runs the real view model under Qt's offscreen platform and drives it the way a
+learner would: answer and move on through the whole exam, reveal every answer,
+review the misses, then study them again. Each view model call is timed, and
+memory is sampled with tracemalloc after every run so leaks show up as growth
+across runs.
+
+Usage:
+    python -m benchmarks.simulated_learner --questions 2000 --runs 5
+    python -m benchmarks.simulated_learner --questions 100 500 2000 --json baseline.json
+
+Answers go to an outcome store and review schedule in a temporary directory, so
+nothing under data/ is touched. Both are shared across runs, as in the app, so
+part of the growth between runs is their data.
+"""
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from src.models.quiz_state import QuizState
+from src.utils.exam_generator import generate_exam_data
+from src.utils.outcome_store import OutcomeStore
+from src.utils.review_scheduler import ReviewScheduler
+from src.viewmodels.quiz_viewmodel import QuizViewModel
+
+# View model operations that are timed, in report order
+OPERATIONS = ['select_option', 'validate_answer', 'next_question', '_reveal_all_answers',
+              'enter_review_mode', 'review_next', 'study_wrong_questions']
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+class SimulatedLearner:
+    """Answers questions through a QuizViewModel, right with a fixed probability."""
+
+    def __init__(self, accuracy: float = 0.7, seed: int = 0):
+        self.accuracy = accuracy
+        self.rng = random.Random(seed)
+        self.timings: Dict[str, List[float]] = {name: [] for name in OPERATIONS}
+
+    def timed(self, name: str, call: Callable, *args):
+        start = time.perf_counter()
+        result = call(*args)
+        self.timings[name].append(time.perf_counter() - start)
+        return result
+
+    def choose(self, question: Dict) -> List[int]:
+        """Option indices to select: the answer, or a wrong pick of the same size."""
+        option_keys = list(question['options'])
+        answer = question['answer']
+        correct = answer if isinstance(answer, list) else [answer]
+        chosen = correct
+        if self.rng.random() >= self.accuracy and len(option_keys) > len(correct):
+            while sorted(chosen) == sorted(correct):
+                chosen = self.rng.sample(option_keys, len(correct))
+        return [option_keys.index(key) for key in chosen if key in option_keys]
+
+    def answer_all(self, viewmodel: QuizViewModel):
+        """Answer every question in the current quiz view, in order."""
+        while True:
+            question = viewmodel.get_current_question()
+            if question is None:
+                return
+            for option_index in self.choose(question):
+                self.timed('select_option', viewmodel.select_option, option_index, True)
+            self.timed('validate_answer', viewmodel.validate_answer)
+            position = viewmodel.quiz_state.current_index
+            self.timed('next_question', viewmodel.next_question)
+            if viewmodel.quiz_state.current_index == position:
+                return  # last question: the quiz completed
+
+    def run(self, exam_data: Dict, outcome_store: OutcomeStore, scheduler: ReviewScheduler):
+        """One full pass: answer everything, reveal all, review the misses, study them again."""
+        quiz_state = QuizState(exam_data)
+        viewmodel = QuizViewModel(quiz_state, outcome_store=outcome_store, scheduler=scheduler)
+        self.answer_all(viewmodel)
+
+        self.timed('_reveal_all_answers', viewmodel._reveal_all_answers)
+        if self.timed('enter_review_mode', viewmodel.enter_review_mode):
+            while self.timed('review_next', viewmodel.next_question):
+                pass
+            if self.timed('study_wrong_questions', viewmodel.study_wrong_questions):
+                self.answer_all(viewmodel)
+
+
+def benchmark(questions: int, runs: int = 3, accuracy: float = 0.7, multi_ratio: float = 0.2,
+              seed: int = 0, trace_memory: bool = True) -> Dict:
+    """Run the simulated learner over a synthetic exam and summarize latency and memory.
+
+    Args:
+        questions: Questions in the synthetic exam
+        runs: Full passes over the exam, each with a fresh QuizState and QuizViewModel
+        accuracy: Probability of answering a question correctly
+        multi_ratio: Share of multi-choice questions
+        seed: Seed for the exam and the learner
+        trace_memory: Sample memory with tracemalloc (adds overhead to every timing)
+
+    Returns:
+        Dict: 'operations' maps each operation to count and p50/p95/p99/max in
+        milliseconds; 'memory' has the traced memory after each run and its growth
+    """
+    exam_data = generate_exam_data(questions, seed=seed, multi_ratio=multi_ratio)
+    learner = SimulatedLearner(accuracy, seed)
+    memory_after_runs = []
+    peak = 0
+
+    with tempfile.TemporaryDirectory(prefix="quiz_bench_") as tmp_dir:
+        outcome_store = OutcomeStore(os.path.join(tmp_dir, 'outcomes'))
+        scheduler = ReviewScheduler(os.path.join(tmp_dir, 'review_schedule.json'))
+        if trace_memory:
+            gc.collect()
+            tracemalloc.start()
+        for _ in range(runs):
+            learner.run(exam_data, outcome_store, scheduler)
+            if trace_memory:
+                gc.collect()
+                current, peak = tracemalloc.get_traced_memory()
+                memory_after_runs.append(current)
+        if trace_memory:
+            tracemalloc.stop()
+
+    operations = {}
+    for name in OPERATIONS:
+        values = sorted(learner.timings[name])
+        operations[name] = {
+            'count': len(values),
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+            'max_ms': (values[-1] * 1000) if values else 0.0
+        }
+    memory = {
+        'after_runs_bytes': memory_after_runs,
+        'peak_bytes': peak,
+        # Growth after the first run, which includes one-off caches, points at leaks
+        'growth_bytes': (memory_after_runs[-1] - memory_after_runs[0]) if memory_after_runs else 0
+    }
+    return {'questions': questions, 'runs': runs, 'operations': operations, 'memory': memory}
+
+
+def format_report(report: Dict) -> str:
+    lines = [f"{report['questions']} questions, {report['runs']} run(s)",
+             f"  {'operation':<24}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for name, stats in report['operations'].items():
+        lines.append(f"  {name:<24}{stats['count']:>8}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+                     f"{stats['p99_ms']:>10.3f}{stats['max_ms']:>10.3f}")
+    memory = report['memory']
+    if memory['after_runs_bytes']:
+        after = ", ".join(f"{value / 1024:.0f}" for value in memory['after_runs_bytes'])
+        lines.append(f"  memory after each run (KiB): {after}")
+        lines.append(f"  peak {memory['peak_bytes'] / 1024:.0f} KiB, growth since first run "
+                     f"{memory['growth_bytes'] / 1024:+.0f} KiB")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark QuizViewModel with a simulated learner")
+    parser.add_argument("--questions", type=int, nargs='+', default=[100, 1000],
+                        help="Synthetic exam sizes to benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="Full passes per exam size")
+    parser.add_argument("--accuracy", type=float, default=0.7, help="Chance of answering correctly")
+    parser.add_argument("--multi-ratio", type=float, default=0.2, help="Share of multi-choice questions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip tracemalloc, for timings without its overhead")
+    parser.add_argument("--json", help="Also write the reports to this JSON file")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    reports = []
+    for questions in args.questions:
+        report = benchmark(questions, args.runs, args.accuracy, args.multi_ratio, args.seed,
+                           trace_memory=not args.no_memory)
+        reports.append(report)
+        print(format_report(report))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'reports': reports}, f, indent=2)
+        print(f"Wrote {args.json}")
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+List model and delegate for the home dialog's exam, session and result lists.
+
+Rows are kept as lightweight (kind, value) tuples: 'header' and 'message' rows
+hold their text, 'item' rows the exam, session or result summary and 'load_more'
+rows their label. Display text is only built when the view asks for a row, and
+rows are handed to the view in pages through fetchMore, so a list is only laid
+out and painted as far as it has been scrolled.
+
+A filter swaps in another sequence of rows, such as search results, without
+touching the loaded ones, so clearing it is instant.
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRectF, QSize
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen
+from PyQt6.QtWidgets import QListView, QStyle, QStyledItemDelegate
+
+# Rows exposed to the view at a time
+FETCH_BATCH_SIZE = 100
+
+# Item data roles: the row's kind, and the "load more" marker
+KIND_ROLE = Qt.ItemDataRole.UserRole + 2
+LOAD_MORE_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# Returns an item's display text and optional text color
+Formatter = Callable[[Dict], Tuple[str, Optional[str]]]
+
+
+class EntryListModel(QAbstractListModel):
+    """Rows of one home dialog list, formatted on demand."""
+
+    def __init__(self, formatter: Formatter, header_color: str, parent=None):
+        super().__init__(parent)
+        self.formatter = formatter
+        self.header_color = QColor(header_color)
+        self._rows: List[Tuple[str, object]] = []
+        self._filtered: Optional[Sequence[Tuple[str, object]]] = None
+        self._exposed = 0
+
+    @property
+    def _shown(self) -> Sequence[Tuple[str, object]]:
+        return self._rows if self._filtered is None else self._filtered
+
+    def clear(self):
+        if self._filtered is not None:
+            self._rows = []  # not shown, so the view needn't know
+            return
+        self.beginResetModel()
+        self._rows = []
+        self._exposed = 0
+        self.endResetModel()
+
+    def append_rows(self, rows: List[Tuple[str, object]]):
+        """Add rows; the first page is shown straight away, the rest as the view scrolls."""
+        self._rows.extend(rows)
+        if self._filtered is None and self._exposed < FETCH_BATCH_SIZE:
+            self.fetchMore(QModelIndex())
+
+    def set_filtered_rows(self, rows: Optional[Sequence[Tuple[str, object]]]):
+        """Show these rows instead of the loaded ones, or the loaded ones again for None."""
+        self.beginResetModel()
+        self._filtered = rows
+        self._exposed = 0
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def is_filtered(self) -> bool:
+        return self._filtered is not None
+
+    def total_rows(self) -> int:
+        """Rows shown, including those not yet fetched by the view."""
+        return len(self._shown)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._exposed
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._exposed < len(self._shown)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        count = min(FETCH_BATCH_SIZE, len(self._shown) - self._exposed)
+        self.beginInsertRows(QModelIndex(), self._exposed, self._exposed + count - 1)
+        self._exposed += count
+        self.endInsertRows()
+
+    def flags(self, index):
+        if not index.isValid() or self._shown[index.row()][0] in ('header', 'message'):
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._exposed:
+            return None
+        kind, value = self._shown[index.row()]
+        if role == KIND_ROLE:
+            return kind
+        if role == Qt.ItemDataRole.DisplayRole:
+            if kind == 'item':
+                return self.formatter(value)[0]
+            if kind == 'header':
+                return f"📚 {value}"
+            return value
+        if role == Qt.ItemDataRole.UserRole:
+            return value if kind == 'item' else None
+        if role == LOAD_MORE_ROLE:
+            return kind == 'load_more'
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if kind == 'header':
+                return self.header_color
+            if kind == 'item':
+                color = self.formatter(value)[1]
+                return QColor(color) if color else None
+        return None
+
+
+class EntryDelegate(QStyledItemDelegate):
+    """Paints list rows as cards, exam headers in bold and messages as plain text."""
+
+    PADDING = 12
+    MARGIN = 4
+
+    def __init__(self, colors: Dict[str, str], parent=None):
+        super().__init__(parent)
+        self.colors = colors
+
+    def sizeHint(self, option, index):
+        text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+        lines = text.count("\n") + 1
+        height = lines * option.fontMetrics.lineSpacing() + 2 * (self.PADDING + self.MARGIN)
+        if index.data(KIND_ROLE) == 'header':
+            height = option.fontMetrics.lineSpacing() + 2 * self.MARGIN + self.PADDING
+        # Rows take the view's width
+        return QSize(0, height)
+
+    def paint(self, painter: QPainter, option, index):
+        kind = index.data(KIND_ROLE)
+        text = index.data(Qt.ItemDataRole.DisplayRole) or ""
+        foreground = index.data(Qt.ItemDataRole.ForegroundRole)
+        rect = QRectF(option.rect).adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        font = QFont(option.font)
+        text_color = QColor(self.colors['text'])
+
+        if kind in ('item', 'load_more'):
+            selected = bool(option.state & QStyle.StateFlag.State_Selected)
+            hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+            if selected:
+                background = QColor(self.colors['primary'])
+                text_color = QColor("white")
+            else:
+                background = QColor(self.colors['hover'] if hovered else self.colors['card'])
+                if foreground is not None:
+                    text_color = foreground
+            painter.setPen(QPen(QColor(self.colors['border']), 1))
+            painter.setBrush(background)
+            painter.drawRoundedRect(rect, 6, 6)
+        elif kind == 'header':
+            font.setBold(True)
+            if foreground is not None:
+                text_color = foreground
+
+        alignment = Qt.AlignmentFlag.AlignVCenter
+        alignment |= Qt.AlignmentFlag.AlignHCenter if kind == 'load_more' else Qt.AlignmentFlag.AlignLeft
+        painter.setFont(font)
+        painter.setPen(text_color)
+        painter.drawText(rect.adjusted(self.PADDING, 0, -self.PADDING, 0), alignment, text)
+        painter.restore()
+
+
+def create_entry_view(model: EntryListModel, colors: Dict[str, str]) -> QListView:
+    """A list view over a model, painted by EntryDelegate."""
+    view = QListView()
+    view.setModel(model)
+    view.setItemDelegate(EntryDelegate(colors, view))
+    view.setMouseTracking(True)
+    view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+    view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+    view.setStyleSheet(f"""
+        QListView {{
+            background-color: {colors['background']};
+            border: 1px solid {colors['border']};
+            border-radius: 8px;
+            padding: 8px;
+        }}
+    """)
+    return view
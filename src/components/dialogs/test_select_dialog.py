@@ -1,14 +1,159 @@
 import sys
-import json
 import os
 from datetime import datetime
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QPushButton, QListWidget, QListWidgetItem, QMessageBox,
-                            QCheckBox, QWidget, QTabWidget, QSizePolicy)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QColor, QBrush
+                            QPushButton, QMessageBox,
+                            QCheckBox, QWidget, QTabWidget, QSizePolicy, QComboBox,
+                            QLineEdit)
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QFont
 
+from src.components.dialogs.entry_list import LOAD_MORE_ROLE, EntryListModel, create_entry_view
 from src.components.styles import Styles
+from src.utils.exam_repository import open_exam_repository
+from src.utils.paths import EXAMS_DIR, RESULTS_DIR
+from src.utils.search_index import SearchIndex, parse_query
+
+# Sessions listed per page in the Previous Sessions tab
+SESSIONS_PAGE_SIZE = 50
+
+# Rows sent from a tab loader to the list at a time
+LOAD_BATCH_SIZE = 200
+
+NEW_TEST_TAB, SESSIONS_TAB, REVIEW_TAB = range(3)
+# Loader id of the search index build, alongside the tabs
+SEARCH_INDEX = 3
+TAB_TITLES = ("New Test", "Previous Sessions", "Review Incorrect Answers")
+
+# Which search results each tab shows
+SEARCH_KEYS = {NEW_TEST_TAB: 'exams', SESSIONS_TAB: 'sessions', REVIEW_TAB: 'results'}
+
+# Loaders still running after their dialog has closed; they must outlive it
+_active_loaders = set()
+
+
+def _listing_signature(tab):
+    """Modification time of the folder a tab lists, which changes whenever a file in it is written"""
+    if tab == SESSIONS_TAB:
+        from src.utils.session_manager import SessionManager
+        directory = SessionManager().data_dir
+    else:
+        directory = {NEW_TEST_TAB: EXAMS_DIR, REVIEW_TAB: RESULTS_DIR}[tab]
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _group_rows(entries, title_of, sort_titles=False):
+    """Rows for entries grouped under a header per exam title."""
+    groups = {}
+    for entry in entries:
+        groups.setdefault(title_of(entry), []).append(entry)
+    for title in (sorted(groups) if sort_titles else groups):
+        yield ('header', title)
+        for entry in groups[title]:
+            yield ('item', entry)
+
+
+def _exam_rows(question_type, info):
+    """Rows for the New Test tab."""
+    if not os.path.exists(EXAMS_DIR):
+        yield ('message', "Exams folder not found")
+        return
+    # Listings come from the exam catalog or the SQLite question bank, not the exam files
+    repository = open_exam_repository()
+    try:
+        exams = repository.list_exams(question_type)
+    finally:
+        repository.close()
+    if not exams:
+        yield ('message', "No practice tests found in exams folder")
+    for exam in exams:
+        yield ('item', exam)
+
+
+def _session_rows(loaded, info):
+    """Rows for the Previous Sessions tab: the sessions already loaded plus the next page."""
+    from src.utils.session_manager import SessionManager
+    session_manager = SessionManager()
+    page, total = session_manager.study_session_page(offset=len(loaded), limit=SESSIONS_PAGE_SIZE)
+    sessions = loaded + page
+    info['sessions'] = sessions
+    info['remaining'] = total - len(sessions)
+    if not sessions:
+        yield ('message', "No previous sessions found")
+    yield from _group_rows(sessions, lambda session: session.get('exam_title', 'Unknown Exam'), sort_titles=True)
+
+
+def _result_rows(info):
+    """Rows for the Review Incorrect Answers tab."""
+    # Summaries come from the results aggregate; the full file is loaded when a review starts
+    from src.utils.results_store import get_results_store
+    results = get_results_store().list_results(with_incorrect_only=True)
+    if not results:
+        yield ('message', "No completed tests with incorrect answers found")
+    yield from _group_rows(results, lambda result: result.get('exam_info', {}).get('title', 'Unknown Exam'))
+
+
+def _build_search_index(info):
+    """Build the search index from the exam, session and result listings into info; there are no rows."""
+    from src.utils.results_store import get_results_store
+    from src.utils.session_manager import SessionManager
+    # Taken before reading, so files written meanwhile leave the index out of date
+    info['signatures'] = {tab: _listing_signature(tab) for tab in SEARCH_KEYS}
+    repository = open_exam_repository()
+    try:
+        exams = repository.list_exams() if os.path.exists(EXAMS_DIR) else []
+    finally:
+        repository.close()
+    info['index'] = SearchIndex(exams, SessionManager().find_study_sessions(),
+                                get_results_store().list_results(with_incorrect_only=True))
+    return iter(())
+
+
+class _LoaderSignals(QObject):
+    rows = pyqtSignal(int, int, list)  # tab, generation, rows
+    finished = pyqtSignal(int, int, dict)  # tab, generation, info
+    failed = pyqtSignal(int, int)  # tab, generation
+
+
+class _TabLoader(QRunnable):
+    """Produces one tab's rows off the GUI thread and sends them in batches."""
+    
+    def __init__(self, tab: int, generation: int, produce):
+        super().__init__()
+        self.tab = tab
+        self.generation = generation
+        self.produce = produce
+        self.cancelled = False
+        self.signals = _LoaderSignals()
+    
+    def cancel(self):
+        self.cancelled = True
+    
+    def run(self):
+        info = {}
+        batch = []
+        try:
+            for row in self.produce(info):
+                if self.cancelled:
+                    return
+                batch.append(row)
+                if len(batch) >= LOAD_BATCH_SIZE:
+                    self.signals.rows.emit(self.tab, self.generation, batch)
+                    batch = []
+            if not self.cancelled:
+                if batch:
+                    self.signals.rows.emit(self.tab, self.generation, batch)
+                self.signals.finished.emit(self.tab, self.generation, info)
+        except Exception as e:
+            print(f"Error loading tab {self.tab}: {e}")
+            if not self.cancelled:
+                self.signals.failed.emit(self.tab, self.generation)
+        finally:
+            _active_loaders.discard(self)
+
 
 class TestSelectDialog(QDialog):
     def __init__(self, parent=None):
@@ -19,6 +164,19 @@ class TestSelectDialog(QDialog):
         self.shuffle_enabled = False
         self.practice_mode_enabled = False
         self.show_answer_at_end_enabled = False
+        self.question_type_filter = None
+        self.question_set = None
+        self.loaded_sessions = []
+        self.loader_pool = QThreadPool.globalInstance()
+        self._loaders = {}
+        self._generations = {NEW_TEST_TAB: 0, SESSIONS_TAB: 0, REVIEW_TAB: 0, SEARCH_INDEX: 0}
+        self._loaded_tabs = set()
+        self._loaded_counts = {}
+        self._signatures = {}
+        self.status_bars = {}
+        self.search_index = None
+        # Folder signatures of all three listings when the search index was built
+        self._index_signatures = {}
         self.styles = Styles()
         self.colors = self.styles.colors
         
@@ -28,9 +186,38 @@ class TestSelectDialog(QDialog):
         self.setStyleSheet(self.styles.get_application_style())
         
         self.setup_ui()
-        self.load_available_tests()
-        self.load_previous_sessions()
-        self.load_incorrect_answers()
+        # Tabs are filled in the background the first time they are shown
+        self.tab_widget.currentChanged.connect(self.ensure_tab_loaded)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.reset_selection()
+        self.refresh_changed_tabs()
+        self.ensure_tab_loaded(self.tab_widget.currentIndex())
+    
+    def reset_selection(self):
+        """Forget the previous selection when the dialog is shown again"""
+        self.selected_exam = None
+        self.selected_session = None
+        self.selected_result = None
+        for view in (self.test_list, self.sessions_list, self.results_list):
+            view.clearSelection()
+        self.start_button.setEnabled(False)
+        self.start_button.setText("Start Test")
+    
+    def refresh_changed_tabs(self):
+        """Reload, when next shown, the tabs whose folders changed since they were loaded"""
+        changed = [tab for tab, signature in self._signatures.items() if signature != _listing_signature(tab)]
+        for tab in changed:
+            del self._signatures[tab]
+            self._loaded_tabs.discard(tab)
+        # The index covers every listing, loaded or not
+        if any(signature != _listing_signature(tab) for tab, signature in self._index_signatures.items()):
+            self.stop_loader(SEARCH_INDEX)
+            self.search_index = None
+        if self.search_index is None:
+            # Rebuild the index if a search is shown
+            self.on_search_changed(self.search_input.text())
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -49,6 +236,34 @@ class TestSelectDialog(QDialog):
         """)
         layout.addWidget(title_label)
         
+        # Search box, filtering every tab as you type
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search exams, questions, sessions and results")
+        self.search_input.setToolTip(
+            "Words match exam titles and question text.\n"
+            "Narrow sessions and results with from:2025-01, to:2025-03-15, date:2025-11,\n"
+            "score:>=80, score:60-80 and has:incorrect."
+        )
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setStyleSheet(f"""
+            QLineEdit {{
+                background-color: {self.colors['card']};
+                color: {self.colors['text']};
+                border: 1px solid {self.colors['border']};
+                border-radius: 6px;
+                padding: 8px 12px;
+            }}
+        """)
+        self.search_input.textChanged.connect(self.on_search_changed)
+        
+        search_layout = QHBoxLayout()
+        search_layout.setSpacing(12)
+        search_layout.addWidget(self.search_input, 1)
+        self.search_status = QLabel()
+        self.search_status.setStyleSheet(f"QLabel {{ color: {self.colors['text_light']}; }}")
+        search_layout.addWidget(self.search_status)
+        layout.addLayout(search_layout)
+        
         # Create tab widget
         self.tab_widget = QTabWidget()
         self.tab_widget.setStyleSheet(f"""
@@ -77,15 +292,15 @@ class TestSelectDialog(QDialog):
         
         # New Test tab
         self.new_test_tab = self.create_new_test_tab()
-        self.tab_widget.addTab(self.new_test_tab, "New Test")
+        self.tab_widget.addTab(self.new_test_tab, TAB_TITLES[NEW_TEST_TAB])
         
         # Previous Sessions tab
         self.sessions_tab = self.create_sessions_tab()
-        self.tab_widget.addTab(self.sessions_tab, "Previous Sessions")
+        self.tab_widget.addTab(self.sessions_tab, TAB_TITLES[SESSIONS_TAB])
         
         # Review Incorrect Answers tab
         self.review_tab = self.create_review_tab()
-        self.tab_widget.addTab(self.review_tab, "Review Incorrect Answers")
+        self.tab_widget.addTab(self.review_tab, TAB_TITLES[REVIEW_TAB])
         
         layout.addWidget(self.tab_widget)
         
@@ -128,31 +343,49 @@ class TestSelectDialog(QDialog):
         """)
         layout.addWidget(desc_label)
         
+        # Filters: question type and keyword
+        filter_container = QWidget()
+        filter_layout = QHBoxLayout(filter_container)
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout.setSpacing(12)
+        
+        input_style = f"""
+            background-color: {self.colors['card']};
+            color: {self.colors['text']};
+            border: 1px solid {self.colors['border']};
+            border-radius: 6px;
+            padding: 6px 10px;
+        """
+        
+        self.type_filter_combo = QComboBox()
+        self.type_filter_combo.addItem("All question types", None)
+        self.type_filter_combo.addItem("Has single choice", "singleChoice")
+        self.type_filter_combo.addItem("Has multiple choice", "multiChoice")
+        self.type_filter_combo.setStyleSheet(f"QComboBox {{{input_style}}}")
+        self.type_filter_combo.currentIndexChanged.connect(self.on_type_filter_changed)
+        filter_layout.addWidget(self.type_filter_combo)
+        
+        self.question_set_combo = QComboBox()
+        self.question_set_combo.addItem("All questions", None)
+        self.question_set_combo.addItem("Due for review today", "due")
+        self.question_set_combo.addItem("Hard questions only", "hard")
+        self.question_set_combo.addItem("Difficulty-balanced", "balanced")
+        self.question_set_combo.setStyleSheet(f"QComboBox {{{input_style}}}")
+        self.question_set_combo.currentIndexChanged.connect(self.on_question_set_changed)
+        filter_layout.addWidget(self.question_set_combo)
+        
+        self.keyword_input = QLineEdit()
+        self.keyword_input.setPlaceholderText("Only questions matching keywords (optional)")
+        self.keyword_input.setStyleSheet(f"QLineEdit {{{input_style}}}")
+        filter_layout.addWidget(self.keyword_input, 1)
+        
+        layout.addWidget(filter_container)
+        layout.addWidget(self.create_status_bar(NEW_TEST_TAB))
+        
         # Test list
-        self.test_list = QListWidget()
-        self.test_list.setStyleSheet(f"""
-            QListWidget {{
-                background-color: {self.colors['background']};
-                border: 1px solid {self.colors['border']};
-                border-radius: 8px;
-                padding: 8px;
-            }}
-            QListWidget::item {{
-                background-color: {self.colors['card']};
-                border: 1px solid {self.colors['border']};
-                border-radius: 6px;
-                padding: 12px;
-                margin: 4px;
-            }}
-            QListWidget::item:hover {{
-                background-color: {self.colors['hover']};
-            }}
-            QListWidget::item:selected {{
-                background-color: {self.colors['primary']};
-                color: white;
-            }}
-        """)
-        self.test_list.itemClicked.connect(self.on_test_selected)
+        self.test_model = EntryListModel(self.format_exam, self.colors.get('primary', '#3b82f6'), self)
+        self.test_list = create_entry_view(self.test_model, self.colors)
+        self.test_list.clicked.connect(self.on_test_selected)
         layout.addWidget(self.test_list)
         
         # Options container
@@ -279,33 +512,13 @@ class TestSelectDialog(QDialog):
             }}
         """)
         layout.addWidget(desc_label)
+        layout.addWidget(self.create_status_bar(SESSIONS_TAB))
         
         # Sessions list
-        self.sessions_list = QListWidget()
+        self.sessions_model = EntryListModel(self.format_session, self.colors.get('primary', '#3b82f6'), self)
+        self.sessions_list = create_entry_view(self.sessions_model, self.colors)
         self.sessions_list.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.sessions_list.setStyleSheet(f"""
-            QListWidget {{
-                background-color: {self.colors['background']};
-                border: 1px solid {self.colors['border']};
-                border-radius: 8px;
-                padding: 8px;
-            }}
-            QListWidget::item {{
-                background-color: {self.colors['card']};
-                border: 1px solid {self.colors['border']};
-                border-radius: 6px;
-                padding: 12px;
-                margin: 4px;
-            }}
-            QListWidget::item:hover {{
-                background-color: {self.colors['hover']};
-            }}
-            QListWidget::item:selected {{
-                background-color: {self.colors['primary']};
-                color: white;
-            }}
-        """)
-        self.sessions_list.itemClicked.connect(self.on_session_selected)
+        self.sessions_list.clicked.connect(self.on_session_selected)
         layout.addWidget(self.sessions_list, stretch=1)
         
         # Clear sessions button
@@ -333,180 +546,225 @@ class TestSelectDialog(QDialog):
             }}
         """)
         layout.addWidget(desc_label)
+        layout.addWidget(self.create_status_bar(REVIEW_TAB))
         
         # Results list
-        self.results_list = QListWidget()
+        self.results_model = EntryListModel(self.format_result, self.colors.get('primary', '#3b82f6'), self)
+        self.results_list = create_entry_view(self.results_model, self.colors)
         self.results_list.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.results_list.setStyleSheet(f"""
-            QListWidget {{
-                background-color: {self.colors['background']};
-                border: 1px solid {self.colors['border']};
-                border-radius: 8px;
-                padding: 8px;
-            }}
-            QListWidget::item {{
-                background-color: {self.colors['card']};
-                border: 1px solid {self.colors['border']};
-                border-radius: 6px;
-                padding: 12px;
-                margin: 4px;
-            }}
-            QListWidget::item:hover {{
-                background-color: {self.colors['hover']};
-            }}
-            QListWidget::item:selected {{
-                background-color: {self.colors['primary']};
-                color: white;
-            }}
-        """)
-        self.results_list.itemClicked.connect(self.on_result_selected)
+        self.results_list.clicked.connect(self.on_result_selected)
         layout.addWidget(self.results_list, stretch=1)
         
         return tab
     
-    def load_available_tests(self):
-        """Load all available exam files from the exams directory"""
-        exam_files = []
-        
-        # Look for JSON files in the exams directory
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-        exams_dir = os.path.join(project_root, 'exams')
-        
-        # Check if exams directory exists
-        if not os.path.exists(exams_dir):
-            item = QListWidgetItem("Exams folder not found")
-            item.setFlags(Qt.ItemFlag.NoItemFlags)
-            self.test_list.addItem(item)
+    def create_status_bar(self, tab):
+        """Create the loading status row for a tab, hidden until the tab loads"""
+        container = QWidget()
+        status_layout = QHBoxLayout(container)
+        status_layout.setContentsMargins(0, 0, 0, 0)
+        status_layout.setSpacing(12)
+        
+        label = QLabel()
+        label.setFont(QFont('Helvetica', 11))
+        label.setStyleSheet(f"QLabel {{ color: {self.colors['text_light']}; }}")
+        status_layout.addWidget(label, 1)
+        
+        button = QPushButton("Cancel")
+        button.setStyleSheet(self.styles.styles['button_secondary'])
+        button.clicked.connect(lambda: self.on_status_button_clicked(tab))
+        status_layout.addWidget(button)
+        
+        container.hide()
+        self.status_bars[tab] = (container, label, button)
+        return container
+    
+    def set_status(self, tab, text, loading=True):
+        """Show a tab's status row with a Cancel button while loading, else a Reload button"""
+        container, label, button = self.status_bars[tab]
+        label.setText(text)
+        button.setText("Cancel" if loading else "Reload")
+        container.show()
+    
+    def on_status_button_clicked(self, tab):
+        """Cancel a tab that is loading, or reload one that was cancelled"""
+        if tab in self._loaders:
+            self.cancel_loading(tab)
+        else:
+            self.reload_tab(tab)
+    
+    def ensure_tab_loaded(self, tab):
+        """Start loading a tab the first time it becomes visible"""
+        if tab not in self._loaded_tabs:
+            self.reload_tab(tab)
+    
+    def reload_tab(self, tab):
+        """Reload a tab from scratch"""
+        if tab == NEW_TEST_TAB:
+            self.load_available_tests()
+        elif tab == SESSIONS_TAB:
+            self.load_previous_sessions()
+        elif tab == REVIEW_TAB:
+            self.load_incorrect_answers()
+    
+    def model_for_tab(self, tab):
+        return {NEW_TEST_TAB: self.test_model, SESSIONS_TAB: self.sessions_model, REVIEW_TAB: self.results_model}[tab]
+    
+    def start_loader(self, tab, produce):
+        """Clear a tab's list and fill it from a background loader, replacing any running one"""
+        self.stop_loader(tab)
+        self._loaded_tabs.add(tab)
+        self._signatures.pop(tab, None)
+        self._generations[tab] += 1
+        self._loaded_counts[tab] = 0
+        self.model_for_tab(tab).clear()
+        
+        loader = _TabLoader(tab, self._generations[tab], produce)
+        loader.setAutoDelete(False)
+        loader.signals.rows.connect(self._on_rows_loaded)
+        loader.signals.finished.connect(self._on_load_finished)
+        loader.signals.failed.connect(self._on_load_failed)
+        self._loaders[tab] = loader
+        _active_loaders.add(loader)
+        self.set_status(tab, "Loading…")
+        self.loader_pool.start(loader)
+    
+    def stop_loader(self, tab):
+        """Stop a tab's loader; rows it already sent are ignored"""
+        loader = self._loaders.pop(tab, None)
+        if loader is not None:
+            loader.cancel()
+            self._generations[tab] += 1
+    
+    def cancel_loading(self, tab):
+        """Stop loading a tab, keeping the rows loaded so far"""
+        self.stop_loader(tab)
+        self.set_status(tab, f"Loading cancelled ({self._loaded_counts.get(tab, 0)} loaded)", loading=False)
+    
+    def _is_current(self, tab, generation):
+        return tab in self._loaders and generation == self._generations[tab]
+    
+    def _on_rows_loaded(self, tab, generation, rows):
+        if not self._is_current(tab, generation):
             return
-        
-        try:
-            for filename in os.listdir(exams_dir):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(exams_dir, filename)
-                    try:
-                        with open(filepath, 'r') as f:
-                            data = json.load(f)
-                            if 'title' in data and 'questions' in data:
-                                exam_files.append({
-                                    'filename': filename,
-                                    'filepath': filepath,
-                                    'title': data['title'],
-                                    'question_count': len(data['questions'])
-                                })
-                    except Exception as e:
-                        print(f"Error loading {filename}: {e}")
-        except Exception as e:
-            print(f"Error reading exams directory: {e}")
-            item = QListWidgetItem("Error reading exams folder")
-            item.setFlags(Qt.ItemFlag.NoItemFlags)
-            self.test_list.addItem(item)
+        self.model_for_tab(tab).append_rows(rows)
+        self._loaded_counts[tab] += len(rows)
+        self.set_status(tab, f"Loading… {self._loaded_counts[tab]} loaded")
+    
+    def _on_load_finished(self, tab, generation, info):
+        if not self._is_current(tab, generation):
             return
-        
-        # Add tests to list widget
-        for exam in exam_files:
-            item = QListWidgetItem()
-            item.setText(f"{exam['title']}\n{exam['question_count']} questions")
-            item.setData(Qt.ItemDataRole.UserRole, exam)
-            self.test_list.addItem(item)
-        
-        if not exam_files:
-            # Show message if no tests found
-            item = QListWidgetItem("No practice tests found in exams folder")
-            item.setFlags(Qt.ItemFlag.NoItemFlags)
-            self.test_list.addItem(item)
+        del self._loaders[tab]
+        self.status_bars[tab][0].hide()
+        self._signatures[tab] = _listing_signature(tab)
+        if tab == SESSIONS_TAB:
+            self.loaded_sessions = info['sessions']
+            if info['remaining'] > 0:
+                self.sessions_model.append_rows([('load_more', f"Load more sessions ({info['remaining']} older)…")])
+    
+    def _on_load_failed(self, tab, generation):
+        if not self._is_current(tab, generation):
+            return
+        del self._loaders[tab]
+        self.status_bars[tab][0].hide()
+        message = {NEW_TEST_TAB: "Error reading exams folder", SESSIONS_TAB: "Error loading sessions",
+                   REVIEW_TAB: "Error loading results"}[tab]
+        self.model_for_tab(tab).append_rows([('message', message)])
+    
+    def done(self, result):
+        """Stop all loaders when the dialog closes; tabs they were filling reload when shown again"""
+        for tab in list(self._loaders):
+            self.stop_loader(tab)
+            self._loaded_tabs.discard(tab)
+        super().done(result)
+    
+    def ensure_search_index(self):
+        """Build the search index in the background, unless it exists or is being built"""
+        if self.search_index is not None or SEARCH_INDEX in self._loaders:
+            return
+        self._generations[SEARCH_INDEX] += 1
+        loader = _TabLoader(SEARCH_INDEX, self._generations[SEARCH_INDEX], _build_search_index)
+        loader.setAutoDelete(False)
+        loader.signals.finished.connect(self._on_index_built)
+        loader.signals.failed.connect(self._on_index_failed)
+        self._loaders[SEARCH_INDEX] = loader
+        _active_loaders.add(loader)
+        self.search_status.setText("Indexing…")
+        self.loader_pool.start(loader)
+    
+    def invalidate_search_index(self):
+        """Drop the search index after the listings changed, rebuilding it if a search is shown"""
+        self.stop_loader(SEARCH_INDEX)
+        self.search_index = None
+        self.on_search_changed(self.search_input.text())
+    
+    def _on_index_built(self, tab, generation, info):
+        if not self._is_current(tab, generation):
+            return
+        del self._loaders[tab]
+        self.search_index = info['index']
+        self._index_signatures = info['signatures']
+        self.search_status.setText("")
+        self.on_search_changed(self.search_input.text())
+    
+    def _on_index_failed(self, tab, generation):
+        if not self._is_current(tab, generation):
+            return
+        del self._loaders[tab]
+        self.search_status.setText("Search unavailable")
+    
+    def on_search_changed(self, text):
+        """Filter every tab by the search box's query"""
+        query = parse_query(text)
+        if query.is_empty():
+            self.show_search_results(None)
+        elif self.search_index is None:
+            # Results are shown once the index is built
+            self.ensure_search_index()
+        else:
+            self.show_search_results(self.search_index.search(query, self.question_type_filter))
+    
+    def show_search_results(self, results):
+        """Show search results in every tab, or the loaded lists again for None"""
+        for tab, key in SEARCH_KEYS.items():
+            model = self.model_for_tab(tab)
+            if results is None:
+                if model.is_filtered():
+                    model.set_filtered_rows(None)
+                self.tab_widget.setTabText(tab, TAB_TITLES[tab])
+            else:
+                model.set_filtered_rows(results[key])
+                self.tab_widget.setTabText(tab, f"{TAB_TITLES[tab]} ({len(results[key].ids)})")
+    
+    def load_available_tests(self):
+        """Load all available exams from the exam catalog in the background"""
+        question_type = self.question_type_filter
+        self.start_loader(NEW_TEST_TAB, lambda info: _exam_rows(question_type, info))
+    
+    def format_exam(self, exam):
+        """Return the display text and color of an exam row"""
+        count_text = f"{exam['question_count']} questions"
+        if self.question_type_filter == "multiChoice":
+            count_text += f" ({exam['type_counts'].get('multiChoice', 0)} multiple choice)"
+        elif self.question_type_filter == "singleChoice":
+            count_text += f" ({exam['type_counts'].get('singleChoice', 0)} single choice)"
+        return f"{exam['title']}\n{count_text}", None
     
     def load_previous_sessions(self):
-        """Load previous study sessions"""
-        try:
-            from src.utils.session_manager import SessionManager
-            session_manager = SessionManager()
-            sessions = session_manager.find_study_sessions()
-            
-            if not sessions:
-                # Show message if no sessions found
-                item = QListWidgetItem("No previous sessions found")
-                item.setFlags(Qt.ItemFlag.NoItemFlags)
-                self.sessions_list.addItem(item)
-                return
-            
-            # Group by exam title
-            exams_dict = {}
-            for session in sessions:
-                exam_title = session.get('exam_title', 'Unknown Exam')
-                if exam_title not in exams_dict:
-                    exams_dict[exam_title] = []
-                exams_dict[exam_title].append(session)
-            
-            # Sort exam titles alphabetically
-            sorted_exam_titles = sorted(exams_dict.keys())
-            
-            # Add sessions grouped by exam
-            for exam_title in sorted_exam_titles:
-                # Add header for exam
-                header_item = QListWidgetItem(f"📚 {exam_title}")
-                header_item.setFlags(Qt.ItemFlag.NoItemFlags)
-                bold_font = QFont()
-                bold_font.setBold(True)
-                header_item.setFont(bold_font)
-                header_item.setForeground(QBrush(QColor(self.colors.get('primary', '#3b82f6'))))
-                self.sessions_list.addItem(header_item)
-                
-                # Add each session
-                for session in exams_dict[exam_title]:
-                    self.add_session_item(session)
-                
-        except Exception as e:
-            print(f"Error loading sessions: {e}")
-            item = QListWidgetItem("Error loading sessions")
-            item.setFlags(Qt.ItemFlag.NoItemFlags)
-            self.sessions_list.addItem(item)
+        """Load the first page of previous study sessions"""
+        self.loaded_sessions = []
+        self.load_more_sessions()
+    
+    def load_more_sessions(self):
+        """Load the next page of study sessions in the background and redraw the list"""
+        loaded = list(self.loaded_sessions)
+        self.start_loader(SESSIONS_TAB, lambda info: _session_rows(loaded, info))
     
     def load_incorrect_answers(self):
-        """Load incorrect answers from all result files"""
-        try:
-            from src.utils.session_manager import SessionManager
-            session_manager = SessionManager()
-            results = session_manager.find_completed_results()
-            
-            if not results:
-                item = QListWidgetItem("No completed tests with incorrect answers found")
-                item.setFlags(Qt.ItemFlag.NoItemFlags)
-                self.results_list.addItem(item)
-                return
-            
-            # Group by exam title
-            exams_dict = {}
-            for result in results:
-                exam_title = result.get('exam_info', {}).get('title', 'Unknown Exam')
-                if exam_title not in exams_dict:
-                    exams_dict[exam_title] = []
-                exams_dict[exam_title].append(result)
-            
-            # Add results grouped by exam
-            for exam_title, exam_results in exams_dict.items():
-                # Add header for exam
-                header_item = QListWidgetItem(f"📚 {exam_title}")
-                header_item.setFlags(Qt.ItemFlag.NoItemFlags)
-                bold_font = QFont()
-                bold_font.setBold(True)
-                header_item.setFont(bold_font)
-                header_item.setForeground(QBrush(QColor(self.colors.get('primary', '#3b82f6'))))
-                self.results_list.addItem(header_item)
-                
-                # Add each result session
-                for result in exam_results:
-                    self.add_result_item(result)
-                
-        except Exception as e:
-            print(f"Error loading incorrect answers: {e}")
-            item = QListWidgetItem("Error loading results")
-            item.setFlags(Qt.ItemFlag.NoItemFlags)
-            self.results_list.addItem(item)
+        """Load incorrect answers from all result files in the background"""
+        self.start_loader(REVIEW_TAB, _result_rows)
     
-    def add_result_item(self, result):
-        """Add a result item to the list"""
-        item = QListWidgetItem()
-        
+    def format_result(self, result):
+        """Return the display text and color of a result row"""
         # Format completion date
         completion_date = result.get('session_info', {}).get('completion_date', '')
         if completion_date:
@@ -530,27 +788,25 @@ class TestSelectDialog(QDialog):
         display_text += f"Score: {score}/{total_answered} ({accuracy:.1f}%)\n"
         display_text += f"Incorrect Answers: {incorrect_count}"
         
-        item.setText(display_text)
-        item.setData(Qt.ItemDataRole.UserRole, result)
-        
-        self.results_list.addItem(item)
+        return display_text, None
     
-    def on_result_selected(self, item):
+    def on_result_selected(self, index):
         """Handle result selection"""
-        if item.data(Qt.ItemDataRole.UserRole):
-            self.selected_result = item.data(Qt.ItemDataRole.UserRole)
+        if index.data(Qt.ItemDataRole.UserRole):
+            self.selected_result = index.data(Qt.ItemDataRole.UserRole)
             self.selected_exam = None  # Clear exam selection
             self.selected_session = None  # Clear session selection
             self.start_button.setEnabled(True)
             self.start_button.setText("Review Answers")
     
-    def add_session_item(self, session):
-        """Add a session item to the list"""
-        item = QListWidgetItem()
-        
-        # Format session date
-        session_date = datetime.fromisoformat(session['session_date'].replace('Z', '+00:00'))
-        date_str = session_date.strftime("%B %d, %Y at %I:%M %p")
+    def format_session(self, session):
+        """Return the display text and status color of a session row"""
+        # Format session date; rows are formatted while painting, so a bad date mustn't raise
+        try:
+            session_date = datetime.fromisoformat(session['session_date'].replace('Z', '+00:00'))
+            date_str = session_date.strftime("%B %d, %Y at %I:%M %p")
+        except (KeyError, AttributeError, ValueError):
+            date_str = session.get('session_date') or "Unknown date"
         
         # Create display text
         score = session.get('quiz_mode', {}).get('score', 0)
@@ -600,33 +856,42 @@ class TestSelectDialog(QDialog):
         # Build display text with status
         display_text = f"{status_icon} {status_text}\n{date_str}\n{progress_text}\n{timer_info}"
         
-        item.setText(display_text)
-        item.setData(Qt.ItemDataRole.UserRole, session)
-        
-        # Apply status color if available
-        if status_color:
-            item.setForeground(QBrush(QColor(status_color)))
-        
-        self.sessions_list.addItem(item)
+        return display_text, status_color
     
-    def on_test_selected(self, item):
+    def on_test_selected(self, index):
         """Handle test selection"""
-        if item.data(Qt.ItemDataRole.UserRole):
-            self.selected_exam = item.data(Qt.ItemDataRole.UserRole)
+        if index.data(Qt.ItemDataRole.UserRole):
+            self.selected_exam = index.data(Qt.ItemDataRole.UserRole)
             self.selected_session = None  # Clear session selection
             self.selected_result = None  # Clear result selection
             self.start_button.setEnabled(True)
             self.start_button.setText("Start Test")
     
-    def on_session_selected(self, item):
+    def on_session_selected(self, index):
         """Handle session selection"""
-        if item.data(Qt.ItemDataRole.UserRole):
-            self.selected_session = item.data(Qt.ItemDataRole.UserRole)
+        if index.data(LOAD_MORE_ROLE):
+            self.load_more_sessions()
+            return
+        if index.data(Qt.ItemDataRole.UserRole):
+            self.selected_session = index.data(Qt.ItemDataRole.UserRole)
             self.selected_exam = None  # Clear exam selection
             self.selected_result = None  # Clear result selection
             self.start_button.setEnabled(True)
             self.start_button.setText("Resume Session")
     
+    def on_type_filter_changed(self, index):
+        """Reload the exam list for the selected question type filter"""
+        self.question_type_filter = self.type_filter_combo.itemData(index)
+        self.selected_exam = None
+        self.start_button.setEnabled(bool(self.selected_session or self.selected_result))
+        self.load_available_tests()
+        self.on_search_changed(self.search_input.text())
+    
+    def on_question_set_changed(self, index):
+        """Handle question set selection; keyword filtering only applies to all questions"""
+        self.question_set = self.question_set_combo.itemData(index)
+        self.keyword_input.setEnabled(self.question_set is None)
+    
     def on_shuffle_toggled(self, state):
         """Handle shuffle checkbox toggle"""
         self.shuffle_enabled = state == Qt.CheckState.Checked.value
@@ -651,13 +916,15 @@ class TestSelectDialog(QDialog):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
+            # Don't let a running load list sessions that are about to be deleted
+            self.stop_loader(SESSIONS_TAB)
             try:
                 from src.utils.session_manager import SessionManager
                 session_manager = SessionManager()
                 deleted_count = session_manager.clear_all_sessions()
                 
-                # Clear the list widget
-                self.sessions_list.clear()
+                # Clear the list
+                self.sessions_model.clear()
                 
                 # Show success message
                 QMessageBox.information(
@@ -668,6 +935,7 @@ class TestSelectDialog(QDialog):
                 
                 # Reload sessions (will show empty message)
                 self.load_previous_sessions()
+                self.invalidate_search_index()
                 
             except Exception as e:
                 QMessageBox.critical(
@@ -688,6 +956,16 @@ class TestSelectDialog(QDialog):
         """Return the selected result data"""
         return self.selected_result
     
+    def get_question_keyword(self):
+        """Return the keyword filter for new tests, or an empty string"""
+        if self.question_set is not None:
+            return ""
+        return self.keyword_input.text().strip()
+    
+    def get_question_set(self):
+        """Return the question set for new tests ('due', 'hard' or 'balanced'), or None for all questions"""
+        return self.question_set
+    
     def is_shuffle_enabled(self):
         """Return whether shuffle is enabled"""
         return self.shuffle_enabled
@@ -106,6 +106,10 @@ class HeaderWidget(QWidget):
         self.title_label.setStyleSheet(self.styles.styles['label_title'])
         layout.addWidget(self.title_label)
     
+    def set_title(self, title: str):
+        """Show another exam's title."""
+        self.title_label.setText(title)
+    
     def update_dark_mode(self, is_dark: bool):
         """Update dark mode button icon."""
         self.dark_mode_button.setText("☀️" if is_dark else "🌙")
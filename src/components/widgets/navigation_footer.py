@@ -64,6 +64,7 @@ class NavigationFooterWidget(QWidget):
             self.timeline_widget.question_selected.connect(self.on_timeline_question_selected)
             layout.insertWidget(0, self.timeline_widget)
             self.progress_bar.hide()
+            self.sync_timeline()
         else:
             self.progress_bar.show()
         
@@ -108,22 +109,21 @@ class NavigationFooterWidget(QWidget):
         counter_text = f"Question {current} of {total}"
         self.nav_label.setText(counter_text)
         
-        # Update timeline if in practice mode
+        # Update timeline if in practice mode; answers reach it through mark_answered
         if self.timeline_widget:
             self.timeline_widget.update_current_index(current - 1)  # Convert to 0-based index
-            if self.quiz_state:
-                self.timeline_widget.update_answered_questions(self.quiz_state.answered_questions)
-                # Update wrong questions based on wrong_answers
-                wrong_indices = set()
-                if self.quiz_state.wrong_answers:
-                    for wrong_answer in self.quiz_state.wrong_answers:
-                        # Try to find question index
-                        question_text = wrong_answer.get('question', '').strip()
-                        for i, q in enumerate(self.quiz_state.exam_data.get('questions', [])):
-                            if q.get('question', '').strip() == question_text:
-                                wrong_indices.add(i)
-                                break
-                self.timeline_widget.update_wrong_questions(wrong_indices)
+    
+    def mark_answered(self, position: int, correct: bool):
+        """Show one newly answered question on the timeline."""
+        if self.timeline_widget:
+            self.timeline_widget.mark_answered(position, wrong=not correct)
+    
+    def sync_timeline(self):
+        """Redraw the timeline from the quiz state, for a new quiz or question set."""
+        if self.timeline_widget and self.quiz_state:
+            self.timeline_widget.reset(self.total_questions)
+            self.timeline_widget.set_answers(self.quiz_state.answered_questions,
+                                             self.quiz_state.wrong_question_positions())
     
     def update_navigation_state(self, can_go_prev: bool, can_go_next: bool):
         """Update navigation button states."""
@@ -147,6 +147,15 @@ class NavigationFooterWidget(QWidget):
         self.total_questions = total
         self.progress_bar.setMaximum(total)
     
+    def set_quiz_state(self, quiz_state, total_questions: int, practice_mode: bool):
+        """Show another quiz's progress, keeping the widgets."""
+        self.quiz_state = quiz_state
+        self.update_total_questions(total_questions)
+        self.progress_bar.setValue(0)
+        self.set_practice_mode(practice_mode)
+        self.sync_timeline()
+        self.show_study_button(False)
+    
     def on_timeline_question_selected(self, index: int):
         """Handle timeline question selection."""
         self.question_jumped.emit(index)
@@ -161,6 +170,7 @@ class NavigationFooterWidget(QWidget):
             layout.insertWidget(0, self.timeline_widget)
             self.progress_bar.hide()
             self.practice_mode = True
+            self.sync_timeline()
         elif not enabled and self.timeline_widget:
             # Remove timeline
             self.timeline_widget.deleteLater()
@@ -1,11 +1,23 @@
-from PyQt6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QScrollArea
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QAbstractScrollArea
+from PyQt6.QtCore import Qt, QRect, QRectF, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
 from src.components.styles import Styles
 
+# Cell geometry in pixels; cells widen for long question numbers
+CELL_SIZE = 36
+CELL_PADDING = 6
+CELL_SPACING = 6
+MARGIN = 4
+SCROLLBAR_HEIGHT = 8
 
-class QuestionTimelineWidget(QWidget):
-    """Timeline widget displaying all questions as clickable buttons for practice mode."""
+
+class QuestionTimelineWidget(QAbstractScrollArea):
+    """Timeline of numbered question cells for practice mode.
+    
+    The strip is painted rather than built from per-question buttons: only the
+    cells in view are drawn, and a state change repaints just the cells it
+    affects, so the cost doesn't grow with the exam size.
+    """
     
     question_selected = pyqtSignal(int)  # question_index
     
@@ -17,30 +29,33 @@ class QuestionTimelineWidget(QWidget):
         self.current_index = 0
         self.answered_questions = set()
         self.wrong_question_indices = set()
-        self.buttons = []
+        self.hovered_index = None
         
         self.setup_ui()
     
     def setup_ui(self):
         """Set up the timeline UI."""
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(8)
-        
-        # Create scroll area for horizontal scrolling
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        scroll.setStyleSheet(f"""
-            QScrollArea {{
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setFixedHeight(CELL_SIZE + 2 * MARGIN + SCROLLBAR_HEIGHT)
+        self.viewport().setMouseTracking(True)
+        self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        self.cell_font = QFont('Helvetica', 11, QFont.Weight.Bold)
+        self._update_cell_width()
+        self._apply_scrollbar_style()
+        self._update_scroll_range()
+    
+    def _apply_scrollbar_style(self):
+        """Style the frame and the horizontal scroll bar."""
+        self.setStyleSheet(f"""
+            QAbstractScrollArea {{
                 border: none;
                 background-color: transparent;
             }}
             QScrollBar:horizontal {{
                 border: none;
                 background: {self.colors['background']};
-                height: 8px;
+                height: {SCROLLBAR_HEIGHT}px;
                 margin: 0px;
             }}
             QScrollBar::handle:horizontal {{
@@ -53,29 +68,76 @@ class QuestionTimelineWidget(QWidget):
                 background: {self.colors['primary']};
             }}
         """)
-        
-        # Container for buttons
-        buttons_widget = QWidget()
-        buttons_layout = QHBoxLayout(buttons_widget)
-        buttons_layout.setContentsMargins(4, 4, 4, 4)
-        buttons_layout.setSpacing(6)
-        
-        # Create buttons for each question
-        for i in range(self.total_questions):
-            button = QPushButton(str(i + 1))
-            button.setFixedSize(36, 36)
-            button.setFont(QFont('Helvetica', 11, QFont.Weight.Bold))
-            button.clicked.connect(lambda checked, idx=i: self.on_button_clicked(idx))
-            self._update_button_style(button, i)
-            buttons_layout.addWidget(button)
-            self.buttons.append(button)
-        
-        buttons_layout.addStretch()
-        scroll.setWidget(buttons_widget)
-        layout.addWidget(scroll)
     
-    def _update_button_style(self, button: QPushButton, index: int):
-        """Update button style based on question state."""
+    def reset(self, total_questions: int):
+        """Show a timeline for another quiz."""
+        self.total_questions = total_questions
+        self.current_index = 0
+        self.answered_questions = set()
+        self.wrong_question_indices = set()
+        self.hovered_index = None
+        self._update_cell_width()
+        self.horizontalScrollBar().setValue(0)
+        self._update_scroll_range()
+        self.viewport().update()
+    
+    # Geometry
+    
+    def _update_cell_width(self):
+        """Make cells wide enough for the longest question number."""
+        text_width = QFontMetrics(self.cell_font).horizontalAdvance(str(max(self.total_questions, 1)))
+        self.cell_width = max(CELL_SIZE, text_width + 2 * CELL_PADDING)
+    
+    def _content_width(self) -> int:
+        return 2 * MARGIN + self.total_questions * (self.cell_width + CELL_SPACING) - CELL_SPACING
+    
+    def _update_scroll_range(self):
+        """Fit the scroll bar to the strip and the viewport width."""
+        scrollbar = self.horizontalScrollBar()
+        width = self.viewport().width()
+        scrollbar.setRange(0, max(0, self._content_width() - width))
+        scrollbar.setPageStep(width)
+        scrollbar.setSingleStep(self.cell_width + CELL_SPACING)
+    
+    def _cell_rect(self, index: int) -> QRect:
+        """Viewport rectangle of a question's cell."""
+        x = MARGIN + index * (self.cell_width + CELL_SPACING) - self.horizontalScrollBar().value()
+        y = (self.viewport().height() - CELL_SIZE) // 2
+        return QRect(x, y, self.cell_width, CELL_SIZE)
+    
+    def _index_at(self, x: int, y: int):
+        """Question index of the cell under a viewport point, or None."""
+        offset = x + self.horizontalScrollBar().value() - MARGIN
+        if offset < 0:
+            return None
+        index, within = divmod(offset, self.cell_width + CELL_SPACING)
+        if within >= self.cell_width or index >= self.total_questions:
+            return None
+        if not self._cell_rect(index).contains(x, y):
+            return None
+        return index
+    
+    def _update_cell(self, index):
+        """Repaint one cell if it is in view."""
+        if index is not None and 0 <= index < self.total_questions:
+            rect = self._cell_rect(index)
+            if rect.intersects(self.viewport().rect()):
+                self.viewport().update(rect)
+    
+    def ensure_visible(self, index: int):
+        """Scroll just far enough to show a question's cell."""
+        scrollbar = self.horizontalScrollBar()
+        left = MARGIN + index * (self.cell_width + CELL_SPACING)
+        right = left + self.cell_width
+        if left - MARGIN < scrollbar.value():
+            scrollbar.setValue(left - MARGIN)
+        elif right + MARGIN > scrollbar.value() + self.viewport().width():
+            scrollbar.setValue(right + MARGIN - self.viewport().width())
+    
+    # Painting
+    
+    def _cell_colors(self, index: int):
+        """Background, text and border colors and border width of a cell."""
         is_current = index == self.current_index
         is_answered = index in self.answered_questions
         is_wrong = index in self.wrong_question_indices
@@ -105,52 +167,104 @@ class QuestionTimelineWidget(QWidget):
             border_color = self.colors['border']
             border_width = 1
         
-        button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {bg_color};
-                color: {text_color};
-                border: {border_width}px solid {border_color};
-                border-radius: 8px;
-            }}
-            QPushButton:hover {{
-                background-color: {self.colors['hover']};
-                border: {border_width}px solid {self.colors['primary']};
-            }}
-        """)
+        if index == self.hovered_index:
+            bg_color = self.colors['hover']
+            border_color = self.colors['primary']
+        return bg_color, text_color, border_color, border_width
+    
+    def paintEvent(self, event):
+        """Paint the cells that intersect the exposed area."""
+        if self.total_questions <= 0:
+            return
+        area = event.rect()
+        offset = self.horizontalScrollBar().value()
+        pitch = self.cell_width + CELL_SPACING
+        first = max(0, (area.left() + offset - MARGIN) // pitch)
+        last = min(self.total_questions - 1, (area.right() + offset - MARGIN) // pitch)
+        
+        painter = QPainter(self.viewport())
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self.cell_font)
+        for index in range(first, last + 1):
+            rect = self._cell_rect(index)
+            bg_color, text_color, border_color, border_width = self._cell_colors(index)
+            inset = border_width / 2
+            painter.setPen(QPen(QColor(border_color), border_width))
+            painter.setBrush(QColor(bg_color))
+            painter.drawRoundedRect(QRectF(rect).adjusted(inset, inset, -inset, -inset), 8, 8)
+            painter.setPen(QColor(text_color))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, str(index + 1))
+        painter.end()
+    
+    # Events
+    
+    def scrollContentsBy(self, dx: int, dy: int):
+        """Shift the painted cells and paint only the strip scrolled into view."""
+        self.viewport().scroll(dx, dy)
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scroll_range()
     
-    def on_button_clicked(self, index: int):
-        """Handle button click to jump to question."""
-        self.question_selected.emit(index)
+    def wheelEvent(self, event):
+        """Scroll the strip sideways with a vertical wheel too."""
+        delta = event.angleDelta()
+        steps = delta.x() or delta.y()
+        scrollbar = self.horizontalScrollBar()
+        scrollbar.setValue(scrollbar.value() - steps * scrollbar.singleStep() // 120)
+        event.accept()
+    
+    def mouseMoveEvent(self, event):
+        position = event.position().toPoint()
+        index = self._index_at(position.x(), position.y())
+        if index != self.hovered_index:
+            previous, self.hovered_index = self.hovered_index, index
+            self._update_cell(previous)
+            self._update_cell(index)
+    
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        previous, self.hovered_index = self.hovered_index, None
+        self._update_cell(previous)
+    
+    def mousePressEvent(self, event):
+        """Jump to the clicked question."""
+        if event.button() != Qt.MouseButton.LeftButton:
+            return super().mousePressEvent(event)
+        position = event.position().toPoint()
+        index = self._index_at(position.x(), position.y())
+        if index is not None:
+            self.question_selected.emit(index)
+    
+    # State updates
     
     def update_current_index(self, index: int):
         """Update the current question index."""
-        if 0 <= self.current_index < len(self.buttons):
-            # Reset previous button
-            self._update_button_style(self.buttons[self.current_index], self.current_index)
-        
-        self.current_index = index
-        
-        if 0 <= index < len(self.buttons):
-            # Update new current button
-            self._update_button_style(self.buttons[index], index)
-    
-    def update_answered_questions(self, answered_indices: set):
-        """Update the set of answered questions."""
-        self.answered_questions = answered_indices.copy()
-        # Refresh all button styles
-        for i, button in enumerate(self.buttons):
-            self._update_button_style(button, i)
-    
-    def update_wrong_questions(self, wrong_indices: set):
-        """Update the set of wrong answer question indices."""
-        self.wrong_question_indices = wrong_indices.copy()
-        # Refresh all button styles
-        for i, button in enumerate(self.buttons):
-            self._update_button_style(button, i)
+        if index == self.current_index:
+            return
+        previous, self.current_index = self.current_index, index
+        self._update_cell(previous)
+        if 0 <= index < self.total_questions:
+            self.ensure_visible(index)
+            self._update_cell(index)
+    
+    def mark_answered(self, index: int, wrong: bool = False):
+        """Mark one question answered, repainting only its cell."""
+        self.answered_questions.add(index)
+        if wrong:
+            self.wrong_question_indices.add(index)
+        else:
+            self.wrong_question_indices.discard(index)
+        self._update_cell(index)
+    
+    def set_answers(self, answered_indices: set, wrong_indices: set):
+        """Replace the answered and wrong question sets and repaint the strip."""
+        self.answered_questions = set(answered_indices)
+        self.wrong_question_indices = set(wrong_indices)
+        self.viewport().update()
     
     def update_colors(self, colors: dict):
         """Update colors when theme changes."""
         self.colors = colors
-        # Refresh all button styles with new colors
-        for i, button in enumerate(self.buttons):
-            self._update_button_style(button, i)
+        self._apply_scrollbar_style()
+        self.viewport().update()
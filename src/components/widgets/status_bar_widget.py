@@ -21,6 +21,14 @@ class StatusBarWidget(QStatusBar):
         # Set initial status
         self._update_status()
     
+    def set_quiz_state(self, quiz_state: QuizState, timer_viewmodel: TimerViewModel):
+        """Show another quiz's statistics and timer."""
+        self.quiz_state = quiz_state
+        self.timer_viewmodel = timer_viewmodel
+        self.current_time_str = "00:00:00"
+        self.current_status_text = "Not started"
+        self._update_status()
+    
     def update_status(self, status_text: str = None):
         """Update status bar with timer and stats."""
         if status_text is not None:
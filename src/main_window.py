@@ -1,10 +1,9 @@
 import sys
 import os
-import json
 from datetime import datetime, timedelta
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QScrollArea, QMessageBox, QDialog)
-from PyQt6.QtCore import Qt, QTimer, QEventLoop
+from PyQt6.QtCore import Qt, QObject, QTimer, QEventLoop, pyqtSignal
 
 from src.models.quiz_state import QuizState
 from src.viewmodels.quiz_viewmodel import QuizViewModel
@@ -16,9 +15,19 @@ from src.components.widgets import (HeaderWidget, QuestionDisplayWidget,
                                    OptionButtonsWidget, NavigationFooterWidget,
                                    StatusBarWidget, QuestionTimelineWidget)
 from src.utils.shortcuts import ShortcutManager
+from src.utils.exam_catalog import get_exam_catalog
 
 
 class MockExamApp(QMainWindow):
+    """Main quiz window.
+    
+    The window and its widgets are built once and kept for the whole app run: each
+    quiz gets a fresh QuizState and ViewModels, bound to the existing widgets with
+    bind_quiz. When a quiz ends the window hides and emits quiz_closed.
+    """
+    
+    quiz_closed = pyqtSignal()  # The quiz ended and the window was hidden
+    
     def __init__(self, exam_data, shuffle_enabled=False, session_data=None, exam_file_path=None, practice_mode=False, show_answer_at_end=False):
         super().__init__()
         
@@ -26,16 +35,11 @@ class MockExamApp(QMainWindow):
         self.styles = Styles()
         self.colors = self.styles.colors
         
-        # Create state model
-        self.quiz_state = QuizState(exam_data, shuffle_enabled, session_data, practice_mode, show_answer_at_end)
-        if exam_file_path:
-            self.quiz_state.exam_file_path = exam_file_path
+        # Connections to the current quiz's state and ViewModels, dropped when it ends
+        self._quiz_connections = []
         
-        # Create ViewModels
-        self.timer_viewmodel = TimerViewModel(self.quiz_state)
-        self.quiz_viewmodel = QuizViewModel(self.quiz_state)
-        self.session_viewmodel = SessionViewModel(self.quiz_state, self.timer_viewmodel)
-        self.results_viewmodel = ResultsViewModel(self.quiz_state, self.timer_viewmodel)
+        # Create state model and ViewModels
+        self._create_quiz(exam_data, shuffle_enabled, session_data, exam_file_path, practice_mode, show_answer_at_end)
         
         # Set up window
         self._setup_window()
@@ -50,11 +54,50 @@ class MockExamApp(QMainWindow):
         self.shortcut_manager = ShortcutManager(self)
         self._setup_shortcuts()
         
-        # Set up crash protection
-        self.session_viewmodel.setup_crash_protection()
         self.original_closeEvent = self.closeEvent
         self.closeEvent = self._custom_close_event
         
+        self._start_quiz(session_data)
+    
+    def bind_quiz(self, exam_data, shuffle_enabled=False, session_data=None, exam_file_path=None, practice_mode=False, show_answer_at_end=False):
+        """Start another quiz in this window, reusing its widgets."""
+        self._release_quiz()
+        self._create_quiz(exam_data, shuffle_enabled, session_data, exam_file_path, practice_mode, show_answer_at_end)
+        
+        # Point the widgets at the new quiz
+        self._update_window_title()
+        self.header_widget.set_title(self.quiz_state.exam_data['title'])
+        self.header_widget.set_practice_mode(self.quiz_state.practice_mode)
+        self.header_widget.update_pause_state(False)
+        self.question_display.question_label.show()
+        self.option_buttons.show()
+        self.nav_footer.set_quiz_state(self.quiz_state, len(self.quiz_state.exam_data['questions']),
+                                       self.quiz_state.practice_mode)
+        self.status_bar_widget.set_quiz_state(self.quiz_state, self.timer_viewmodel)
+        
+        self._start_quiz(session_data)
+    
+    def _create_quiz(self, exam_data, shuffle_enabled, session_data, exam_file_path, practice_mode, show_answer_at_end):
+        """Create the state model and ViewModels for a quiz."""
+        self.quiz_state = QuizState(exam_data, shuffle_enabled, session_data, practice_mode, show_answer_at_end)
+        self._quiz_completed = False
+        if exam_file_path:
+            self.quiz_state.exam_file_path = exam_file_path
+            self.quiz_state.exam_ref = get_exam_catalog().ref_for_path(exam_file_path)
+        
+        self.timer_viewmodel = TimerViewModel(self.quiz_state)
+        self.quiz_viewmodel = QuizViewModel(self.quiz_state)
+        self.session_viewmodel = SessionViewModel(self.quiz_state, self.timer_viewmodel)
+        self.results_viewmodel = ResultsViewModel(self.quiz_state, self.timer_viewmodel,
+                                                  self.quiz_viewmodel.outcome_recorder)
+    
+    def _start_quiz(self, session_data):
+        """Connect the current quiz and show its first question."""
+        self._connect_quiz_signals()
+        
+        # Set up crash protection
+        self.session_viewmodel.setup_crash_protection()
+        
         # Display first question
         self.quiz_viewmodel._display_current_question()
         
@@ -62,8 +105,26 @@ class MockExamApp(QMainWindow):
         if not self.quiz_state.practice_mode and (not session_data or (session_data and 'timer_data' in session_data)):
             self.timer_viewmodel.start_timer()
     
-    def _setup_window(self):
-        """Set up the main window."""
+    def _release_quiz(self):
+        """Detach the current quiz from the window once it has ended."""
+        if not self._quiz_connections:
+            return  # already released
+        for connection in self._quiz_connections:
+            QObject.disconnect(connection)
+        self._quiz_connections = []
+        if self._on_answer_recorded in self.quiz_state.engine.answer_listeners:
+            self.quiz_state.engine.answer_listeners.remove(self._on_answer_recorded)
+        self.timer_viewmodel.timer.stop()
+        self.session_viewmodel.release_crash_protection()
+    
+    def _return_home(self):
+        """End the quiz and hide the window so the test dialog can show again."""
+        self._release_quiz()
+        self.hide()
+        self.quiz_closed.emit()
+    
+    def _update_window_title(self):
+        """Set the window title for the current quiz."""
         if self.quiz_state.practice_mode:
             title_suffix = " - Practice Mode"
             if self.quiz_state.shuffle_enabled:
@@ -75,6 +136,10 @@ class MockExamApp(QMainWindow):
         else:
             title_suffix = " - Study Mode (Shuffled)" if self.quiz_state.shuffle_enabled else " - Study Mode"
         self.setWindowTitle(f"{self.quiz_state.exam_data['title']}{title_suffix}")
+    
+    def _setup_window(self):
+        """Set up the main window."""
+        self._update_window_title()
         self.setMinimumSize(800, 600)
         
         # Set application style
@@ -140,7 +205,7 @@ class MockExamApp(QMainWindow):
         pass
     
     def _connect_signals(self):
-        """Connect all ViewModel and widget signals."""
+        """Connect widget signals; these outlive any one quiz."""
         # Header signals
         self.header_widget.dark_mode_toggled.connect(self._toggle_dark_mode)
         self.header_widget.pause_toggled.connect(self._toggle_pause)
@@ -151,45 +216,50 @@ class MockExamApp(QMainWindow):
         self.option_buttons.option_clicked.connect(self._on_option_clicked)
         
         # Navigation footer signals
-        self.nav_footer.prev_clicked.connect(self.quiz_viewmodel.previous_question)
-        self.nav_footer.next_clicked.connect(self.quiz_viewmodel.next_question)
         self.nav_footer.action_clicked.connect(self._handle_action_button)
-        self.nav_footer.study_clicked.connect(self.quiz_viewmodel.study_wrong_questions)
-        if hasattr(self.nav_footer, 'question_jumped'):
-            self.nav_footer.question_jumped.connect(self.quiz_viewmodel.jump_to_question)
-        
-        # Quiz ViewModel signals
-        self.quiz_viewmodel.question_changed.connect(self._on_question_changed)
-        self.quiz_viewmodel.review_question_ready.connect(self._on_review_question_ready)
-        self.quiz_viewmodel.option_selected.connect(self.question_display.set_selection)
-        self.quiz_viewmodel.answer_validated.connect(self._on_answer_validated)
-        self.quiz_viewmodel.navigation_state_changed.connect(self.nav_footer.update_navigation_state)
-        self.quiz_viewmodel.progress_changed.connect(self._on_progress_changed)
-        self.quiz_viewmodel.review_mode_entered.connect(self._on_review_mode_entered)
-        self.quiz_viewmodel.study_mode_entered.connect(self._on_study_mode_entered)
-        self.quiz_viewmodel.quiz_complete.connect(self._on_quiz_complete)
-        
-        # Quiz State signals for timeline updates
-        self.quiz_state.answered_questions_changed.connect(self._on_answered_questions_changed)
-        self.quiz_state.wrong_answers_changed.connect(self._on_wrong_answers_changed)
-        
-        # Timer ViewModel signals
-        self.timer_viewmodel.time_updated.connect(self.status_bar_widget.update_status)
-        
-        # Quiz State signals
-        self.quiz_state.pause_state_changed.connect(self._on_pause_state_changed)
-        self.quiz_state.answer_revealed_changed.connect(self._on_answer_revealed_changed)
-        self.quiz_state.review_mode_changed.connect(self._on_review_mode_changed)
-        
-        # Results ViewModel signals
-        self.results_viewmodel.results_ready.connect(self._on_results_ready)
+    
+    def _connect_quiz_signals(self):
+        """Connect the current quiz's ViewModel and state signals, remembering them for _release_quiz."""
+        connections = [
+            # Navigation footer signals
+            self.nav_footer.prev_clicked.connect(self.quiz_viewmodel.previous_question),
+            self.nav_footer.next_clicked.connect(self.quiz_viewmodel.next_question),
+            self.nav_footer.study_clicked.connect(self.quiz_viewmodel.study_wrong_questions),
+            self.nav_footer.question_jumped.connect(self.quiz_viewmodel.jump_to_question),
+            
+            # Quiz ViewModel signals
+            self.quiz_viewmodel.question_changed.connect(self._on_question_changed),
+            self.quiz_viewmodel.review_question_ready.connect(self._on_review_question_ready),
+            self.quiz_viewmodel.option_selected.connect(self.question_display.set_selection),
+            self.quiz_viewmodel.answer_validated.connect(self._on_answer_validated),
+            self.quiz_viewmodel.navigation_state_changed.connect(self.nav_footer.update_navigation_state),
+            self.quiz_viewmodel.progress_changed.connect(self._on_progress_changed),
+            self.quiz_viewmodel.review_mode_entered.connect(self._on_review_mode_entered),
+            self.quiz_viewmodel.study_mode_entered.connect(self._on_study_mode_entered),
+            self.quiz_viewmodel.quiz_complete.connect(self._on_quiz_complete),
+            
+            # Timer ViewModel signals
+            self.timer_viewmodel.time_updated.connect(self.status_bar_widget.update_status),
+            
+            # Quiz State signals
+            self.quiz_state.pause_state_changed.connect(self._on_pause_state_changed),
+            self.quiz_state.answer_revealed_changed.connect(self._on_answer_revealed_changed),
+            self.quiz_state.review_mode_changed.connect(self._on_review_mode_changed),
+            
+            # Results ViewModel signals
+            self.results_viewmodel.results_ready.connect(self._on_results_ready),
+        ]
+        self._quiz_connections.extend(connections)
+        
+        # Graded answers reach the practice mode timeline one question at a time
+        self.quiz_state.engine.answer_listeners.append(self._on_answer_recorded)
     
     def _setup_shortcuts(self):
         """Set up keyboard shortcuts."""
         self.shortcut_manager.setup_global_shortcuts(
             show_answer_callback=self._show_answer,
             next_question_callback=self._shortcut_next_question,
-            prev_question_callback=self.quiz_viewmodel.previous_question,
+            prev_question_callback=self._shortcut_previous_question,
             dark_mode_callback=self._toggle_dark_mode,
             pause_callback=self._toggle_pause
         )
@@ -380,6 +450,10 @@ class MockExamApp(QMainWindow):
             return
         self.quiz_viewmodel.next_question()
     
+    def _shortcut_previous_question(self):
+        """Handle previous question shortcut."""
+        self.quiz_viewmodel.previous_question()
+    
     def _toggle_pause(self):
         """Toggle pause state."""
         self.quiz_state.is_paused = not self.quiz_state.is_paused
@@ -432,15 +506,10 @@ class MockExamApp(QMainWindow):
         # Also update status bar when progress changes
         self.status_bar_widget.update_status()
     
-    def _on_answered_questions_changed(self, answered: set):
-        """Handle answered questions change - update timeline."""
-        if self.quiz_state.practice_mode and hasattr(self.nav_footer, 'timeline_widget') and self.nav_footer.timeline_widget:
-            self.nav_footer.update_progress(self.quiz_state.current_index + 1, self.quiz_state.get_total_questions())
-    
-    def _on_wrong_answers_changed(self, wrong_answers: list):
-        """Handle wrong answers change - update timeline."""
-        if self.quiz_state.practice_mode and hasattr(self.nav_footer, 'timeline_widget') and self.nav_footer.timeline_widget:
-            self.nav_footer.update_progress(self.quiz_state.current_index + 1, self.quiz_state.get_total_questions())
+    def _on_answer_recorded(self, record: dict):
+        """Answer listener: show the one question just answered on the timeline."""
+        if self.quiz_state.practice_mode:
+            self.nav_footer.mark_answered(record['pos'], record['ok'])
     
     def _on_review_mode_entered(self):
         """Handle review mode entered."""
@@ -458,6 +527,7 @@ class MockExamApp(QMainWindow):
         self.setWindowTitle(filtered_exam['title'])
         self.nav_footer.show_study_button(False)
         self.nav_footer.update_total_questions(len(filtered_exam['questions']))
+        self.nav_footer.sync_timeline()
         self.nav_footer.set_action_button_text("Confirm Answer", enabled=False, is_secondary=False)
     
     def _on_quiz_complete(self, results: dict):
@@ -466,6 +536,11 @@ class MockExamApp(QMainWindow):
         self.timer_viewmodel.stop_timer()
         self.session_viewmodel.save_session_data(auto_save=False, emergency=False, completed=True)
         
+        # The completed snapshot is final: answers stay browsable, but quitting or
+        # closing must not overwrite it with an emergency save
+        self._quiz_completed = True
+        self.session_viewmodel.release_crash_protection()
+        
         # Save results to file
         self.results_viewmodel.save_results_to_file()
         
@@ -506,7 +581,33 @@ class MockExamApp(QMainWindow):
             # Don't close if we're showing all answers - let user navigate
             pass
         else:
-            self.close()
+            self._return_home()
+    
+    def apply_keyword_filter(self, keyword: str):
+        """Restrict the quiz to questions matching keyword."""
+        if not self.quiz_viewmodel.study_matching_questions(keyword):
+            QMessageBox.information(self, "No Matches", f"No questions in this exam match \"{keyword}\". Showing all questions.")
+    
+    def apply_question_set(self, question_set: str):
+        """Restrict the quiz to a question set chosen in the test dialog."""
+        if question_set == 'due':
+            if not self.quiz_viewmodel.study_due_questions():
+                QMessageBox.information(self, "Nothing Due", "No questions in this exam are due for review today. Showing all questions.")
+        elif question_set == 'hard':
+            if not self.quiz_viewmodel.study_hard_questions():
+                if self.quiz_viewmodel.analysis_pending:
+                    self._show_analysis_pending()
+                else:
+                    QMessageBox.information(self, "No Hard Questions", "There aren't enough past answers to this exam to pick out hard questions. Showing all questions.")
+        elif question_set == 'balanced':
+            if not self.quiz_viewmodel.study_difficulty_balanced():
+                if self.quiz_viewmodel.analysis_pending:
+                    self._show_analysis_pending()
+                else:
+                    QMessageBox.information(self, "No Difficulty Data", "There are no past answers to this exam to balance difficulty with. Showing all questions.")
+    
+    def _show_analysis_pending(self):
+        QMessageBox.information(self, "Analysis Not Ready", "Past answers to this exam are still being analyzed. Showing all questions; choose this question set again in a moment.")
     
     def _on_results_ready(self, results_data: dict):
         """Handle results ready signal."""
@@ -514,6 +615,11 @@ class MockExamApp(QMainWindow):
     
     def _quit_quiz(self):
         """Handle quit quiz button click."""
+        if self._quiz_completed:
+            # Already saved as completed
+            self._return_home()
+            return
+        
         # Save session before quitting with quit flag
         try:
             if self.session_viewmodel is not None:
@@ -535,12 +641,9 @@ class MockExamApp(QMainWindow):
                 session_data = {
                     'session_date': session_date,
                     'exam_title': self.quiz_state.exam_data['title'],
+                    'exam_ref': self.quiz_state.exam_ref,
                     'total_questions': len(self.quiz_state.exam_data['questions']),
-                    'quiz_mode': {
-                        'score': self.quiz_state.score,
-                        'total_answered': len(self.quiz_state.answered_questions),
-                        'wrong_answers': self.quiz_state.wrong_answers
-                    },
+                    'quiz_mode': self.quiz_state.engine.progress_snapshot(),
                     'timer_data': {
                         'elapsed_seconds': int(total_elapsed.total_seconds()),
                         'completed': False,
@@ -555,12 +658,21 @@ class MockExamApp(QMainWindow):
             except Exception:
                 pass
         
-        # Close and delete the window to return to home page
-        self.close()
-        self.deleteLater()
+        # Hide the window to return to home page; it is reused for the next quiz
+        self._return_home()
     
     def _custom_close_event(self, event):
         """Custom close event handler."""
+        if not self._quiz_connections:
+            # The quiz already ended and was saved
+            event.accept()
+            return
+        if self._quiz_completed:
+            # Already saved as completed
+            event.accept()
+            self._release_quiz()
+            self.quiz_closed.emit()
+            return
         try:
             if self.session_viewmodel is not None:
                 self.session_viewmodel.emergency_save()
@@ -580,12 +692,9 @@ class MockExamApp(QMainWindow):
                 session_data = {
                     'session_date': session_date,
                     'exam_title': self.quiz_state.exam_data['title'],
+                    'exam_ref': self.quiz_state.exam_ref,
                     'total_questions': len(self.quiz_state.exam_data['questions']),
-                    'quiz_mode': {
-                        'score': self.quiz_state.score,
-                        'total_answered': len(self.quiz_state.answered_questions),
-                        'wrong_answers': self.quiz_state.wrong_answers
-                    },
+                    'quiz_mode': self.quiz_state.engine.progress_snapshot(),
                     'timer_data': {
                         'elapsed_seconds': int(total_elapsed.total_seconds()),
                         'completed': False,
@@ -599,19 +708,43 @@ class MockExamApp(QMainWindow):
             except Exception as save_error:
                 pass  # Silently fail if save isn't possible
         event.accept()
+        self._release_quiz()
+        self.quiz_closed.emit()
     
 
+def show_quiz(window, exam_data, **options):
+    """Show a quiz in the main window, creating the window for the first quiz."""
+    if window is None:
+        window = MockExamApp(exam_data, **options)
+    else:
+        window.bind_quiz(exam_data, **options)
+    window.show()
+    return window
+
+
+def wait_for_quiz(window):
+    """Run the event loop until the window's quiz ends."""
+    loop = QEventLoop()
+    window.quiz_closed.connect(loop.quit)
+    if window.isVisible():
+        loop.exec()
+    window.quiz_closed.disconnect(loop.quit)
+
+
 def main():
     app = QApplication(sys.argv)
     # Don't quit when last window closes - we want to show dialog again
     app.setQuitOnLastWindowClosed(False)
     
+    # The dialog and window are kept between quizzes: the dialog only reloads the
+    # lists that changed, and the window is re-bound to each new quiz
+    from src.components.dialogs.test_select_dialog import TestSelectDialog
+    test_dialog = TestSelectDialog()
+    window = None
+    
     # Loop to allow returning to home page
     while True:
         # Show test selection dialog
-        from src.components.dialogs.test_select_dialog import TestSelectDialog
-        test_dialog = TestSelectDialog()
-        
         if test_dialog.exec() != QDialog.DialogCode.Accepted:
             app.quit()  # User cancelled, exit app
             break
@@ -621,18 +754,26 @@ def main():
         shuffle_enabled = test_dialog.is_shuffle_enabled()
         practice_mode = test_dialog.is_practice_mode_enabled()
         show_answer_at_end = test_dialog.is_show_answer_at_end_enabled()
+        keyword = test_dialog.get_question_keyword()
+        question_set = test_dialog.get_question_set()
         
         if selected_result:
-            # Load exam and enter review mode
+            # Load the full results file and enter review mode
+            from src.utils.results_store import load_result
+            try:
+                selected_result = load_result(selected_result['_filepath'])
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(None, "Error", f"Could not load results file.\n\n{str(e)}")
+                continue
             incorrect_answers = selected_result.get('detailed_results', {}).get('incorrect_answers', [])
             if not incorrect_answers:
                 QMessageBox.information(None, "No Incorrect Answers", "This test session has no incorrect answers to review.")
-                sys.exit(0)
+                continue
             
             exam_file_path = selected_result.get('exam_info', {}).get('exam_file_path')
             if not exam_file_path:
                 QMessageBox.warning(None, "Error", "Exam file path not found in result data.")
-                sys.exit(1)
+                continue
             
             project_root = os.path.dirname(os.path.dirname(__file__))
             if not os.path.isabs(exam_file_path):
@@ -641,61 +782,56 @@ def main():
             from src.utils.data_loader import load_exam_data
             try:
                 exam_data = load_exam_data(exam_file_path)
-            except Exception as e:
+            except ValueError as e:
                 QMessageBox.warning(None, "Error", f"Could not load exam file: {exam_file_path}\n\n{str(e)}")
-                sys.exit(1)
+                continue
             
-            window = MockExamApp(exam_data, shuffle_enabled=False, exam_file_path=exam_file_path, practice_mode=practice_mode, show_answer_at_end=False)
+            window = show_quiz(window, exam_data, shuffle_enabled=False, exam_file_path=exam_file_path, practice_mode=practice_mode, show_answer_at_end=False)
             window.quiz_state.wrong_answers = incorrect_answers
-            window.show()
             QTimer.singleShot(100, window.quiz_viewmodel.enter_review_mode)
-            # Wait for window to close, then continue loop
-            loop = QEventLoop()
-            window.destroyed.connect(loop.quit)
-            if window.isVisible():
-                loop.exec()
+            # Wait for the quiz to end, then continue loop
+            wait_for_quiz(window)
         elif selected_exam:
             from src.utils.data_loader import load_exam_data
             exam_file_path = selected_exam['filepath']
-            exam_data = load_exam_data(exam_file_path)
+            try:
+                exam_data = load_exam_data(exam_file_path)
+            except ValueError as e:
+                QMessageBox.warning(None, "Error", f"Could not load exam file: {exam_file_path}\n\n{str(e)}")
+                continue
             
-            window = MockExamApp(exam_data, shuffle_enabled, exam_file_path=exam_file_path, practice_mode=practice_mode, show_answer_at_end=show_answer_at_end)
-            window.show()
-            # Wait for window to close, then continue loop
-            loop = QEventLoop()
-            window.destroyed.connect(loop.quit)
-            if window.isVisible():
-                loop.exec()
+            window = show_quiz(window, exam_data, shuffle_enabled=shuffle_enabled, exam_file_path=exam_file_path, practice_mode=practice_mode, show_answer_at_end=show_answer_at_end)
+            if question_set:
+                QTimer.singleShot(100, lambda: window.apply_question_set(question_set))
+            elif keyword:
+                QTimer.singleShot(100, lambda: window.apply_keyword_filter(keyword))
+            # Wait for the quiz to end, then continue loop
+            wait_for_quiz(window)
         elif selected_session:
             from src.utils.data_loader import load_exam_data
             exam_title = selected_session['exam_title']
-            project_root = os.path.dirname(os.path.dirname(__file__))
-            
-            exam_file = None
-            exams_dir = os.path.join(project_root, 'exams')
-            if os.path.exists(exams_dir):
-                for filename in os.listdir(exams_dir):
-                    if filename.endswith('.json'):
-                        try:
-                            with open(os.path.join(exams_dir, filename), 'r') as f:
-                                data = json.load(f)
-                                if data.get('title') == exam_title:
-                                    exam_file = os.path.join(exams_dir, filename)
-                                    break
-                        except:
-                            continue
+            # Sessions saved with an exam_ref resolve by path/hash; older ones fall back to the title
+            exam_file = get_exam_catalog().resolve(selected_session.get('exam_ref'), exam_title)
+            if not exam_file:
+                QMessageBox.warning(None, "Error", f"Could not find exam file for session: {exam_title}")
+                continue
             
-            if exam_file:
+            try:
                 exam_data = load_exam_data(exam_file)
-                window = MockExamApp(exam_data, shuffle_enabled, selected_session, exam_file_path=exam_file, practice_mode=practice_mode, show_answer_at_end=False)
-                window.show()
-                # Wait for window to close, then continue loop
-                loop = QEventLoop()
-                window.destroyed.connect(loop.quit)
-                if window.isVisible():
-                    loop.exec()
-            else:
-                QMessageBox.warning(None, "Error", f"Could not find exam file for session: {exam_title}")
-                break  # Exit on error
+            except ValueError as e:
+                QMessageBox.warning(None, "Error", f"Could not load exam file: {exam_file}\n\n{str(e)}")
+                continue
+            
+            # The dialog lists index summaries; load the full session to resume it
+            from src.utils.session_manager import SessionManager
+            try:
+                session_data = SessionManager().load_session(selected_session['_filepath'])
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(None, "Error", f"Could not load session file.\n\n{str(e)}")
+                continue
+            session_data['_filepath'] = selected_session['_filepath']
+            window = show_quiz(window, exam_data, shuffle_enabled=shuffle_enabled, session_data=session_data, exam_file_path=exam_file, practice_mode=practice_mode, show_answer_at_end=False)
+            # Wait for the quiz to end, then continue loop
+            wait_for_quiz(window)
     
     sys.exit(0) 
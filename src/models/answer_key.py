@@ -0,0 +1,111 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Bit masks are stored as uint64 and the top bit is reserved, so a question can have at most this many options
+MAX_OPTIONS = 63
+
+# Set in a submitted mask for a key that isn't one of the options, so the submission
+# counts as answered but can never match a key
+UNKNOWN_OPTION = 1 << MAX_OPTIONS
+
+
+class AnswerKey:
+    """A question's answer compiled once: the correct options as a bit mask plus pre-joined text.
+
+    Bit i stands for the i-th option in the question's 'options' order. Single and
+    multiple choice are graded the same way, by comparing the submitted mask with
+    the key, so a single-choice submission with more than one option is wrong.
+    grade() and grade_batch() follow the same rule.
+    """
+
+    __slots__ = ('option_keys', 'bits', 'mask', 'multi', 'correct_keys', 'options',
+                 'correct_text', 'correct_keys_text', 'correct_options_text')
+
+    def __init__(self, question: Dict):
+        self.options: Dict[str, str] = question['options']
+        self.option_keys: Tuple[str, ...] = tuple(self.options)
+        if len(self.option_keys) > MAX_OPTIONS:
+            raise ValueError(f"Questions can have at most {MAX_OPTIONS} options")
+        self.bits = {key: 1 << i for i, key in enumerate(self.option_keys)}
+        self.multi = question.get('type', 'singleChoice') == "multiChoice"
+
+        answer = question['answer']
+        self.correct_keys: List[str] = list(answer) if isinstance(answer, list) else [answer]
+        if all(key in self.bits for key in self.correct_keys):
+            self.mask = self.mask_of(self.correct_keys)
+        else:
+            self.mask = 0  # an answer that isn't one of the options can never be matched
+
+        # Text used in feedback and wrong-answer records
+        self.correct_text = "; ".join(self.options[key] for key in self.correct_keys if key in self.options)
+        self.correct_keys_text = ", ".join(self.correct_keys)
+        self.correct_options_text = "\n".join(f"{key}. {self.options[key]}"
+                                              for key in self.correct_keys if key in self.options)
+
+    def mask_of(self, selected: Sequence[str]) -> int:
+        """Bit mask for a list of option keys; unknown keys set UNKNOWN_OPTION."""
+        mask = 0
+        for key in selected:
+            mask |= self.bits.get(key, UNKNOWN_OPTION)
+        return mask
+
+    def keys_of(self, mask: int) -> List[str]:
+        """Option keys set in a bit mask, in option order."""
+        return [key for key in self.option_keys if mask & self.bits[key]]
+
+    def grade(self, selected: Sequence[str]) -> bool:
+        """Whether the selected option keys are exactly the correct ones."""
+        if not self.mask or not selected:
+            return False
+        return self.mask_of(selected) == self.mask
+
+    def selected_text(self, selected: Sequence[str]) -> str:
+        """The selected options' text, joined the way wrong-answer records store it."""
+        if self.multi or len(selected) > 1:
+            return "; ".join(self.options[key] for key in selected)
+        return self.options.get(selected[0], "") if selected else ""
+
+
+class AnswerKeys(Sequence):
+    """Answer keys for a question bank, compiled the first time each question is graded."""
+
+    def __init__(self, questions: Sequence[Dict]):
+        self.questions = questions
+        self._keys: List[Optional[AnswerKey]] = [None] * len(questions)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getitem__(self, index: int) -> AnswerKey:
+        key = self._keys[index]
+        if key is None:
+            key = self._keys[index] = AnswerKey(self.questions[index])
+        return key
+
+    def masks(self) -> np.ndarray:
+        """Every question's key mask as a uint64 array (compiles all keys)."""
+        return np.fromiter((self[i].mask for i in range(len(self))), dtype=np.uint64, count=len(self))
+
+
+def grade_batch(key_masks: np.ndarray, submissions: np.ndarray) -> Dict[str, np.ndarray]:
+    """Grade N submissions to the same questions in one pass.
+
+    Args:
+        key_masks: Key bit masks, shape (Q,)
+        submissions: Submitted bit masks, shape (N, Q); 0 means unanswered
+
+    Returns:
+        Dict[str, np.ndarray]: 'correct' (N, Q) bool, 'answered' (N, Q) bool,
+        'scores' (N,) correct answers per submission and 'answered_counts' (N,)
+    """
+    key_masks = np.asarray(key_masks, dtype=np.uint64)
+    submissions = np.asarray(submissions, dtype=np.uint64)
+    answered = submissions != 0
+    correct = (submissions == key_masks) & answered & (key_masks != 0)
+    return {
+        'correct': correct,
+        'answered': answered,
+        'scores': correct.sum(axis=1),
+        'answered_counts': answered.sum(axis=1)
+    }
@@ -0,0 +1,81 @@
+from collections.abc import Sequence
+from typing import Dict, Optional
+
+
+class QuestionBank(Sequence):
+    """Immutable backing store for an exam's questions.
+
+    Shuffled orders and review, study and reveal-all subsets are QuestionViews over
+    the same bank, so switching modes never copies question data. Questions handed
+    out by the bank are shared and must be treated as read-only.
+    """
+
+    def __init__(self, questions: Sequence):
+        self._questions = questions
+
+    def __len__(self) -> int:
+        return len(self._questions)
+
+    def __getitem__(self, index):
+        return self._questions[index]
+
+    def view(self, order: Optional[Sequence] = None, annotations: Optional[Dict[int, Dict]] = None) -> "QuestionView":
+        """Create a view over the bank.
+
+        Args:
+            order: Bank indices in view order (defaults to every question in bank order)
+            annotations: Per-attempt fields keyed by view position, overlaid on the question
+        """
+        if order is None:
+            order = range(len(self._questions))
+        return QuestionView(self, order, annotations)
+
+    def warm(self, index: int, radius: int = 2):
+        """Let lazy question sources preload the window around a bank index."""
+        if hasattr(self._questions, 'warm'):
+            self._questions.warm(index, radius)
+
+
+class QuestionView(Sequence):
+    """An ordered subset of a QuestionBank, stored as an index array plus an annotation side table."""
+
+    def __init__(self, bank: QuestionBank, order: Sequence, annotations: Optional[Dict[int, Dict]] = None):
+        self.bank = bank
+        self.order = order
+        self.annotations = annotations or {}
+        self._positions: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        question = self.bank[self.order[index]]
+        annotation = self.annotations.get(index)
+        if annotation:
+            # Shallow overlay: the shared question dict itself is never modified
+            return {**question, **annotation}
+        return question
+
+    def bank_index(self, index: int) -> int:
+        """Return the bank index of the question at a view position."""
+        return self.order[index]
+
+    def position_of(self, bank_index: int) -> Optional[int]:
+        """Return the first view position showing a bank index, or None if it isn't in the view."""
+        if isinstance(self.order, range):
+            return self.order.index(bank_index) if bank_index in self.order else None
+        if self._positions is None:
+            # Views are immutable, so the inverse index is built once
+            self._positions = {}
+            for position, index in enumerate(self.order):
+                self._positions.setdefault(index, position)
+        return self._positions.get(bank_index)
+
+    def warm(self, index: int, radius: int = 2):
+        """Preload the questions around a view position in a lazy bank."""
+        for i in range(max(0, index - radius), min(len(self), index + radius + 1)):
+            self.bank.warm(self.order[i], 0)
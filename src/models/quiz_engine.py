@@ -0,0 +1,614 @@
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from src.models.answer_key import AnswerKey, AnswerKeys
+from src.models.question_bank import QuestionBank, QuestionView
+from src.utils.lazy_exam import QuestionSource
+
+# Results of QuizEngine.next()
+MOVED = "moved"
+COMPLETE = "complete"
+
+# Saved as 'question_order' when questions are in exam order, instead of listing every index
+IDENTITY_ORDER = "identity"
+
+
+def normalize_question_text(text: str) -> str:
+    """Normalize question text for matching: collapse and trim whitespace."""
+    return " ".join(text.split())
+
+
+class _Observed:
+    """Engine field whose assignments are reported to the engine's listener."""
+
+    def __init__(self, only_on_change: bool = True):
+        self.only_on_change = only_on_change
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.attr = f"_{name}"
+
+    def __get__(self, engine, owner=None):
+        if engine is None:
+            return self
+        return engine.__dict__[self.attr]
+
+    def __set__(self, engine, value):
+        if self.only_on_change and engine.__dict__.get(self.attr) == value:
+            return
+        engine.__dict__[self.attr] = value
+        engine._notify(self.name)
+
+
+class QuizEngine:
+    """Quiz grading, navigation and scoring with no Qt dependency.
+
+    QuizState wraps an engine and re-emits its changes as Qt signals, but the engine
+    also runs on its own in worker processes, servers and benchmarks. Assignments to
+    observed fields are reported through `listener(field_name, value)`.
+    """
+
+    current_index = _Observed()
+    score = _Observed()
+    wrong_answers = _Observed(only_on_change=False)
+    answered_questions = _Observed(only_on_change=False)
+    answer_revealed = _Observed()
+    is_paused = _Observed()
+    review_mode = _Observed()
+    elapsed_time = _Observed(only_on_change=False)
+    practice_mode = _Observed()
+
+    def __init__(self, exam_data: Dict, shuffle_enabled: bool = False, session_data: Optional[Dict] = None,
+                 practice_mode: bool = False, show_answer_at_end: bool = False,
+                 listener: Optional[Callable[[str, object], None]] = None):
+        self.listener = listener
+        # Bumped on every observed change so savers can tell whether anything is unsaved
+        self.revision = 0
+        # Called with an answer record (see _record_answer) after each graded answer
+        self.answer_listeners: List[Callable[[Dict], None]] = []
+
+        # Every mode below is a view over this bank; question data is never copied
+        self.bank = QuestionBank(exam_data['questions'])
+        # Compiled per question the first time it is graded
+        self.answer_keys = AnswerKeys(self.bank)
+        self.original_exam_data = {'title': exam_data['title'], 'questions': self.bank}
+        self.exam_data = {'title': exam_data['title'], 'questions': self.bank.view()}
+
+        # Lookup maps from question id / normalized-text hash to bank index
+        self._index_by_id: Optional[Dict] = None
+        self._index_by_text: Optional[Dict[int, int]] = None
+        if not isinstance(exam_data['questions'], QuestionSource):
+            # Lazy sources defer this until the first review transition to keep opening cheap
+            self._build_question_lookups()
+        self.shuffle_enabled = shuffle_enabled
+        self.session_data = session_data
+        self._practice_mode = practice_mode
+        self.show_answer_at_end = show_answer_at_end
+
+        # Exam data
+        self.exam_file_path: Optional[str] = None
+        self.exam_ref: Optional[Dict] = None
+        self.session_filepath: Optional[str] = None
+        self.original_session_date: Optional[str] = None
+
+        # Quiz state
+        self._current_index = 0
+        self._score = 0
+        self._wrong_answers: List[Dict] = []
+        self._answered_questions: Set[int] = set()
+        self._answer_revealed = False
+        self.selected_options: List[str] = []
+        # When the current question was shown, for time-per-answer
+        self._answer_clock = time.monotonic()
+
+        # Pause and review state
+        self._is_paused = False
+        self._review_mode = False
+        self.review_questions: Sequence[Dict] = []
+
+        # Timer state
+        self.start_time: Optional[datetime] = None
+        self._elapsed_time = timedelta(0)
+
+        # Initialize from session data if resuming
+        saved_order = None
+        keep_order = False
+        if session_data:
+            self.session_filepath = session_data.get('_filepath')
+            self.original_session_date = session_data.get('session_date')
+            quiz_mode = session_data.get('quiz_mode', {})
+            self._score = quiz_mode.get('score', 0)
+            self._wrong_answers = quiz_mode.get('wrong_answers', [])
+            total_answered = quiz_mode.get('total_answered', 0)
+            if 'answered_questions' in quiz_mode:
+                self._answered_questions = set(quiz_mode['answered_questions'])
+                # Saved positions refer to the saved order, so it must never be reshuffled
+                keep_order = True
+            else:
+                # Sessions saved before answered positions were recorded
+                self._answered_questions = set(range(total_answered))
+            self._current_index = quiz_mode.get('current_index', total_answered)
+            saved_order = quiz_mode.get('question_order')
+            if saved_order == IDENTITY_ORDER:
+                saved_order = None
+            elif saved_order is not None and not all(0 <= i < len(self.bank) for i in saved_order):
+                saved_order = None
+
+            if 'timer_data' in session_data:
+                timer_data = session_data['timer_data']
+                self._elapsed_time = timedelta(seconds=timer_data.get('elapsed_seconds', 0))
+
+        # Restore the saved question order, or shuffle questions if enabled. Only sessions
+        # saved before positions were recorded may be reshuffled on resume.
+        if saved_order is not None:
+            self.exam_data = {'title': exam_data['title'], 'questions': self.bank.view(saved_order)}
+        elif shuffle_enabled and not keep_order:
+            order = list(range(len(self.bank)))
+            random.shuffle(order)
+            self.exam_data = {'title': exam_data['title'], 'questions': self.bank.view(order)}
+
+        # The quiz view answered positions refer to; review mode swaps exam_data but not this
+        self._quiz_view: QuestionView = self.exam_data['questions']
+
+    @property
+    def quiz_view(self) -> QuestionView:
+        """The question view answered positions refer to (unchanged by review mode)."""
+        return self._quiz_view
+
+    def _notify(self, name: str):
+        self.revision += 1
+        if self.listener is not None:
+            self.listener(name, self.__dict__[f"_{name}"])
+
+    # Questions
+
+    def get_current_question(self) -> Optional[Dict]:
+        """Get the current question based on review mode or normal mode."""
+        if self.review_mode and self.review_questions:
+            if 0 <= self.current_index < len(self.review_questions):
+                return self.review_questions[self.current_index]
+        elif 0 <= self.current_index < len(self.exam_data['questions']):
+            questions = self.exam_data['questions']
+            if hasattr(questions, 'warm'):
+                questions.warm(self.current_index)
+            return questions[self.current_index]
+        return None
+
+    def get_total_questions(self) -> int:
+        """Get total number of questions in current mode."""
+        if self.review_mode:
+            return len(self.review_questions)
+        return len(self.exam_data['questions'])
+
+    def _build_question_lookups(self):
+        """Build the id and text lookup maps in one pass over the bank. First match wins."""
+        self._index_by_id = {}
+        self._index_by_text = {}
+        for index, question in enumerate(self.bank):
+            self._index_by_id.setdefault(question.get('id'), index)
+            text_hash = hash(normalize_question_text(question.get('question', '')))
+            self._index_by_text.setdefault(text_hash, index)
+
+    def find_question_index(self, question_id=None, question_text: Optional[str] = None) -> Optional[int]:
+        """Find a question's bank index by id, or by question text when no id is given."""
+        if self._index_by_id is None:
+            self._build_question_lookups()
+
+        if question_id is not None:
+            return self._index_by_id.get(question_id)
+        if question_text is None:
+            return None
+
+        normalized = normalize_question_text(question_text)
+        index = self._index_by_text.get(hash(normalized))
+        # Confirm the match so a hash collision can't return the wrong question
+        if index is not None and normalize_question_text(self.bank[index].get('question', '')) == normalized:
+            return index
+        return None
+
+    def wrong_question_positions(self) -> Set[int]:
+        """Return positions in the current exam view of questions answered incorrectly."""
+        questions = self.exam_data['questions']
+        positions = set()
+        for wrong_answer in self._wrong_answers:
+            index = self.find_question_index(question_text=wrong_answer.get('question', ''))
+            if index is not None:
+                position = questions.position_of(index)
+                if position is not None:
+                    positions.add(position)
+        return positions
+
+    # Answering
+
+    def select(self, option_index: int, is_checked: bool) -> Optional[Tuple[str, bool]]:
+        """Toggle an option for the current question.
+
+        Returns:
+            Optional[Tuple[str, bool]]: Selection text and whether the question is multi-choice,
+            or None when there's nothing to report (a single-choice option being unchecked)
+        """
+        option_key = chr(ord('A') + option_index)
+        question = self.get_current_question()
+        is_multi = bool(question) and question.get('type', 'singleChoice') == "multiChoice"
+
+        if is_multi:
+            if is_checked:
+                if option_key not in self.selected_options:
+                    self.selected_options.append(option_key)
+            elif option_key in self.selected_options:
+                self.selected_options.remove(option_key)
+
+            if self.selected_options:
+                return f"Selected: Options {', '.join(sorted(self.selected_options))}", True
+            return "No options selected", True
+
+        self.selected_options = [option_key] if is_checked else []
+        if is_checked:
+            return f"Selected: Option {option_key}", False
+        return None
+
+    def validate(self, selected: Optional[List[str]] = None) -> Optional[Dict]:
+        """Grade the selected options for the current question and record the outcome.
+
+        Args:
+            selected: Option keys to grade (defaults to the current selection)
+
+        Returns:
+            Optional[Dict]: 'is_correct', 'feedback', 'style_class' and 'revealed' (whether feedback
+            should be shown now), or None if nothing was selected
+        """
+        if selected is not None:
+            self.selected_options = list(selected)
+        if not self.selected_options:
+            return None
+
+        question = self.get_current_question()
+        if not question:
+            return None
+
+        key = self.answer_keys[self.exam_data['questions'].bank_index(self.current_index)]
+        is_correct = key.grade(self.selected_options)
+
+        if is_correct:
+            if key.multi:
+                feedback = f"✓ Correct! Your answers {', '.join(self.selected_options)} were right."
+            else:
+                feedback = f"✓ Correct! Your answer {self.selected_options[0]} was right."
+            style_class = "correct"
+        else:
+            if key.multi:
+                selected_text = ", ".join(self.selected_options)
+                feedback = (f"✗ Incorrect. You selected {selected_text}, but the correct answers are {key.correct_keys_text}.\n\n"
+                           f"Correct Answers:\n{key.correct_options_text}")
+            else:
+                feedback = (f"✗ Incorrect. You selected {', '.join(self.selected_options)}, but the correct answer is {key.correct_keys_text}.\n\n"
+                           f"Correct Answer: {key.correct_options_text}")
+            style_class = "incorrect"
+
+        position = self.current_index
+        selected = list(self.selected_options)
+        self._record_answer(position, question, selected, is_correct)
+
+        # With show_answer_at_end the question still counts as revealed so navigation
+        # works, but no feedback is shown until the end
+        self.answer_revealed = True
+
+        return {
+            'is_correct': is_correct,
+            'feedback': feedback,
+            'style_class': style_class,
+            'revealed': not self.show_answer_at_end
+        }
+
+    def _record_answer(self, position: int, question: Dict, selected: List[str], is_correct: bool):
+        """Update score, wrong answers and answered positions, then notify answer listeners."""
+        bank_index = self._quiz_view.bank_index(position)
+        if is_correct:
+            self.score += 1
+        else:
+            self._wrong_answers.append(self._wrong_answer_entry(question, selected, self.answer_keys[bank_index]))
+            self._notify('wrong_answers')
+
+        # Mark question as answered
+        self._answered_questions.add(position)
+        self._notify('answered_questions')
+
+        if self.answer_listeners:
+            record = {
+                'qid': question.get('id'),
+                'idx': bank_index,
+                'pos': position,
+                'sel': selected,
+                'ok': is_correct,
+                'secs': round(time.monotonic() - self._answer_clock, 3),
+                'ts': time.time()
+            }
+            for answer_listener in self.answer_listeners:
+                answer_listener(record)
+
+    @staticmethod
+    def _wrong_answer_entry(question: Dict, selected: List[str], key: Optional[AnswerKey] = None) -> Dict:
+        """Build the wrong_answers entry for a question answered with the selected option keys."""
+        key = key or AnswerKey(question)
+        your_answer_value = key.selected_text(selected)
+        correct_answer_value = key.correct_text
+        return {
+            'question_id': question.get('id'),
+            'question': question['question'],
+            'your_answer': your_answer_value,
+            'correct_answer': correct_answer_value
+        }
+
+    def replay(self, records: List[Dict]):
+        """Re-apply journaled answer records on top of the restored session state."""
+        view = self._quiz_view
+        last_position = None
+        for record in records:
+            position = record.get('pos')
+            if position is None or not 0 <= position < len(view) or view.bank_index(position) != record.get('idx'):
+                # Fall back to the bank index if the view doesn't line up
+                position = view.position_of(record.get('idx'))
+                if position is None:
+                    continue
+            if position in self._answered_questions:
+                # Already answered in the snapshot or earlier in the tail
+                continue
+            question = view[position]
+            if not record.get('ok'):
+                key = self.answer_keys[view.bank_index(position)]
+                self._wrong_answers.append(self._wrong_answer_entry(question, record.get('sel') or [], key))
+            else:
+                self._score += 1
+            self._answered_questions.add(position)
+            last_position = position
+
+        if last_position is not None:
+            # Continue after the last answer, as if Next had been pressed
+            self._current_index = min(last_position + 1, len(view) - 1)
+
+    def progress_snapshot(self) -> Dict:
+        """Progress fields for the session file's 'quiz_mode' section."""
+        order = self._quiz_view.order
+        identity = isinstance(order, range) and order == range(len(self.bank))
+        return {
+            'score': self.score,
+            'total_answered': len(self.answered_questions),
+            'wrong_answers': list(self.wrong_answers),
+            'answered_questions': sorted(self.answered_questions),
+            'current_index': self.current_index,
+            'question_order': IDENTITY_ORDER if identity else list(order)
+        }
+
+    def reset_question_state(self):
+        """Reset state for a new question."""
+        self.selected_options = []
+        self.answer_revealed = False
+        self._answer_clock = time.monotonic()
+
+    # Navigation
+
+    def next(self) -> Optional[str]:
+        """Move to the next question.
+
+        Returns:
+            Optional[str]: MOVED, COMPLETE when the last question has been answered,
+            or None if the move isn't allowed yet
+        """
+        if self.review_mode:
+            if self.current_index + 1 >= len(self.review_questions):
+                return None
+            self.current_index += 1
+            return MOVED
+
+        # In practice mode, allow free navigation without validation
+        if self.practice_mode:
+            if self.current_index + 1 >= self.get_total_questions():
+                # Reached end - don't complete quiz in practice mode
+                return None
+            self.current_index += 1
+            self.reset_question_state()
+            return MOVED
+
+        # Normal mode: the answer must have been selected and revealed first
+        if not self.answer_revealed or not self.selected_options:
+            return None
+
+        if self.current_index + 1 >= self.get_total_questions():
+            return COMPLETE
+
+        self.current_index += 1
+        self.reset_question_state()
+        return MOVED
+
+    def prev(self) -> bool:
+        """Move to the previous question. Returns True if moved."""
+        if self.current_index <= 0:
+            return False
+        self.current_index -= 1
+        self.reset_question_state()
+        return True
+
+    def jump(self, index: int) -> bool:
+        """Jump to a specific question (practice mode only). Returns True if moved."""
+        if not self.practice_mode:
+            return False
+        if 0 <= index < self.get_total_questions():
+            self.current_index = index
+            self.reset_question_state()
+            return True
+        return False
+
+    # Results and review
+
+    def results(self) -> Dict:
+        """Score the quiz so far."""
+        total_questions = len(self.exam_data['questions'])
+        answered_questions = len(self.answered_questions)
+        accuracy = (self.score / answered_questions * 100) if answered_questions > 0 else 0
+        completion_rate = (answered_questions / total_questions * 100) if total_questions > 0 else 0
+
+        return {
+            'score': self.score,
+            'total_answered': answered_questions,
+            'total_questions': total_questions,
+            'accuracy': accuracy,
+            'completion_rate': completion_rate,
+            'wrong_answers_count': len(self.wrong_answers),
+            'wrong_answers': self.wrong_answers
+        }
+
+    def complete(self) -> Optional[Dict]:
+        """Finish the quiz, revealing all answers first if show_answer_at_end is set.
+
+        Returns:
+            Optional[Dict]: The results, or None in practice mode where quizzes don't complete
+        """
+        if self.practice_mode:
+            return None
+        if self.show_answer_at_end:
+            self.reveal_all()
+        return self.results()
+
+    def reveal_all(self):
+        """Enter review mode over every answered question, with the user's answer attached."""
+        questions = self.exam_data['questions']
+        order = []
+        annotations = {}
+
+        # Index wrong answers once by id and by text, keeping their position in the list
+        wrong_by_id = {}
+        wrong_by_text = {}
+        for position, wrong in enumerate(self.wrong_answers):
+            wrong_by_id.setdefault(wrong.get('question_id'), (position, wrong))
+            wrong_by_text.setdefault(wrong.get('question'), (position, wrong))
+
+        for i in range(len(questions)):
+            if i not in self.answered_questions:
+                continue
+
+            question = questions[i]
+            correct = question['answer']
+
+            # Earliest matching wrong answer wins; otherwise the user picked the correct answer
+            candidates = [c for c in (wrong_by_id.get(question.get('id')), wrong_by_text.get(question['question'])) if c]
+            wrong_answer_info = min(candidates, key=lambda c: c[0])[1] if candidates else None
+            if wrong_answer_info is not None:
+                your_answer = wrong_answer_info.get('your_answer', 'Not answered')
+                correct_answer_text = wrong_answer_info.get('correct_answer', '')
+                is_correct = False
+            else:
+                if question.get('type', 'singleChoice') == "multiChoice":
+                    correct_list = correct if isinstance(correct, list) else [correct]
+                    correct_answer_text = "; ".join([question['options'].get(opt, opt) for opt in correct_list])
+                else:
+                    correct_answer_text = question['options'].get(correct, correct)
+                your_answer = correct_answer_text
+                is_correct = True
+
+            # Store answer info for review in the view's side table
+            annotations[len(order)] = {
+                'answer_info': {
+                    'your_answer': your_answer,
+                    'correct_answer': correct_answer_text,
+                    'is_correct': is_correct
+                }
+            }
+            order.append(questions.bank_index(i))
+
+        self._enter_review(self.bank.view(order, annotations), "All Answers")
+
+    def enter_review(self) -> bool:
+        """Enter review mode for incorrect answers. Returns True if entered successfully."""
+        if not self.wrong_answers:
+            return False
+
+        # Map wrong answers back to bank indices; the answer info lives in the view's side table
+        order = []
+        annotations = {}
+        for wrong_answer in self.wrong_answers:
+            question_id = wrong_answer.get('question_id')
+            if question_id is not None:
+                index = self.find_question_index(question_id)
+            else:
+                # Fallback: find by question text
+                index = self.find_question_index(question_text=wrong_answer['question'])
+            if index is not None:
+                annotations[len(order)] = {'wrong_answer_info': wrong_answer}
+                order.append(index)
+
+        if not order:
+            return False
+
+        self._enter_review(self.bank.view(order, annotations), "Review Mode")
+        return True
+
+    def _enter_review(self, review_questions: QuestionView, label: str):
+        self.review_questions = review_questions
+        self.review_mode = True
+        self.current_index = 0
+        self.exam_data = {
+            'title': f"{self.original_exam_data['title']} - {label}",
+            'questions': review_questions
+        }
+
+    def study_wrong(self) -> bool:
+        """Restart the quiz over the questions in the review list. Returns True if successful."""
+        if not self.review_questions:
+            return False
+
+        incorrect_ids = {q.get('wrong_answer_info', {}).get('question_id') for q in self.review_questions}
+        incorrect_ids.discard(None)
+
+        # Filter questions by ID, keeping exam order
+        order = sorted(index for index in (self.find_question_index(qid) for qid in incorrect_ids)
+                       if index is not None)
+
+        # Fallback if no IDs
+        if not order:
+            for review_q in self.review_questions:
+                index = self.find_question_index(question_text=review_q.get('question', ''))
+                if index is not None:
+                    order.append(index)
+
+        return self.study(order, "Study Wrong Answers")
+
+    def study(self, order: Sequence[int], label: str) -> bool:
+        """Restart the quiz over the given bank indices. Returns True if there's anything to study."""
+        if not order:
+            return False
+        self._quiz_view = self.bank.view(order)
+        self.exam_data = {
+            'title': f"{self.original_exam_data['title']} - {label}",
+            'questions': self._quiz_view
+        }
+        self.review_mode = False
+        self.current_index = 0
+        self.score = 0
+        self.answered_questions = set()
+        self.wrong_answers = []
+        self.reset_question_state()
+        return True
+
+    def status_text(self) -> str:
+        """Status bar text for the current mode."""
+        if self.review_mode:
+            return f"Review Mode: {self.current_index + 1}/{len(self.review_questions)}"
+        if self.answered_questions:
+            return f"Score: {self.score}/{len(self.answered_questions)}"
+        return "Not started"
+
+    def reset(self):
+        """Reset the quiz state to initial values."""
+        self._current_index = 0
+        self._score = 0
+        self._wrong_answers = []
+        self._answered_questions = set()
+        self._answer_revealed = False
+        self.selected_options = []
+        self._is_paused = False
+        self._review_mode = False
+        self.review_questions = []
+        self._elapsed_time = timedelta(0)
+        self.start_time = None
@@ -1,11 +1,19 @@
 import json
-from PyQt6.QtWidgets import QMessageBox
-import sys
+import os
 
-def load_exam_data(filename=None):
+# Exams at least this large are opened lazily instead of being parsed up front
+LAZY_LOAD_THRESHOLD = 8 * 1024 * 1024
+
+def load_exam_data(filename=None, lazy=None):
     """
     Load exam data from a JSON file.
-    If filename is None, loads the default aws_mock_exam.json from exams folder
+    If filename is None, loads the default aws_mock_exam.json from exams folder.
+    Compiled exam packs are detected by their magic bytes and opened memory-mapped.
+    If lazy is None, JSON files of LAZY_LOAD_THRESHOLD bytes or more are opened lazily.
+    In both cases 'questions' is a read-only sequence that decodes questions on demand.
+    
+    Raises:
+        ValueError: If the file can't be read or isn't a valid exam
     """
     if filename is None:
         filename = "exams/aws_mock_exam.json"
@@ -15,8 +23,15 @@ def load_exam_data(filename=None):
         filename = f"exams/{filename}"
     
     try:
+        from src.utils.exam_pack import is_exam_pack, open_packed_exam
+        if is_exam_pack(filename):
+            return open_packed_exam(filename)
+        if lazy is None:
+            lazy = os.path.getsize(filename) >= LAZY_LOAD_THRESHOLD
+        if lazy:
+            from src.utils.lazy_exam import open_lazy_exam
+            return open_lazy_exam(filename)
         with open(filename, "r") as f:
             return json.load(f)
     except Exception as e:
-        QMessageBox.critical(None, "Error", f"Failed to load exam data from {filename}: {str(e)}")
-        sys.exit(1) 
\ No newline at end of file
+        raise ValueError(f"Failed to load exam data from {filename}: {str(e)}") from e
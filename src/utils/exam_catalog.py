@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from src.utils.exam_pack import PACK_EXTENSION, PackedExam
+from src.utils.paths import DATA_DIR, EXAMS_DIR, PROJECT_ROOT
+
+CATALOG_VERSION = 1
+DEFAULT_CATALOG_PATH = os.path.join(DATA_DIR, 'exam_catalog.json')
+
+
+def exam_key(exam_ref: Optional[Dict], title: str) -> str:
+    """Stable key for per-exam history: the content hash, or the title for exams without a reference."""
+    content_hash = (exam_ref or {}).get('content_hash')
+    return content_hash if content_hash else f"title:{title}"
+
+
+class ExamCatalog:
+    """Persistent index of exam metadata so the exam list can be shown without parsing every exam.
+
+    Each entry is keyed by filename and stores the title, question count, type mix,
+    size, mtime and content hash of the exam. Entries are revalidated by size and
+    mtime, so only files that changed since the last refresh are re-parsed.
+    'generation' goes up whenever a refresh changes the entries.
+    """
+
+    def __init__(self, exams_dir: str = EXAMS_DIR, catalog_path: str = DEFAULT_CATALOG_PATH):
+        self.exams_dir = exams_dir
+        self.catalog_path = catalog_path
+        self.entries: Dict[str, Dict] = {}
+        self.generation = 0
+        self._by_hash: Dict[str, str] = {}
+        self._by_title: Dict[str, str] = {}
+        # The home dialog lists exams from a loader thread
+        self._lock = threading.RLock()
+        self._load()
+        self._rebuild_lookups()
+
+    def _load(self):
+        """Load the persisted catalog, ignoring it if missing, unreadable or from another version."""
+        try:
+            with open(self.catalog_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        if data.get('version') != CATALOG_VERSION or data.get('exams_dir') != self.exams_dir:
+            return
+        self.entries = data.get('entries', {})
+
+    def save(self):
+        """Write the catalog to disk, replacing the previous file atomically."""
+        os.makedirs(os.path.dirname(self.catalog_path), exist_ok=True)
+        data = {
+            'version': CATALOG_VERSION,
+            'exams_dir': self.exams_dir,
+            'entries': self.entries
+        }
+        tmp_path = f"{self.catalog_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.catalog_path)
+
+    def refresh(self) -> List[Dict]:
+        """Revalidate the catalog against the exams directory.
+
+        Returns:
+            List[Dict]: Valid exam entries, sorted by filename
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> List[Dict]:
+        seen = set()
+        changed = False
+
+        with os.scandir(self.exams_dir) as it:
+            for dir_entry in it:
+                if not dir_entry.name.endswith(('.json', PACK_EXTENSION)) or not dir_entry.is_file():
+                    continue
+                seen.add(dir_entry.name)
+                stat = dir_entry.stat()
+                cached = self.entries.get(dir_entry.name)
+                if cached and cached['size'] == stat.st_size and cached['mtime'] == stat.st_mtime_ns:
+                    continue
+
+                self.entries[dir_entry.name] = self._build_entry(dir_entry.path, stat)
+                changed = True
+
+        for filename in list(self.entries):
+            if filename not in seen:
+                del self.entries[filename]
+                changed = True
+
+        if changed:
+            self.generation += 1
+            self._rebuild_lookups()
+            try:
+                self.save()
+            except OSError as e:
+                print(f"Error saving exam catalog: {e}")
+
+        return self.list_exams()
+
+    def _rebuild_lookups(self):
+        """Rebuild the hash and title lookup tables. The first filename wins on duplicates."""
+        self._by_hash = {}
+        self._by_title = {}
+        for filename in sorted(self.entries):
+            entry = self.entries[filename]
+            if not entry.get('valid'):
+                continue
+            self._by_hash.setdefault(entry['content_hash'], filename)
+            self._by_title.setdefault(entry['title'], filename)
+
+    def _is_current(self, filename: str) -> bool:
+        """Check a single cached entry against the file on disk."""
+        entry = self.entries.get(filename)
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(os.path.join(self.exams_dir, filename))
+        except OSError:
+            return False
+        return entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns
+
+    def ref_for_path(self, filepath: str) -> Dict:
+        """Build a stable exam reference (project-relative path plus content hash) for an exam file."""
+        abs_path = os.path.abspath(filepath)
+        try:
+            rel_path = os.path.relpath(abs_path, PROJECT_ROOT)
+        except ValueError:
+            rel_path = abs_path
+
+        content_hash = None
+        filename = os.path.basename(abs_path)
+        if os.path.dirname(abs_path) == os.path.abspath(self.exams_dir):
+            if not self._is_current(filename):
+                self.refresh()
+            entry = self.entries.get(filename)
+            if entry and entry.get('valid'):
+                content_hash = entry['content_hash']
+        if content_hash is None:
+            try:
+                with open(abs_path, 'rb') as f:
+                    content_hash = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                pass
+
+        return {'path': rel_path, 'content_hash': content_hash}
+
+    def _lookup(self, exam_ref: Optional[Dict], title: Optional[str]) -> Optional[str]:
+        """Resolve against cached entries only: exact path+hash, then hash, then path, then title."""
+        if exam_ref:
+            content_hash = exam_ref.get('content_hash')
+            path = exam_ref.get('path')
+            if path:
+                abs_path = os.path.join(PROJECT_ROOT, path)
+                filename = os.path.basename(abs_path)
+                entry = self.entries.get(filename)
+                if (os.path.dirname(abs_path) == os.path.abspath(self.exams_dir) and entry
+                        and entry.get('valid') and entry['content_hash'] == content_hash):
+                    return filename
+            if content_hash and content_hash in self._by_hash:
+                return self._by_hash[content_hash]
+            if path:
+                filename = os.path.basename(path)
+                if self.entries.get(filename, {}).get('valid'):
+                    return filename
+        if title and title in self._by_title:
+            return self._by_title[title]
+        return None
+
+    def resolve(self, exam_ref: Optional[Dict] = None, title: Optional[str] = None) -> Optional[str]:
+        """Find the exam file for a stored exam reference, falling back to the title for older sessions.
+
+        The cached lookup is tried first and the match is checked with a single stat;
+        the directory is only rescanned when the cached answer is missing or stale.
+
+        Returns:
+            Optional[str]: Path to the exam file, or None if it can't be found
+        """
+        with self._lock:
+            filename = self._lookup(exam_ref, title)
+            if filename is None or not self._is_current(filename):
+                self.refresh()
+                filename = self._lookup(exam_ref, title)
+        if filename is None:
+            return None
+        return os.path.join(self.exams_dir, filename)
+
+    def _build_entry(self, filepath: str, stat: os.stat_result) -> Dict:
+        """Parse an exam file and build its catalog entry.
+
+        A file that can't be read gets an invalid entry, so it replaces any entry from
+        before it broke and isn't re-parsed until it changes again.
+        """
+        filename = os.path.basename(filepath)
+        try:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            if filename.endswith(PACK_EXTENSION):
+                pack = PackedExam(filepath)
+                try:
+                    title = pack.title
+                    question_types = [pack.question_type(i) for i in range(len(pack))]
+                finally:
+                    pack.close()
+            else:
+                data = json.loads(raw)
+                if not (isinstance(data, dict) and 'title' in data and 'questions' in data):
+                    title, question_types = None, None
+                else:
+                    title = data['title']
+                    question_types = [q.get('type', 'singleChoice') for q in data['questions']]
+        except Exception as e:
+            print(f"Error loading {filename}: {e}")
+            return {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'valid': False}
+
+        entry = {
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'content_hash': hashlib.sha256(raw).hexdigest(),
+            'valid': title is not None
+        }
+        if entry['valid']:
+            type_counts: Dict[str, int] = {}
+            for question_type in question_types:
+                type_counts[question_type] = type_counts.get(question_type, 0) + 1
+            entry['title'] = title
+            entry['question_count'] = len(question_types)
+            entry['type_counts'] = type_counts
+        return entry
+
+    def list_exams(self) -> List[Dict]:
+        """Return valid exam entries with 'filename' and 'filepath' filled in."""
+        exams = []
+        for filename in sorted(self.entries):
+            entry = self.entries[filename]
+            if not entry.get('valid'):
+                continue
+            exam = dict(entry)
+            exam['filename'] = filename
+            exam['filepath'] = os.path.join(self.exams_dir, filename)
+            exams.append(exam)
+        return exams
+
+
+_shared_catalog: Optional[ExamCatalog] = None
+_shared_catalog_lock = threading.Lock()
+
+
+def get_exam_catalog() -> ExamCatalog:
+    """Return the catalog shared by the home dialog and session resume."""
+    global _shared_catalog
+    with _shared_catalog_lock:
+        if _shared_catalog is None:
+            _shared_catalog = ExamCatalog()
+    return _shared_catalog
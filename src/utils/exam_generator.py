@@ -0,0 +1,234 @@
+"""
+Generate synthetic exams for scale testing.
+
+Exams are written as exam JSON (question_schema.json), as markdown that
+md_to_json.py converts, or as HTML in the quiz-page layout html_to_json.py
+converts. Questions are generated one at a time and written as they are made,
+so a million-question exam takes no more memory than a ten-question one.
+
+Every question's content is a pure function of the seed and its content number,
+so the same arguments always produce the same exam, and duplicates (the same
+question repeated under a new id, as happens in merged question banks) don't
+need earlier questions to be kept around.
+"""
+import json
+import os
+import random
+from html import escape
+from typing import Dict, Iterator, Optional, TextIO
+
+# The schema allows options A-E
+MIN_OPTIONS = 2
+MAX_OPTIONS = 5
+
+FORMATS = ('json', 'md', 'html')
+
+_WORDS = (
+    "account", "alarm", "application", "archive", "availability", "backup", "balancer", "bandwidth",
+    "billing", "bucket", "budget", "cache", "capacity", "certificate", "cluster", "compliance",
+    "compute", "configuration", "container", "cost", "customer", "dashboard", "database", "deployment",
+    "durability", "edge", "encryption", "endpoint", "event", "failover", "firewall", "function",
+    "gateway", "group", "identity", "incident", "instance", "interface", "key", "latency", "log",
+    "migration", "monitoring", "network", "notification", "object", "organization", "partition",
+    "password", "permission", "pipeline", "policy", "queue", "region", "replica", "request",
+    "reservation", "resource", "role", "route", "rule", "scaling", "schedule", "secret", "security",
+    "server", "service", "session", "snapshot", "storage", "stream", "subnet", "support", "table",
+    "template", "throughput", "token", "traffic", "user", "volume", "workload", "zone"
+)
+_VERBS = (
+    "provides", "reduces", "protects", "stores", "monitors", "replicates", "encrypts", "routes",
+    "scales", "schedules", "audits", "isolates", "caches", "restores", "manages", "notifies"
+)
+_OPENERS = (
+    "Which of the following", "What is the most cost-effective way a company", "Which service",
+    "What should a developer use when a team", "Which feature", "How can an administrator ensure a"
+)
+
+_MASK64 = (1 << 64) - 1
+
+
+def _content_seed(seed: int, content: int) -> int:
+    """Seed for one question's content: a 64-bit hash of the exam seed and content number."""
+    value = (seed * 0x9E3779B97F4A7C15 + content + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def _sentence(rng: random.Random, mean: int) -> str:
+    """Random words, up to half the mean shorter or longer than it."""
+    spread = max(1, mean // 2)
+    return " ".join(rng.choices(_WORDS, k=max(1, mean + rng.randint(-spread, spread))))
+
+
+def make_question(question_id: int, content: int, seed: int = 0, multi_ratio: float = 0.2,
+                  options: int = 4, option_words: int = 6, question_words: int = 14) -> Dict:
+    """One question in the question_schema.json shape.
+
+    Args:
+        question_id: The question's id
+        content: Content number; questions with the same content number are duplicates
+        seed: Exam seed
+        multi_ratio: Share of multi-choice ("Choose TWO") questions
+        options: Options per question, 2 to 5
+        option_words: Mean words per option
+        question_words: Mean words per question
+
+    Returns:
+        Dict: The question
+    """
+    rng = random.Random(_content_seed(seed, content))
+    keys = [chr(ord('A') + i) for i in range(options)]
+    is_multi = options > 2 and rng.random() < multi_ratio
+
+    text = f"{rng.choice(_OPENERS)} {rng.choice(_VERBS)} the {_sentence(rng, question_words)}?"
+    if is_multi:
+        text += " (Choose TWO)"
+
+    option_texts = {}
+    for key in keys:
+        option = _sentence(rng, option_words)
+        option_texts[key] = option[:1].upper() + option[1:] + "."
+
+    answer = sorted(rng.sample(keys, 2)) if is_multi else rng.choice(keys)
+
+    return {
+        'id': question_id,
+        'question': text,
+        'options': option_texts,
+        'type': "multiChoice" if is_multi else "singleChoice",
+        'answer': answer
+    }
+
+
+def generate_questions(count: int, seed: int = 0, multi_ratio: float = 0.2, options: int = 4,
+                       option_words: int = 6, question_words: int = 14,
+                       duplicate_rate: float = 0.0) -> Iterator[Dict]:
+    """Yield `count` questions with ids 1..count.
+
+    With a duplicate_rate above 0, that share of questions repeats the content of
+    an earlier question under its own id.
+    """
+    if not MIN_OPTIONS <= options <= MAX_OPTIONS:
+        raise ValueError(f"Questions need {MIN_OPTIONS} to {MAX_OPTIONS} options")
+    rng = random.Random(seed)
+    for index in range(count):
+        content = index
+        if index and duplicate_rate > 0 and rng.random() < duplicate_rate:
+            content = rng.randrange(index)
+        yield make_question(index + 1, content, seed, multi_ratio, options, option_words, question_words)
+
+
+def generate_exam_data(count: int, title: Optional[str] = None, **kwargs) -> Dict:
+    """An in-memory exam dict; takes the same keyword arguments as generate_questions."""
+    return {
+        'title': title or f"Synthetic Exam ({count} questions)",
+        'questions': list(generate_questions(count, **kwargs))
+    }
+
+
+def write_json(f: TextIO, title: str, questions: Iterator[Dict]):
+    """Write an exam JSON file, one question per line."""
+    f.write('{\n  "title": ' + json.dumps(title, ensure_ascii=False) + ',\n  "questions": [')
+    separator = "\n    "
+    for question in questions:
+        f.write(separator + json.dumps(question, ensure_ascii=False))
+        separator = ",\n    "
+    f.write("\n  ]\n}\n")
+
+
+def write_markdown(f: TextIO, title: str, questions: Iterator[Dict]):
+    """Write an exam in the markdown layout md_to_json.py reads."""
+    f.write(f"# {title}\n\n")
+    for question in questions:
+        f.write(f"{question['id']}. {question['question']}\n")
+        for key, text in question['options'].items():
+            f.write(f"    - {key}. {text}\n")
+        answer = question['answer']
+        f.write(f"\n    Correct answer: {', '.join(answer) if isinstance(answer, list) else answer}\n\n")
+
+
+def write_html(f: TextIO, title: str, questions: Iterator[Dict]):
+    """Write an exam as a quiz statistics page in the layout html_to_json.py reads."""
+    f.write(f"<!DOCTYPE html>\n<html>\n<head><meta charset=\"utf-8\"><title>{escape(title)}</title></head>\n"
+            "<body>\n<table>\n")
+    for question in questions:
+        input_type = "checkbox" if question['type'] == "multiChoice" else "radio"
+        answer = question['answer']
+        correct = set(answer) if isinstance(answer, list) else {answer}
+        f.write(f"<tr><th>{question['id']}</th><th><p>{escape(question['question'])}</p></th>"
+                "<th>1</th><th>0</th><th>0</th></tr>\n"
+                "<tr><td colspan=\"5\"><ul class=\"wpProQuiz_questionList\">")
+        for key, text in question['options'].items():
+            css_class = "wpProQuiz_questionListItem"
+            if key in correct:
+                css_class += " wpProQuiz_answerCorrect"
+            f.write(f"<li class=\"{css_class}\"><label><input type=\"{input_type}\">{escape(text)}</label></li>")
+        f.write("</ul></td></tr>\n")
+    f.write("</table>\n</body>\n</html>\n")
+
+
+_WRITERS = {'json': write_json, 'md': write_markdown, 'html': write_html}
+
+
+def format_for_path(path: str) -> str:
+    """Output format from a file extension."""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    fmt = {'markdown': 'md', 'htm': 'html'}.get(extension, extension)
+    if fmt not in FORMATS:
+        raise ValueError(f"Can't tell the format of '{path}'; use one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def generate_exam(output_path: str, count: int, title: Optional[str] = None, fmt: Optional[str] = None,
+                  **kwargs) -> str:
+    """Generate an exam file.
+
+    Args:
+        output_path: File to write
+        count: Number of questions
+        title: Exam title (defaults to "Synthetic Exam (<count> questions)")
+        fmt: 'json', 'md' or 'html' (defaults to the output file's extension)
+        **kwargs: Passed to generate_questions
+
+    Returns:
+        str: The format written
+    """
+    fmt = fmt or format_for_path(output_path)
+    writer = _WRITERS[fmt]
+    title = title or f"Synthetic Exam ({count} questions)"
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        writer(f, title, generate_questions(count, **kwargs))
+    os.replace(tmp_path, output_path)
+    return fmt
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Generate a synthetic exam for scale testing")
+    parser.add_argument("output", help="Output file (.json, .md or .html)")
+    parser.add_argument("--questions", type=int, default=1000, help="Number of questions")
+    parser.add_argument("--title", help="Exam title")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: from the extension)")
+    parser.add_argument("--multi-ratio", type=float, default=0.2, help="Share of multi-choice questions")
+    parser.add_argument("--options", type=int, default=4, help="Options per question (2-5)")
+    parser.add_argument("--option-words", type=int, default=6, help="Mean words per option")
+    parser.add_argument("--question-words", type=int, default=14, help="Mean words per question")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="Share of repeated questions")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    fmt = generate_exam(args.output, args.questions, args.title, args.format, seed=args.seed,
+                        multi_ratio=args.multi_ratio, options=args.options, option_words=args.option_words,
+                        question_words=args.question_words, duplicate_rate=args.duplicate_rate)
+    print(f"Wrote {args.questions} questions ({fmt}) to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import json
+import mmap
+import os
+import struct
+from typing import Dict, List
+
+from src.utils.lazy_exam import DEFAULT_CACHE_SIZE, QuestionSource
+
+PACK_MAGIC = b'QPAK'
+PACK_VERSION = 1
+PACK_EXTENSION = '.qpack'
+
+# magic, version, reserved, question count, string count, title string id,
+# question table offset, option table offset, answer table offset,
+# string offset table offset, string data offset
+HEADER = struct.Struct('<4sHHIII6xQQQQQ')
+
+# id, question text, type, extra fields (JSON), first option, first answer,
+# option count, answer count, flags
+QUESTION_RECORD = struct.Struct('<qIIIIIHHB3x')
+OPTION_RECORD = struct.Struct('<II')  # key string id, text string id
+ANSWER_RECORD = struct.Struct('<I')  # key string id
+STRING_OFFSET = struct.Struct('<Q')
+
+NO_STRING = 0xFFFFFFFF
+
+FLAG_HAS_ID = 1
+FLAG_HAS_TYPE = 2
+FLAG_ANSWER_IS_LIST = 4
+FLAG_HAS_ANSWER = 8
+
+_KNOWN_FIELDS = ('id', 'question', 'options', 'type', 'answer')
+
+
+def is_exam_pack(filepath: str) -> bool:
+    """Check whether a file starts with the exam pack magic bytes."""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(PACK_MAGIC)) == PACK_MAGIC
+    except OSError:
+        return False
+
+
+class _StringTable:
+    """Interns strings so repeated option texts, keys and types are stored once."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.strings: List[bytes] = []
+
+    def intern(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.ids[value] = string_id
+            self.strings.append(value.encode('utf-8'))
+        return string_id
+
+
+def write_exam_pack(exam_data: Dict, output_path: str) -> None:
+    """Compile exam data (question_schema.json shape) into a binary exam pack."""
+    strings = _StringTable()
+    question_records = []
+    option_records = []
+    answer_records = []
+
+    title_id = strings.intern(exam_data.get('title', 'Untitled Exam'))
+    for q in exam_data['questions']:
+        flags = 0
+        if 'id' in q:
+            flags |= FLAG_HAS_ID
+        if 'type' in q:
+            flags |= FLAG_HAS_TYPE
+
+        answer = q.get('answer')
+        if answer is not None:
+            flags |= FLAG_HAS_ANSWER
+        if isinstance(answer, list):
+            flags |= FLAG_ANSWER_IS_LIST
+            answer_keys = answer
+        else:
+            answer_keys = [answer] if answer is not None else []
+
+        extra = {k: v for k, v in q.items() if k not in _KNOWN_FIELDS}
+        options = q.get('options', {})
+        question_records.append(QUESTION_RECORD.pack(
+            int(q.get('id', 0)),
+            strings.intern(q.get('question', '')),
+            strings.intern(q.get('type', 'singleChoice')),
+            strings.intern(json.dumps(extra, ensure_ascii=False)) if extra else NO_STRING,
+            len(option_records),
+            len(answer_records),
+            len(options),
+            len(answer_keys),
+            flags
+        ))
+        for key, text in options.items():
+            option_records.append(OPTION_RECORD.pack(strings.intern(key), strings.intern(text)))
+        for key in answer_keys:
+            answer_records.append(ANSWER_RECORD.pack(strings.intern(str(key))))
+
+    question_table = HEADER.size
+    option_table = question_table + QUESTION_RECORD.size * len(question_records)
+    answer_table = option_table + OPTION_RECORD.size * len(option_records)
+    string_offsets = answer_table + ANSWER_RECORD.size * len(answer_records)
+    string_data = string_offsets + STRING_OFFSET.size * (len(strings.strings) + 1)
+
+    dirname = os.path.dirname(output_path)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, len(question_records), len(strings.strings),
+                            title_id, question_table, option_table, answer_table,
+                            string_offsets, string_data))
+        f.writelines(question_records)
+        f.writelines(option_records)
+        f.writelines(answer_records)
+        position = 0
+        for value in strings.strings:
+            f.write(STRING_OFFSET.pack(position))
+            position += len(value)
+        f.write(STRING_OFFSET.pack(position))
+        f.writelines(strings.strings)
+    os.replace(tmp_path, output_path)
+
+
+class PackedExam(QuestionSource):
+    """Read-only, memory-mapped view over a compiled exam pack.
+
+    Opening a pack only unpacks the fixed-width header; each question is decoded
+    from its fixed-size record and the interned string table when first requested.
+    """
+
+    def __init__(self, filepath: str, cache_size: int = DEFAULT_CACHE_SIZE):
+        super().__init__(cache_size)
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _, self._question_count, self._string_count, title_id,
+         self._question_table, self._option_table, self._answer_table,
+         self._string_offsets, self._string_data) = HEADER.unpack_from(self._mmap, 0)
+        if magic != PACK_MAGIC:
+            raise ValueError(f"{filepath} is not an exam pack")
+        if version != PACK_VERSION:
+            raise ValueError(f"Unsupported exam pack version {version} in {filepath}")
+        self.title = self._string(title_id)
+
+    def __len__(self) -> int:
+        return self._question_count
+
+    def _string(self, string_id: int) -> str:
+        start, end = struct.unpack_from('<QQ', self._mmap, self._string_offsets + STRING_OFFSET.size * string_id)
+        return self._mmap[self._string_data + start:self._string_data + end].decode('utf-8')
+
+    def question_type(self, index: int) -> str:
+        """Read only the type of a question, without decoding the rest of it."""
+        record = QUESTION_RECORD.unpack_from(self._mmap, self._question_table + QUESTION_RECORD.size * index)
+        return self._string(record[2])
+
+    def _load_question(self, index: int) -> Dict:
+        (question_id, text_id, type_id, extra_id, option_start, answer_start,
+         option_count, answer_count, flags) = QUESTION_RECORD.unpack_from(
+            self._mmap, self._question_table + QUESTION_RECORD.size * index)
+
+        question: Dict = {}
+        if flags & FLAG_HAS_ID:
+            question['id'] = question_id
+        question['question'] = self._string(text_id)
+
+        options = {}
+        for i in range(option_start, option_start + option_count):
+            key_id, option_text_id = OPTION_RECORD.unpack_from(self._mmap, self._option_table + OPTION_RECORD.size * i)
+            options[self._string(key_id)] = self._string(option_text_id)
+        question['options'] = options
+
+        if flags & FLAG_HAS_TYPE:
+            question['type'] = self._string(type_id)
+
+        if flags & FLAG_HAS_ANSWER:
+            answers = [self._string(ANSWER_RECORD.unpack_from(self._mmap, self._answer_table + ANSWER_RECORD.size * i)[0])
+                       for i in range(answer_start, answer_start + answer_count)]
+            question['answer'] = answers if flags & FLAG_ANSWER_IS_LIST else answers[0]
+
+        if extra_id != NO_STRING:
+            question.update(json.loads(self._string(extra_id)))
+        return question
+
+    def close(self):
+        """Release the memory map and file handle."""
+        self._mmap.close()
+        self._file.close()
+
+
+def open_packed_exam(filepath: str, cache_size: int = DEFAULT_CACHE_SIZE) -> Dict:
+    """Open a compiled exam pack. Returns exam data whose 'questions' is a PackedExam."""
+    questions = PackedExam(filepath, cache_size=cache_size)
+    return {'title': questions.title, 'questions': questions}
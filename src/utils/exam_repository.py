@@ -0,0 +1,131 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.exam_catalog import get_exam_catalog
+from src.utils.question_store import DEFAULT_DB_PATH, QuestionStore, build_match_query, read_exam_file
+
+
+# Catalog generation each question bank was last synced with. Loader threads open
+# their own repositories, so this is kept per (database, catalog) rather than per instance.
+_synced_generations: Dict[Tuple[str, int], int] = {}
+_sync_lock = threading.Lock()
+
+
+class ExamRepository(ABC):
+    """Interface the dialogs and viewmodels use to list, load and search exams."""
+
+    @abstractmethod
+    def list_exams(self, question_type: Optional[str] = None) -> List[Dict]:
+        """List exams, optionally only those containing questions of question_type.
+
+        Each entry has at least 'filename', 'filepath', 'title', 'question_count',
+        'type_counts' and 'content_hash'.
+        """
+
+    @abstractmethod
+    def search_questions(self, keyword: str, content_hash: Optional[str] = None, limit: int = 200) -> List[Dict]:
+        """Find questions whose text or options match keyword.
+
+        Returns:
+            List[Dict]: Matches with 'exam_title', 'content_hash', 'position' and 'question_id'
+        """
+
+    def close(self):
+        """Release anything the repository holds open."""
+
+
+class FileExamRepository(ExamRepository):
+    """Repository over the exams folder, using the exam catalog for listings."""
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or get_exam_catalog()
+
+    def list_exams(self, question_type: Optional[str] = None) -> List[Dict]:
+        exams = self.catalog.refresh()
+        if question_type is None:
+            return exams
+        return [exam for exam in exams if exam['type_counts'].get(question_type)]
+
+    def search_questions(self, keyword: str, content_hash: Optional[str] = None, limit: int = 200) -> List[Dict]:
+        """Find questions whose text or options match keyword.
+
+        This is a linear scan that reads and matches every exam file (or only the one
+        with content_hash) on each call. Create the SQLite store to search an index instead.
+        """
+        words = [w.strip('"*').lower() for w in (build_match_query(keyword) or "").split()]
+        if not words:
+            return []
+
+        matches = []
+        for exam in self.catalog.refresh():
+            if content_hash is not None and exam['content_hash'] != content_hash:
+                continue
+            for position, q in enumerate(read_exam_file(exam['filepath'])['questions']):
+                text = (q['question'] + "\n" + "\n".join(q.get('options', {}).values())).lower()
+                if all(word in text for word in words):
+                    matches.append({
+                        'exam_title': exam['title'],
+                        'content_hash': exam['content_hash'],
+                        'position': position,
+                        'question_id': q.get('id'),
+                        'question': q['question']
+                    })
+                    if len(matches) >= limit:
+                        return matches
+        return matches
+
+
+class SqliteExamRepository(ExamRepository):
+    """Repository backed by the SQLite question bank, kept in sync with the exams folder."""
+
+    def __init__(self, store: QuestionStore, catalog=None):
+        self.store = store
+        self.catalog = catalog or get_exam_catalog()
+
+    def _sync(self):
+        """Import exams added or changed since the last sync, once per change to the catalog."""
+        self.catalog.refresh()
+        key = (os.path.abspath(self.store.db_path), id(self.catalog))
+        with _sync_lock:
+            generation = self.catalog.generation
+            if _synced_generations.get(key) != generation:
+                self.store.sync_with_catalog(self.catalog)
+                _synced_generations[key] = generation
+
+    def list_exams(self, question_type: Optional[str] = None) -> List[Dict]:
+        self._sync()
+        return self.store.list_exams(question_type)
+
+    def search_questions(self, keyword: str, content_hash: Optional[str] = None, limit: int = 200) -> List[Dict]:
+        self._sync()
+        return self.store.search_questions(keyword, content_hash, limit)
+
+    def close(self):
+        self.store.close()
+
+
+_shared_repository: Optional[ExamRepository] = None
+
+
+def open_exam_repository() -> ExamRepository:
+    """Open a new repository: the SQLite store if one has been created, else the exams folder.
+
+    SQLite connections can't be shared between threads, so background loaders open
+    their own repository and close it when they are done.
+    """
+    if os.path.exists(DEFAULT_DB_PATH):
+        return SqliteExamRepository(QuestionStore(DEFAULT_DB_PATH))
+    return FileExamRepository()
+
+
+def get_exam_repository() -> ExamRepository:
+    """Return the shared repository for the GUI thread (see open_exam_repository).
+
+    The store is opt-in; create it with `python -m src.utils.question_store sync`.
+    """
+    global _shared_repository
+    if _shared_repository is None:
+        _shared_repository = open_exam_repository()
+    return _shared_repository
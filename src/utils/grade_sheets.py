@@ -0,0 +1,315 @@
+"""
+Grade answer sheets for a whole cohort without starting the app.
+
+Each candidate's results are written as one line of JSONL, in the same shape as
+the results files the app saves, and a cohort summary is written next to them.
+
+Response sheets are CSV or JSONL, one candidate per row:
+- CSV: the first column is the candidate id, every other column is a question,
+  headed by its question id or by Q<n>/<n> for the n-th question. Cells hold the
+  chosen option keys ("B", "A;C" or "AC"); empty cells are unanswered. A cell
+  with a key that isn't one of the question's options is answered and wrong.
+- JSONL: {"candidate": "...", "answers": {...}} where answers maps question
+  headers to keys (a string or a list), or is a list in question order.
+"""
+import csv
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.answer_key import AnswerKeys, grade_batch
+from src.utils.question_store import read_exam_file
+from src.utils.results_store import build_results_data
+
+# Candidates graded per batch (and per worker task)
+CHUNK_SIZE = 5000
+
+_KEY_SEPARATORS = re.compile(r"[;,|\s]+")
+
+_ENTRIES_PLACEHOLDER = "\x00incorrect_answers\x00"
+_ENTRIES_PLACEHOLDER_JSON = json.dumps(_ENTRIES_PLACEHOLDER)
+
+
+class SheetGrader:
+    """Grades rows of an answer sheet against one exam."""
+
+    def __init__(self, exam_path: str):
+        self.exam_path = exam_path
+        exam_data = read_exam_file(exam_path)
+        self.title = exam_data['title']
+        self.questions = list(exam_data['questions'])
+        self.keys = AnswerKeys(self.questions)
+        self.key_masks = self.keys.masks()
+        self._columns_by_header: Dict[str, int] = {}
+        for index in range(len(self.questions)):
+            self._columns_by_header[f"Q{index + 1}"] = index
+            self._columns_by_header[f"q{index + 1}"] = index
+            self._columns_by_header[str(index + 1)] = index
+        for index, question in enumerate(self.questions):
+            if question.get('id') is not None:
+                self._columns_by_header[str(question['id'])] = index  # ids win over positions
+        # Cell text -> mask, per question; answer sheets repeat the same few values
+        self._mask_cache: List[Dict[str, int]] = [{} for _ in self.questions]
+        self._entry_cache: Dict[Tuple[int, int], Tuple[Dict, str]] = {}
+
+    def question_for_header(self, header: str) -> int:
+        index = self._columns_by_header.get(header.strip())
+        if index is None:
+            raise ValueError(f"Column '{header}' doesn't match a question id or number")
+        return index
+
+    def parse_cell(self, index: int, cell) -> int:
+        """Bit mask for one answer cell (a key string or a list of keys).
+
+        Unknown keys set UNKNOWN_OPTION, so the cell is graded as answered and wrong.
+        """
+        if isinstance(cell, list):
+            return self.keys[index].mask_of(cell)
+        cache = self._mask_cache[index]
+        mask = cache.get(cell)
+        if mask is None:
+            key = self.keys[index]
+            tokens = [t for t in _KEY_SEPARATORS.split(str(cell).strip()) if t]
+            if len(tokens) == 1 and tokens[0] not in key.bits:
+                tokens = list(tokens[0])  # "AC" for A and C
+            mask = cache[cell] = key.mask_of(tokens)
+        return mask
+
+    def grade_rows(self, rows: List[Tuple[str, List[Tuple[int, object]]]]) -> Tuple[str, Dict[str, np.ndarray]]:
+        """Grade a batch of (candidate, [(question index, cell), ...]) rows.
+
+        Returns:
+            Tuple[str, Dict[str, np.ndarray]]: JSONL results for the batch and the
+            batch's totals for the cohort summary
+        """
+        masks = [[0] * len(self.questions) for _ in rows]
+        for row_masks, (_, cells) in zip(masks, rows):
+            for index, cell in cells:
+                if cell not in (None, ''):
+                    row_masks[index] = self.parse_cell(index, cell)
+        submissions = np.array(masks, dtype=np.uint64).reshape(len(rows), len(self.questions))
+        graded = grade_batch(self.key_masks, submissions)
+
+        completion_date = datetime.now().isoformat()
+        wrong = graded['answered'] & ~graded['correct']
+        lines = []
+        for row, (candidate, _) in enumerate(rows):
+            answered = np.flatnonzero(graded['answered'][row]).tolist()
+            wrong_entries = [self._wrong_answer_entry(index, masks[row][index])
+                             for index in np.flatnonzero(wrong[row]).tolist()]
+            results_data = build_results_data(
+                self._scored(int(graded['scores'][row]), len(answered), [entry for entry, _ in wrong_entries]),
+                title=self.title,
+                exam_file_path=self.exam_path,
+                shuffle_enabled=False,
+                questions_answered=answered,
+                answered_question_indices=answered,
+                completion_date=completion_date
+            )
+            results_data['candidate'] = candidate
+            # Wrong-answer entries repeat across candidates, so they are serialized once and spliced in
+            results_data['detailed_results']['incorrect_answers'] = _ENTRIES_PLACEHOLDER
+            line = json.dumps(results_data, separators=(',', ':'))
+            lines.append(line.replace(_ENTRIES_PLACEHOLDER_JSON, "[" + ",".join(text for _, text in wrong_entries) + "]", 1))
+
+        totals = {
+            'correct': graded['correct'].sum(axis=0),
+            'answered': graded['answered'].sum(axis=0),
+            'score_counts': np.bincount(graded['scores'], minlength=len(self.questions) + 1),
+            'answered_counts': graded['answered_counts']
+        }
+        return "".join(line + "\n" for line in lines), totals
+
+    def _scored(self, score: int, total_answered: int, wrong_answers: List[Dict]) -> Dict:
+        total_questions = len(self.questions)
+        return {
+            'score': score,
+            'total_answered': total_answered,
+            'total_questions': total_questions,
+            'accuracy': (score / total_answered * 100) if total_answered else 0,
+            'completion_rate': (total_answered / total_questions * 100) if total_questions else 0,
+            'wrong_answers_count': len(wrong_answers),
+            'wrong_answers': wrong_answers,
+            'time_taken': "00:00:00",
+            'time_taken_seconds': 0,
+            'average_answer_seconds': 0.0,
+            'slowest_questions': []
+        }
+
+    def _wrong_answer_entry(self, index: int, mask: int) -> Tuple[Dict, str]:
+        """The wrong_answers entry for a submitted mask, and its JSON."""
+        cached = self._entry_cache.get((index, mask))
+        if cached is None:
+            question = self.questions[index]
+            key = self.keys[index]
+            entry = {
+                'question_id': question.get('id'),
+                'question': question['question'],
+                'your_answer': key.selected_text(key.keys_of(mask)),
+                'correct_answer': key.correct_text
+            }
+            cached = self._entry_cache[(index, mask)] = (entry, json.dumps(entry, separators=(',', ':')))
+        return cached
+
+
+def read_sheet(sheet_path: str, grader: SheetGrader) -> Iterator[Tuple[str, List[Tuple[int, object]]]]:
+    """Stream (candidate, [(question index, cell), ...]) rows from a CSV or JSONL sheet."""
+    with open(sheet_path, 'r', encoding='utf-8', newline='') as f:
+        if sheet_path.endswith(('.jsonl', '.ndjson')):
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                answers = record.get('answers', {})
+                if isinstance(answers, list):
+                    cells = list(enumerate(answers[:len(grader.questions)]))
+                else:
+                    cells = [(grader.question_for_header(str(header)), cell) for header, cell in answers.items()]
+                yield str(record.get('candidate', line_number)), cells
+            return
+
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [grader.question_for_header(h) for h in header[1:]]
+        for row in reader:
+            if row:
+                yield row[0], list(zip(columns, row[1:]))
+
+
+def _chunks(rows: Iterator, size: int) -> Iterator[List]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Per-process grader for the worker pool
+_worker_grader: Optional[SheetGrader] = None
+
+
+def _init_worker(exam_path: str):
+    global _worker_grader
+    _worker_grader = SheetGrader(exam_path)
+
+
+def _grade_in_worker(rows):
+    return _worker_grader.grade_rows(rows)
+
+
+def grade_sheet(exam_path: str, sheet_path: str, output_path: str, summary_path: Optional[str] = None,
+                workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Dict:
+    """Grade every candidate in an answer sheet.
+
+    Rows are read and graded in chunks, so memory use doesn't grow with the sheet.
+    With more than one worker, chunks are graded in a process pool while the next
+    ones are read; results are still written in sheet order.
+
+    Args:
+        exam_path: Exam JSON or pack
+        sheet_path: CSV or JSONL answer sheet
+        output_path: JSONL file for per-candidate results
+        summary_path: Cohort summary JSON (defaults to <output>.summary.json)
+        workers: Worker processes (defaults to the CPU count; 1 grades in this process)
+        chunk_size: Candidates per chunk
+
+    Returns:
+        Dict: The cohort summary
+    """
+    grader = SheetGrader(exam_path)
+    workers = workers or os.cpu_count() or 1
+    summary_path = summary_path or os.path.splitext(output_path)[0] + ".summary.json"
+
+    correct = np.zeros(len(grader.questions), dtype=np.int64)
+    answered = np.zeros(len(grader.questions), dtype=np.int64)
+    score_counts = np.zeros(len(grader.questions) + 1, dtype=np.int64)
+    answered_total = 0
+
+    def collect(batch):
+        nonlocal answered_total
+        text, totals = batch
+        out.write(text)
+        correct[:] += totals['correct']
+        answered[:] += totals['answered']
+        score_counts[:] += totals['score_counts']
+        answered_total += int(totals['answered_counts'].sum())
+
+    chunks = _chunks(read_sheet(sheet_path, grader), chunk_size)
+    with open(output_path, 'w', encoding='utf-8') as out:
+        if workers <= 1:
+            for rows in chunks:
+                collect(grader.grade_rows(rows))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(exam_path,)) as pool:
+                # Keep a bounded number of chunks in flight so the sheet is streamed
+                pending = deque()
+                for rows in chunks:
+                    pending.append(pool.submit(_grade_in_worker, rows))
+                    if len(pending) >= 2 * workers:
+                        collect(pending.popleft().result())
+                while pending:
+                    collect(pending.popleft().result())
+
+    summary = cohort_summary(grader, correct, answered, score_counts, answered_total)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def cohort_summary(grader: SheetGrader, correct: np.ndarray, answered: np.ndarray,
+                   score_counts: np.ndarray, answered_total: int) -> Dict:
+    """Score distribution and per-question correct rates for the cohort."""
+    candidates = int(score_counts.sum())
+    scores = np.arange(len(score_counts))
+    mean_score = float((scores * score_counts).sum() / candidates) if candidates else 0.0
+    cumulative = np.cumsum(score_counts)
+    median_score = int(np.searchsorted(cumulative, (candidates + 1) / 2)) if candidates else 0
+    return {
+        'exam_info': {'title': grader.title, 'exam_file_path': grader.exam_path,
+                      'total_questions': len(grader.questions)},
+        'candidates': candidates,
+        'mean_score': round(mean_score, 2),
+        'median_score': median_score,
+        'mean_accuracy_percentage': round(float(correct.sum() / answered_total * 100), 2) if answered_total else 0,
+        'score_distribution': score_counts.tolist(),
+        'questions': [{
+            'question_id': question.get('id'),
+            'answered': int(answered[index]),
+            'correct': int(correct[index]),
+            'correct_percentage': round(float(correct[index] / answered[index] * 100), 2) if answered[index] else 0
+        } for index, question in enumerate(grader.questions)]
+    }
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Grade a CSV/JSONL answer sheet against an exam")
+    parser.add_argument("exam", help="Exam JSON or pack")
+    parser.add_argument("sheet", help="Answer sheet, CSV or JSONL, one candidate per row")
+    parser.add_argument("--output", help="Per-candidate results JSONL (default: <sheet>.results.jsonl)")
+    parser.add_argument("--summary", help="Cohort summary JSON (default: <output>.summary.json)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (1 grades in-process)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Candidates per chunk")
+    args = parser.parse_args()
+
+    output_path = args.output or os.path.splitext(args.sheet)[0] + ".results.jsonl"
+    start = time.perf_counter()
+    summary = grade_sheet(args.exam, args.sheet, output_path, args.summary, args.workers, args.chunk_size)
+    print(f"Graded {summary['candidates']} candidate(s) in {time.perf_counter() - start:.2f}s -> {output_path}")
+    print(f"Mean score: {summary['mean_score']}/{summary['exam_info']['total_questions']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,413 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from PyQt6.QtCore import QRunnable, QThreadPool
+
+from src.models.quiz_engine import IDENTITY_ORDER, normalize_question_text
+from src.utils.exam_catalog import ExamCatalog, get_exam_catalog
+from src.utils.paths import EXAMS_DIR, RESULTS_DIR
+from src.utils.question_store import read_exam_file
+from src.utils.results_store import ResultsStore, get_results_store
+from src.utils.session_journal import SessionJournal
+
+ANALYSIS_DIR = os.path.join(EXAMS_DIR, '.analysis')
+ANALYSIS_VERSION = 1
+DEFAULT_SESSIONS_DIR = "data/sessions"
+
+# Pseudo-responses at the overall accuracy added to every question (empirical Bayes smoothing)
+PRIOR_STRENGTH = 4.0
+
+# Questions whose smoothed accuracy is below this count as hard
+HARD_ACCURACY = 0.5
+
+# One run at a time writes the analyses
+_run_lock = threading.Lock()
+
+# Background runs still going; they must outlive the quiz that started them
+_analysis_jobs = set()
+
+
+def analysis_path_for(exam_file_path: str, analysis_dir: str = ANALYSIS_DIR) -> str:
+    """Return where the analysis of an exam file is stored (exams/.analysis/<filename>.json)."""
+    return os.path.join(analysis_dir, os.path.basename(exam_file_path) + '.json')
+
+
+class _ExamResponses:
+    """Responses to one exam file, collected as flat columns."""
+
+    def __init__(self, exam_file: str, exam_data: Dict, content_hash: Optional[str]):
+        self.exam_file = exam_file
+        self.title = exam_data['title']
+        self.content_hash = content_hash
+        self.questions = exam_data['questions']
+        self.index_by_id = {}
+        self.index_by_text = {}
+        for index, question in enumerate(self.questions):
+            self.index_by_id.setdefault(question.get('id'), index)
+            self.index_by_text.setdefault(normalize_question_text(question.get('question', '')), index)
+        self.attempts = 0
+        self.attempt: List[int] = []
+        self.item: List[int] = []
+        self.correct: List[bool] = []
+        self.distractor_item: List[int] = []
+        self.distractor_option: List[str] = []
+
+    def find(self, wrong_answer: Dict) -> Optional[int]:
+        question_id = wrong_answer.get('question_id')
+        if question_id is not None and question_id in self.index_by_id:
+            return self.index_by_id[question_id]
+        return self.index_by_text.get(normalize_question_text(wrong_answer.get('question', '')))
+
+    def add_attempt(self, answered: Optional[List[int]], wrong_answers: List[Dict], journal: List[Dict] = ()):
+        """Add one quiz attempt.
+
+        Args:
+            answered: Bank indices answered, or None when they can't be recovered
+                (only the distractors chosen are used then)
+            wrong_answers: The attempt's wrong answer records
+            journal: Answer records journaled after the session snapshot
+        """
+        wrong = {}
+        for wrong_answer in wrong_answers:
+            index = self.find(wrong_answer)
+            if index is not None:
+                wrong.setdefault(index, wrong_answer.get('your_answer', ''))
+
+        if journal:
+            answered = list(answered or [])
+            for record in journal:
+                index = record.get('idx')
+                if index is None or not 0 <= index < len(self.questions) or index in answered:
+                    continue
+                answered.append(index)
+                if not record.get('ok'):
+                    # Journaled answers carry the chosen option keys rather than their text
+                    wrong[index] = "; ".join(str(self.questions[index]['options'].get(key, key))
+                                             for key in record.get('sel', []))
+
+        for index, your_answer in wrong.items():
+            question = self.questions[index]
+            correct = question['answer'] if isinstance(question['answer'], list) else [question['answer']]
+            text_to_option = {normalize_question_text(str(text)): option for option, text in question['options'].items()}
+            for chosen in str(your_answer).split("; "):
+                option = text_to_option.get(normalize_question_text(chosen))
+                if option is not None and option not in correct:
+                    self.distractor_item.append(index)
+                    self.distractor_option.append(option)
+
+        if answered is None:
+            return
+        attempt = self.attempts
+        self.attempts += 1
+        for index in set(answered):
+            if 0 <= index < len(self.questions):
+                self.attempt.append(attempt)
+                self.item.append(index)
+                self.correct.append(index not in wrong)
+
+
+def collect_responses(results_dir: str = RESULTS_DIR, sessions_dir: str = DEFAULT_SESSIONS_DIR,
+                      catalog: Optional[ExamCatalog] = None, exam_files: Iterable[str] = ()) -> Dict[str, _ExamResponses]:
+    """Read every results file and unfinished session into per-exam response columns.
+
+    Finished sessions are skipped because each one also wrote a results file. Results
+    from shuffled quizzes saved before 'answered_question_indices' existed only
+    contribute their chosen distractors, unless every question was answered.
+
+    Args:
+        exam_files: Exam files to include even if nobody has answered them yet
+
+    Returns:
+        Dict[str, _ExamResponses]: Responses keyed by exam file path
+    """
+    catalog = catalog or get_exam_catalog()
+    exams: Dict[str, _ExamResponses] = {}
+
+    def responses_for(exam_ref: Optional[Dict], title: str) -> Optional[_ExamResponses]:
+        exam_file = catalog.resolve(exam_ref, title)
+        if exam_file is None:
+            return None
+        if exam_file not in exams:
+            try:
+                exam_data = read_exam_file(exam_file)
+            except Exception as e:
+                print(f"Error loading exam {exam_file}: {e}")
+                return None
+            exams[exam_file] = _ExamResponses(exam_file, exam_data, catalog.ref_for_path(exam_file)['content_hash'])
+        return exams[exam_file]
+
+    for exam_file in exam_files:
+        responses_for({'path': exam_file}, None)
+
+    for filepath in _json_files(results_dir, "quiz_results_"):
+        data = _read_json(filepath)
+        if data is None:
+            continue
+        exam_info = data.get('exam_info', {})
+        exam_path = exam_info.get('exam_file_path')
+        responses = responses_for({'path': exam_path} if exam_path else None, exam_info.get('title'))
+        if responses is None:
+            continue
+        detailed = data.get('detailed_results', {})
+        answered = detailed.get('answered_question_indices')
+        if answered is None:
+            positions = detailed.get('questions_answered', [])
+            if not exam_info.get('shuffle_enabled'):
+                answered = positions
+            elif len(positions) == len(responses.questions):
+                answered = range(len(responses.questions))
+        responses.add_attempt(answered, detailed.get('incorrect_answers', []))
+
+    for filepath in _json_files(sessions_dir, "session_"):
+        data = _read_json(filepath)
+        if data is None or data.get('timer_data', {}).get('completed'):
+            continue
+        exam_ref = data.get('exam_ref')
+        responses = responses_for(exam_ref, data.get('exam_title'))
+        if responses is None:
+            continue
+        if exam_ref and exam_ref.get('content_hash') not in (None, responses.content_hash):
+            continue  # positions refer to an older version of the exam
+        quiz_mode = data.get('quiz_mode', {})
+        positions = quiz_mode.get('answered_questions')
+        if positions is None:
+            positions = range(quiz_mode.get('total_answered', 0))
+        order = quiz_mode.get('question_order')
+        if order == IDENTITY_ORDER:
+            order = None
+        answered = [order[p] for p in positions if p < len(order)] if order else list(positions)
+        journal = SessionJournal(filepath).read_tail(data.get('journal_seq', 0))
+        responses.add_attempt(answered, quiz_mode.get('wrong_answers', []), journal)
+
+    return exams
+
+
+def _json_files(directory: str, prefix: str) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    with os.scandir(directory) as it:
+        return sorted(entry.path for entry in it if entry.name.startswith(prefix) and entry.name.endswith('.json'))
+
+
+def _read_json(filepath: str) -> Optional[Dict]:
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Error loading {filepath}: {e}")
+        return None
+
+
+def analyze(responses: _ExamResponses, prior_strength: float = PRIOR_STRENGTH) -> Dict:
+    """Estimate difficulty, discrimination and distractor attractiveness for one exam.
+
+    Difficulty is the smoothed proportion correct (p-value), shrunk towards the
+    exam's overall accuracy, and its logit, a 1PL (Rasch) style difficulty.
+    Discrimination is the point-biserial correlation between answering the question
+    correctly and the attempt's score on its other questions.
+    """
+    n_items = len(responses.questions)
+    attempt = np.asarray(responses.attempt, dtype=np.int64)
+    item = np.asarray(responses.item, dtype=np.int64)
+    correct = np.asarray(responses.correct, dtype=np.float64)
+
+    answered = np.bincount(item, minlength=n_items)
+    right = np.bincount(item, weights=correct, minlength=n_items)
+    mean_accuracy = float(correct.mean()) if len(correct) else 0.5
+    p_value = (right + prior_strength * mean_accuracy) / (answered + prior_strength)
+    clipped = np.clip(p_value, 1e-3, 1 - 1e-3)
+    logit_difficulty = np.log((1 - clipped) / clipped)
+
+    # Rest score: the attempt's accuracy on its other answered questions
+    attempt_n = np.bincount(attempt)
+    attempt_right = np.bincount(attempt, weights=correct)
+    others = attempt_n[attempt] - 1
+    usable = others > 0
+    rest = np.zeros(len(correct))
+    rest[usable] = (attempt_right[attempt][usable] - correct[usable]) / others[usable]
+    x, y, usable_item = correct[usable], rest[usable], item[usable]
+    n = np.bincount(usable_item, minlength=n_items).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x = np.bincount(usable_item, weights=x, minlength=n_items) / n
+        mean_y = np.bincount(usable_item, weights=y, minlength=n_items) / n
+        cov = np.bincount(usable_item, weights=x * y, minlength=n_items) / n - mean_x * mean_y
+        var_x = mean_x - mean_x ** 2
+        var_y = np.bincount(usable_item, weights=y * y, minlength=n_items) / n - mean_y ** 2
+        discrimination = cov / np.sqrt(var_x * var_y)
+    discrimination[~np.isfinite(discrimination)] = np.nan
+
+    # Distractor choices: count (question, option) pairs in one bincount
+    options = sorted(set(responses.distractor_option))
+    option_codes = {option: code for code, option in enumerate(options)}
+    distractor_item = np.asarray(responses.distractor_item, dtype=np.int64)
+    codes = np.asarray([option_codes[o] for o in responses.distractor_option], dtype=np.int64)
+    picks = np.bincount(distractor_item * max(len(options), 1) + codes,
+                        minlength=n_items * max(len(options), 1)).reshape(n_items, max(len(options), 1))
+    wrong_picks = picks.sum(axis=1)
+
+    questions = []
+    for index in range(n_items):
+        distractors = {}
+        if wrong_picks[index]:
+            for code in np.flatnonzero(picks[index]):
+                distractors[options[code]] = round(float(picks[index, code] / wrong_picks[index]), 4)
+        questions.append({
+            'index': index,
+            'question_id': responses.questions[index].get('id'),
+            'responses': int(answered[index]),
+            'correct': int(right[index]),
+            'p_value': round(float(p_value[index]), 4),
+            'difficulty': round(float(logit_difficulty[index]), 4),
+            'discrimination': None if np.isnan(discrimination[index]) else round(float(discrimination[index]), 4),
+            'distractors': distractors
+        })
+
+    return {
+        'version': ANALYSIS_VERSION,
+        'exam_file': os.path.basename(responses.exam_file),
+        'title': responses.title,
+        'content_hash': responses.content_hash,
+        'generated': time.time(),
+        'attempts': responses.attempts,
+        'responses': int(len(correct)),
+        'mean_accuracy': round(mean_accuracy, 4),
+        'questions': questions
+    }
+
+
+def results_signature(mtimes: Iterable[int]) -> List[int]:
+    """Count and newest mtime of the results files, which change whenever a result is added, edited or removed."""
+    mtimes = list(mtimes)
+    return [len(mtimes), max(mtimes, default=0)]
+
+
+def run_item_analysis(results_dir: str = RESULTS_DIR, sessions_dir: str = DEFAULT_SESSIONS_DIR,
+                      analysis_dir: str = ANALYSIS_DIR, catalog: Optional[ExamCatalog] = None,
+                      exam_files: Iterable[str] = ()) -> Dict[str, Dict]:
+    """Analyze every exam that has responses and write the results to analysis_dir.
+
+    Args:
+        exam_files: Exam files to write an analysis for even if nobody has answered
+            them yet, so they aren't reanalyzed every time they are asked for
+
+    Returns:
+        Dict[str, Dict]: Analyses keyed by exam file path
+    """
+    analyses = {}
+    with _run_lock:
+        os.makedirs(analysis_dir, exist_ok=True)
+        # Taken before reading, so results saved meanwhile leave the analyses stale
+        signature = results_signature(os.stat(path).st_mtime_ns for path in _json_files(results_dir, "quiz_results_"))
+        for exam_file, responses in collect_responses(results_dir, sessions_dir, catalog, exam_files).items():
+            analysis = analyze(responses)
+            analysis['results_signature'] = signature
+            path = analysis_path_for(exam_file, analysis_dir)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(analysis, f)
+            os.replace(tmp_path, path)
+            analyses[exam_file] = analysis
+    return analyses
+
+
+class _ItemAnalysisJob(QRunnable):
+    """Reruns the item analysis batch job off the GUI thread."""
+
+    def __init__(self, exam_files: Iterable[str] = ()):
+        super().__init__()
+        self.exam_files = list(exam_files)
+
+    def run(self):
+        try:
+            run_item_analysis(exam_files=self.exam_files)
+        except Exception as e:
+            print(f"Error running item analysis: {e}")
+        finally:
+            _analysis_jobs.discard(self)
+
+
+def refresh_item_analysis(exam_files: Iterable[str] = ()):
+    """Rerun the item analysis in the background, unless a run is already under way.
+
+    Args:
+        exam_files: Passed to run_item_analysis()
+    """
+    if _analysis_jobs:
+        return
+    job = _ItemAnalysisJob(exam_files)
+    job.setAutoDelete(False)
+    _analysis_jobs.add(job)
+    QThreadPool.globalInstance().start(job)
+
+
+def item_analysis_running() -> bool:
+    """Whether a background run started by refresh_item_analysis() hasn't finished yet."""
+    return bool(_analysis_jobs)
+
+
+def load_item_analysis(exam_file_path: str, content_hash: Optional[str] = None,
+                       analysis_dir: str = ANALYSIS_DIR) -> Optional[Dict]:
+    """Load an exam's analysis, or None if there is none or it was made for other exam content."""
+    path = analysis_path_for(exam_file_path, analysis_dir)
+    analysis = _read_json(path) if os.path.exists(path) else None
+    if analysis is None or analysis.get('version') != ANALYSIS_VERSION:
+        return None
+    if content_hash is not None and analysis.get('content_hash') != content_hash:
+        return None
+    return analysis
+
+
+def is_stale(analysis: Dict, results_store: Optional[ResultsStore] = None) -> bool:
+    """Whether results were added, edited or removed since the analysis was generated.
+
+    Judged from the results store's manifest. Session autosaves don't count: answers
+    in unfinished sessions are picked up the next time the job runs.
+    """
+    store = results_store or get_results_store()
+    store.refresh()
+    signature = results_signature(entry['mtime'] for entry in list(store.files.values()))
+    return analysis.get('results_signature') != signature
+
+
+def hard_questions(analysis: Dict, threshold: float = HARD_ACCURACY) -> List[int]:
+    """Bank indices of answered questions whose smoothed accuracy is below threshold."""
+    return [q['index'] for q in analysis['questions'] if q['responses'] and q['p_value'] < threshold]
+
+
+def difficulty_balanced_order(analysis: Dict) -> List[int]:
+    """All bank indices, interleaving hard, medium and easy questions.
+
+    Questions are split into thirds by smoothed accuracy and taken from each third
+    in turn, so any run of the quiz sees a similar mix of difficulty.
+    """
+    p_values = np.asarray([q['p_value'] for q in analysis['questions']])
+    ranked = np.argsort(p_values, kind='stable')
+    bands = np.array_split(ranked, 3)
+    order = []
+    for i in range(max((len(band) for band in bands), default=0)):
+        order.extend(int(band[i]) for band in bands if i < len(band))
+    return order
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Estimate question difficulty and distractor attractiveness from saved results and sessions")
+    parser.add_argument("--results", default=RESULTS_DIR, help="Results folder")
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS_DIR, help="Sessions folder")
+    parser.add_argument("--output", default=ANALYSIS_DIR, help="Where to write the analyses")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    analyses = run_item_analysis(args.results, args.sessions, args.output)
+    for exam_file, analysis in analyses.items():
+        print(f"{os.path.basename(exam_file)}: {analysis['responses']} responses from {analysis['attempts']} attempts")
+    print(f"Analyzed {len(analyses)} exam(s) in {time.perf_counter() - start:.2f}s: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import json
+import os
+
+from src.utils.exam_pack import PACK_EXTENSION, write_exam_pack
+
+
+def convert_file(input_path: str, output_path: str) -> None:
+    with open(input_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if "title" not in data or "questions" not in data:
+        raise ValueError(f"{input_path} is not an exam file (missing 'title' or 'questions')")
+    write_exam_pack(data, output_path)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Compile exam JSON into a memory-mappable binary exam pack")
+    parser.add_argument("inputs", nargs="+", help="Input exam JSON files")
+    parser.add_argument("--outdir", default=None, help="Output directory for pack files (default: next to each input)")
+    args = parser.parse_args()
+
+    for input_path in args.inputs:
+        base = os.path.splitext(os.path.basename(input_path))[0]
+        outdir = args.outdir if args.outdir else os.path.dirname(input_path)
+        output_path = os.path.join(outdir, f"{base}{PACK_EXTENSION}")
+        convert_file(input_path, output_path)
+        print(f"Compiled {input_path} -> {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+from abc import abstractmethod
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Dict, Optional
+
+from src.utils.paths import DATA_DIR
+
+DEFAULT_CACHE_SIZE = 256
+INDEX_DIR = os.path.join(DATA_DIR, 'exam_index')
+
+# Offset index sidecar: magic, version, source size, source mtime_ns, question count, title length
+_INDEX_MAGIC = b'QIDX'
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct('<4sIQQQI')
+
+# A JSON string (with escapes) or a structural bracket; everything else is skipped
+_TOKEN_PATTERN = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]]', re.DOTALL)
+
+
+class QuestionSource(Sequence):
+    """Read-only question list that materializes questions on demand.
+
+    An abstract base class (Sequence's metaclass is ABCMeta): subclasses implement
+    __len__ and _load_question. Materialized questions are kept in a small LRU so
+    the window around the current question stays hot.
+    """
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, Dict]" = OrderedDict()
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of questions."""
+
+    @abstractmethod
+    def _load_question(self, index: int) -> Dict:
+        """Materialize the question at index, which is already bounds-checked."""
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question index out of range")
+
+        question = self._cache.get(index)
+        if question is not None:
+            self._cache.move_to_end(index)
+            return question
+
+        question = self._load_question(index)
+        self._cache[index] = question
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return question
+
+    def warm(self, index: int, radius: int = 2):
+        """Materialize the questions around index so neighbouring navigation is a cache hit."""
+        for i in range(max(0, index - radius), min(len(self), index + radius + 1)):
+            self[i]
+
+
+class LazyExamFile(QuestionSource):
+    """Question source backed by an exam JSON file and a byte-offset index over its questions.
+
+    The offset index is built once by tokenizing the file and is cached next to the
+    catalog, so later opens only read a small header. Each question is decoded from
+    its byte range the first time it's requested.
+    """
+
+    def __init__(self, filepath: str, cache_size: int = DEFAULT_CACHE_SIZE, index_dir: Optional[str] = None):
+        super().__init__(cache_size)
+        self.filepath = filepath
+        self._file = open(filepath, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+
+        index_path = os.path.join(index_dir or INDEX_DIR, hashlib.sha1(os.path.abspath(filepath).encode()).hexdigest() + '.idx')
+        loaded = self._read_index(index_path, stat)
+        if loaded is None:
+            self.title, self._offsets = self._build_index()
+            try:
+                self._write_index(index_path, stat)
+            except OSError as e:
+                print(f"Error saving exam index for {filepath}: {e}")
+        else:
+            self.title, self._offsets = loaded
+
+    def __len__(self) -> int:
+        return len(self._offsets) // 2
+
+    def _load_question(self, index: int) -> Dict:
+        start = self._offsets[2 * index]
+        end = self._offsets[2 * index + 1]
+        return json.loads(self._mmap[start:end])
+
+    def close(self):
+        """Release the memory map and file handle."""
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._file.close()
+
+    def _build_index(self):
+        """Tokenize the file once and record the byte range of each question object."""
+        offsets = array('Q')
+        title = "Untitled Exam"
+        depth = 0
+        key = None
+        in_questions = False
+        start = 0
+
+        for match in _TOKEN_PATTERN.finditer(self._mmap):
+            token = match.group()
+            first = token[:1]
+            if first == b'"':
+                if depth == 1:
+                    if key == b'"title"':
+                        title = json.loads(token)
+                        key = None
+                    else:
+                        key = token
+                continue
+
+            if first in (b'{', b'['):
+                depth += 1
+                if in_questions and depth == 3 and first == b'{':
+                    start = match.start()
+                elif depth == 2 and first == b'[' and key == b'"questions"':
+                    in_questions = True
+            else:
+                if in_questions and depth == 3 and first == b'}':
+                    offsets.append(start)
+                    offsets.append(match.end())
+                elif in_questions and depth == 2 and first == b']':
+                    in_questions = False
+                if depth == 2:
+                    key = None
+                depth -= 1
+
+        return title, offsets
+
+    def _read_index(self, index_path: str, stat: os.stat_result):
+        """Load a cached offset index if it still matches the source file."""
+        try:
+            with open(index_path, 'rb') as f:
+                header = f.read(_INDEX_HEADER.size)
+                magic, version, size, mtime, count, title_len = _INDEX_HEADER.unpack(header)
+                if (magic != _INDEX_MAGIC or version != _INDEX_VERSION
+                        or size != stat.st_size or mtime != stat.st_mtime_ns):
+                    return None
+                title = f.read(title_len).decode('utf-8')
+                offsets = array('Q')
+                offsets.fromfile(f, 2 * count)
+        except (OSError, struct.error, EOFError, UnicodeDecodeError):
+            return None
+        return title, offsets
+
+    def _write_index(self, index_path: str, stat: os.stat_result):
+        """Persist the offset index so the next open skips tokenizing."""
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        title_bytes = self.title.encode('utf-8')
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, stat.st_size,
+                                       stat.st_mtime_ns, len(self), len(title_bytes)))
+            f.write(title_bytes)
+            self._offsets.tofile(f)
+        os.replace(tmp_path, index_path)
+
+
+def open_lazy_exam(filepath: str, cache_size: int = DEFAULT_CACHE_SIZE) -> Dict:
+    """Open an exam file lazily. Returns exam data whose 'questions' is a LazyExamFile."""
+    questions = LazyExamFile(filepath, cache_size=cache_size)
+    return {'title': questions.title, 'questions': questions}
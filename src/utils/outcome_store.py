@@ -0,0 +1,322 @@
+import atexit
+import glob
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.utils.exam_catalog import exam_key
+from src.utils.paths import DATA_DIR
+
+DEFAULT_OUTCOMES_DIR = os.path.join(DATA_DIR, 'outcomes')
+META_FILENAME = 'meta.json'
+STORE_VERSION = 1
+
+# Column name -> dtype, one row per graded answer
+COLUMNS = {
+    'exam': np.uint32,        # interned exam id, see OutcomeStore.exam_id
+    'question': np.int64,     # question id, or -(bank index + 1) for questions without one
+    'attempt': np.uint32,     # one id per quiz run
+    'correct': np.bool_,
+    'seconds': np.float32,    # time from the question being shown to it being graded
+    'timestamp': np.float64,  # unix time the answer was graded
+}
+
+# Buffered answers are written out as a new chunk once there are this many
+FLUSH_EVERY = 256
+
+# Chunks are merged into one once there are more than this many
+MAX_CHUNKS = 32
+
+
+def question_column_value(record: Dict) -> int:
+    """Value of the 'question' column for an engine answer record."""
+    qid = record.get('qid')
+    if isinstance(qid, int) and not isinstance(qid, bool):
+        return qid
+    return -(record['idx'] + 1)
+
+
+def _grouped(keys: np.ndarray, *values: np.ndarray):
+    """Group rows by key: unique keys, row counts and per-key sums of each value column."""
+    if not len(keys):
+        return keys, np.zeros(0, dtype=np.int64), [np.zeros(0) for _ in values]
+    low = int(keys.min())
+    span = int(keys.max()) - low + 1
+    if span <= 4 * len(keys):
+        # Dense key range (question ids, attempt ids): bincount on the keys directly, no sort
+        offsets = keys.astype(np.int64) - low
+        counts = np.bincount(offsets, minlength=span)
+        present = np.flatnonzero(counts)
+        sums = [np.bincount(offsets, weights=value, minlength=span)[present] for value in values]
+        return (present + low).astype(keys.dtype), counts[present], sums
+    unique, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(unique))
+    sums = [np.bincount(inverse, weights=value, minlength=len(unique)) for value in values]
+    return unique, counts, sums
+
+
+class OutcomeStore:
+    """Columnar log of every graded answer, kept as NumPy arrays.
+
+    Answers are buffered in memory and written as numbered .npz chunks under
+    data/outcomes/. Queries run over the concatenated columns, so per-question
+    and per-attempt analytics are single bincount passes rather than loops over
+    results files.
+    """
+
+    def __init__(self, outcomes_dir: str = DEFAULT_OUTCOMES_DIR, flush_every: int = FLUSH_EVERY):
+        self.outcomes_dir = outcomes_dir
+        self.flush_every = flush_every
+        self.exams: Dict[str, Dict] = {}  # exam key -> {'id', 'title'}
+        self.next_attempt = 1
+        self.next_chunk = 1
+        self._buffer: List[tuple] = []
+        self._flushed: Optional[Dict[str, np.ndarray]] = None  # columns of the chunks on disk
+        self._columns: Optional[Dict[str, np.ndarray]] = None  # flushed plus buffered
+        self._load_meta()
+
+    def _meta_path(self) -> str:
+        return os.path.join(self.outcomes_dir, META_FILENAME)
+
+    def _load_meta(self):
+        try:
+            with open(self._meta_path(), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading outcome store: {e}")
+            return
+        if meta.get('version') != STORE_VERSION:
+            return
+        self.exams = meta.get('exams', {})
+        self.next_attempt = meta.get('next_attempt', 1)
+        self.next_chunk = meta.get('next_chunk', 1)
+
+    def _save_meta(self):
+        os.makedirs(self.outcomes_dir, exist_ok=True)
+        tmp_path = f"{self._meta_path()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'exams': self.exams,
+                       'next_attempt': self.next_attempt, 'next_chunk': self.next_chunk}, f)
+        os.replace(tmp_path, self._meta_path())
+
+    def exam_id(self, exam_key: str, title: str = '') -> int:
+        """Return the interned id for an exam (content hash or title), assigning one if needed."""
+        exam = self.exams.get(exam_key)
+        if exam is None:
+            exam = {'id': len(self.exams) + 1, 'title': title}
+            self.exams[exam_key] = exam
+            self._save_meta()
+        return exam['id']
+
+    def new_attempt(self) -> int:
+        """Allocate an attempt id for a new quiz run."""
+        attempt = self.next_attempt
+        self.next_attempt += 1
+        self._save_meta()
+        return attempt
+
+    def record(self, exam: int, question: int, attempt: int, correct: bool, seconds: float,
+               timestamp: Optional[float] = None):
+        """Buffer one graded answer, flushing a chunk when the buffer is full."""
+        self._buffer.append((exam, question, attempt, correct, seconds,
+                             time.time() if timestamp is None else timestamp))
+        self._columns = None
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def _buffer_columns(self) -> Dict[str, np.ndarray]:
+        rows = list(zip(*self._buffer)) if self._buffer else [()] * len(COLUMNS)
+        return {name: np.asarray(values, dtype=dtype) for (name, dtype), values in zip(COLUMNS.items(), rows)}
+
+    def flush(self):
+        """Write buffered answers to disk as a new chunk."""
+        if not self._buffer:
+            return
+        buffered = self._buffer_columns()
+        os.makedirs(self.outcomes_dir, exist_ok=True)
+        chunk_path = os.path.join(self.outcomes_dir, f"chunk_{self.next_chunk:06d}.npz")
+        tmp_path = f"{chunk_path}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **buffered)
+            os.replace(tmp_path, chunk_path)
+            self.next_chunk += 1
+            self._save_meta()
+        except OSError as e:
+            print(f"Error writing outcome chunk: {e}")
+            return
+        if self._flushed is not None:
+            self._flushed = {name: np.concatenate([self._flushed[name], buffered[name]]) for name in COLUMNS}
+        self._buffer = []
+        if len(self._chunk_paths()) > MAX_CHUNKS:
+            self.compact()
+
+    def _chunk_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.outcomes_dir, 'chunk_*.npz')))
+
+    def _load_chunks(self) -> Dict[str, np.ndarray]:
+        parts = {name: [] for name in COLUMNS}
+        for chunk_path in self._chunk_paths():
+            try:
+                with np.load(chunk_path) as chunk:
+                    for name in COLUMNS:
+                        parts[name].append(chunk[name])
+            except (OSError, KeyError, ValueError) as e:
+                print(f"Error loading outcome chunk {chunk_path}: {e}")
+        return {name: np.concatenate(arrays) if arrays else np.empty(0, dtype=COLUMNS[name])
+                for name, arrays in parts.items()}
+
+    def compact(self):
+        """Merge every chunk on disk into one."""
+        self.flush()
+        chunk_paths = self._chunk_paths()
+        if len(chunk_paths) < 2:
+            return
+        merged = self._load_chunks()
+        chunk_path = os.path.join(self.outcomes_dir, f"chunk_{self.next_chunk:06d}.npz")
+        tmp_path = f"{chunk_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **merged)
+        os.replace(tmp_path, chunk_path)
+        self.next_chunk += 1
+        self._save_meta()
+        for old_path in chunk_paths:
+            os.remove(old_path)
+        self._flushed = merged
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Every recorded answer as column arrays, including ones not yet flushed."""
+        if self._columns is None:
+            if self._flushed is None:
+                self._flushed = self._load_chunks()
+            if self._buffer:
+                buffered = self._buffer_columns()
+                self._columns = {name: np.concatenate([self._flushed[name], buffered[name]]) for name in COLUMNS}
+            else:
+                self._columns = self._flushed
+        return self._columns
+
+    def _select(self, exam: Optional[int] = None, attempt: Optional[int] = None) -> Dict[str, np.ndarray]:
+        columns = self.columns()
+        mask = None
+        if exam is not None:
+            mask = columns['exam'] == exam
+        if attempt is not None:
+            attempt_mask = columns['attempt'] == attempt
+            mask = attempt_mask if mask is None else mask & attempt_mask
+        if mask is None:
+            return columns
+        return {name: column[mask] for name, column in columns.items()}
+
+    def question_accuracy(self, exam: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Per-question answer counts and accuracy.
+
+        Args:
+            exam: Exam id to restrict to; all exams when None (question ids are then
+                only meaningful alongside an exam)
+
+        Returns:
+            Dict[str, np.ndarray]: 'question', 'answered', 'correct' and 'accuracy' (0-1)
+        """
+        rows = self._select(exam)
+        questions, answered, (correct,) = _grouped(rows['question'], rows['correct'])
+        return {
+            'question': questions,
+            'answered': answered,
+            'correct': correct.astype(np.int64),
+            'accuracy': correct / np.maximum(answered, 1)
+        }
+
+    def accuracy_trend(self, exam: int) -> Dict[str, np.ndarray]:
+        """Accuracy of each attempt at an exam, oldest first.
+
+        Returns:
+            Dict[str, np.ndarray]: 'attempt', 'started' (unix time of the first answer),
+            'answered' and 'accuracy' (0-1)
+        """
+        rows = self._select(exam)
+        attempts, answered, (correct,) = _grouped(rows['attempt'], rows['correct'])
+        # Rows are in recording order, so an attempt's first row is its first answer
+        first_rows = np.full(len(attempts), len(rows['attempt']))
+        np.minimum.at(first_rows, np.searchsorted(attempts, rows['attempt']), np.arange(len(rows['attempt'])))
+        started = rows['timestamp'][first_rows] if len(attempts) else np.zeros(0)
+        order = np.argsort(started, kind='stable')
+        return {
+            'attempt': attempts[order],
+            'started': started[order],
+            'answered': answered[order],
+            'accuracy': (correct / np.maximum(answered, 1))[order]
+        }
+
+    def slowest_questions(self, exam: Optional[int] = None, attempt: Optional[int] = None,
+                          limit: int = 10) -> Dict[str, np.ndarray]:
+        """Questions with the highest mean time to answer, slowest first.
+
+        Returns:
+            Dict[str, np.ndarray]: 'question', 'mean_seconds' and 'answered'
+        """
+        rows = self._select(exam, attempt)
+        questions, answered, (seconds,) = _grouped(rows['question'], rows['seconds'])
+        mean_seconds = seconds / np.maximum(answered, 1)
+        if len(questions) > limit:
+            top = np.argpartition(-mean_seconds, limit - 1)[:limit]
+        else:
+            top = np.arange(len(questions))
+        top = top[np.argsort(-mean_seconds[top], kind='stable')]
+        return {'question': questions[top], 'mean_seconds': mean_seconds[top], 'answered': answered[top]}
+
+    def attempt_summary(self, attempt: int) -> Dict:
+        """Answer count, accuracy and timing totals for one attempt."""
+        rows = self._select(attempt=attempt)
+        answered = len(rows['correct'])
+        total_seconds = float(rows['seconds'].sum(dtype=np.float64))
+        return {
+            'answered': answered,
+            'correct': int(rows['correct'].sum()),
+            'accuracy': float(rows['correct'].mean()) if answered else 0.0,
+            'total_seconds': total_seconds,
+            'mean_seconds': total_seconds / answered if answered else 0.0
+        }
+
+
+class OutcomeRecorder:
+    """Feeds one quiz run's graded answers into an OutcomeStore.
+
+    The exam id and attempt id are assigned on the first answer, so runs that
+    are opened and closed without answering leave nothing behind.
+    """
+
+    def __init__(self, store: OutcomeStore, quiz_state):
+        self.store = store
+        self.quiz_state = quiz_state
+        self.exam: Optional[int] = None
+        self.attempt: Optional[int] = None
+
+    def on_answer(self, record: Dict):
+        """Answer listener for QuizEngine.answer_listeners."""
+        try:
+            if self.attempt is None:
+                title = self.quiz_state.original_exam_data['title']
+                self.exam = self.store.exam_id(exam_key(self.quiz_state.exam_ref, title), title)
+                self.attempt = self.store.new_attempt()
+            self.store.record(self.exam, question_column_value(record), self.attempt,
+                              record['ok'], record.get('secs', 0.0), record['ts'])
+        except Exception as e:
+            print(f"Error recording outcome: {e}")
+
+
+_shared_store: Optional[OutcomeStore] = None
+
+
+def get_outcome_store() -> OutcomeStore:
+    """Return the shared outcome store, flushed when the app exits."""
+    global _shared_store
+    if _shared_store is None:
+        _shared_store = OutcomeStore()
+        atexit.register(_shared_store.flush)
+    return _shared_store
@@ -0,0 +1,10 @@
+"""
+Project-relative paths shared by loaders and persistence helpers.
+"""
+import os
+
+# Project root is two levels up from src/utils/
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+EXAMS_DIR = os.path.join(PROJECT_ROOT, 'exams')
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'results')
@@ -0,0 +1,275 @@
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.utils.exam_pack import PackedExam, is_exam_pack
+from src.utils.paths import DATA_DIR, PROJECT_ROOT
+
+DEFAULT_DB_PATH = os.path.join(DATA_DIR, 'question_bank.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS exams (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    question_count INTEGER NOT NULL,
+    type_counts TEXT NOT NULL,
+    imported_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_exams_hash ON exams(content_hash);
+CREATE INDEX IF NOT EXISTS idx_exams_title ON exams(title);
+
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    exam_id INTEGER NOT NULL REFERENCES exams(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question_id INTEGER,
+    type TEXT NOT NULL,
+    text TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    extra TEXT,
+    UNIQUE (exam_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_type ON questions(type, exam_id);
+CREATE INDEX IF NOT EXISTS idx_questions_qid ON questions(exam_id, question_id);
+
+CREATE TABLE IF NOT EXISTS options (
+    question_rowid INTEGER NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (question_rowid, key)
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS question_fts USING fts5(question, options);
+"""
+
+_KNOWN_FIELDS = ('id', 'question', 'options', 'type', 'answer')
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def read_exam_file(filepath: str) -> Dict:
+    """Read an exam (JSON or compiled pack) fully into memory, without any UI error handling."""
+    if is_exam_pack(filepath):
+        pack = PackedExam(filepath)
+        try:
+            return {'title': pack.title, 'questions': list(pack)}
+        finally:
+            pack.close()
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_match_query(keyword: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix."""
+    words = _WORD_PATTERN.findall(keyword)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words[:-1]]
+    terms.append(f'"{words[-1]}"*')
+    return " ".join(terms)
+
+
+class QuestionStore:
+    """SQLite-backed question bank with full-text search over question and option text."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def import_exam(self, exam_data: Dict, path: str, content_hash: str) -> int:
+        """Import (or replace) an exam. Returns the exam's row id."""
+        with self.conn:
+            self._delete_exam_by_path(path)
+            type_counts: Dict[str, int] = {}
+            for q in exam_data['questions']:
+                question_type = q.get('type', 'singleChoice')
+                type_counts[question_type] = type_counts.get(question_type, 0) + 1
+            cursor = self.conn.execute(
+                "INSERT INTO exams (content_hash, path, title, question_count, type_counts, imported_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (content_hash, path, exam_data['title'], len(exam_data['questions']),
+                 json.dumps(type_counts), datetime.now().isoformat())
+            )
+            exam_id = cursor.lastrowid
+
+            for position, q in enumerate(exam_data['questions']):
+                extra = {k: v for k, v in q.items() if k not in _KNOWN_FIELDS}
+                cursor = self.conn.execute(
+                    "INSERT INTO questions (exam_id, position, question_id, type, text, answer, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (exam_id, position, q.get('id'), q.get('type', 'singleChoice'), q['question'],
+                     json.dumps(q.get('answer')), json.dumps(extra) if extra else None)
+                )
+                question_rowid = cursor.lastrowid
+                options = q.get('options', {})
+                self.conn.executemany(
+                    "INSERT INTO options (question_rowid, key, text) VALUES (?, ?, ?)",
+                    [(question_rowid, key, text) for key, text in options.items()]
+                )
+                self.conn.execute(
+                    "INSERT INTO question_fts (rowid, question, options) VALUES (?, ?, ?)",
+                    (question_rowid, q['question'], "\n".join(options.values()))
+                )
+        return exam_id
+
+    def _delete_exam_by_path(self, path: str):
+        row = self.conn.execute("SELECT id FROM exams WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            return
+        self.conn.execute(
+            "DELETE FROM question_fts WHERE rowid IN (SELECT id FROM questions WHERE exam_id = ?)", (row['id'],)
+        )
+        self.conn.execute("DELETE FROM exams WHERE id = ?", (row['id'],))
+
+    def sync_with_catalog(self, catalog) -> int:
+        """Import exams that are new or changed in the catalog and drop ones that disappeared.
+
+        Returns:
+            int: Number of exams imported or removed
+        """
+        known = {row['path']: row['content_hash']
+                 for row in self.conn.execute("SELECT path, content_hash FROM exams")}
+        current = {}
+        changes = 0
+        for exam in catalog.refresh():
+            path = os.path.relpath(exam['filepath'], PROJECT_ROOT)
+            current[path] = exam
+            if known.get(path) != exam['content_hash']:
+                exam_data = read_exam_file(exam['filepath'])
+                self.import_exam(exam_data, path, exam['content_hash'])
+                changes += 1
+
+        stale = [path for path in known if path not in current]
+        if stale:
+            with self.conn:
+                for path in stale:
+                    self._delete_exam_by_path(path)
+            changes += len(stale)
+        return changes
+
+    def list_exams(self, question_type: Optional[str] = None) -> List[Dict]:
+        """List exams with their type mix, optionally only those containing a question type."""
+        if question_type is None:
+            rows = self.conn.execute("SELECT * FROM exams ORDER BY path").fetchall()
+        else:
+            rows = self.conn.execute(
+                "SELECT * FROM exams WHERE EXISTS "
+                "(SELECT 1 FROM questions q WHERE q.type = ? AND q.exam_id = exams.id) "
+                "ORDER BY path", (question_type,)
+            ).fetchall()
+
+        return [{
+            'exam_id': row['id'],
+            'filename': os.path.basename(row['path']),
+            'filepath': os.path.join(PROJECT_ROOT, row['path']),
+            'title': row['title'],
+            'question_count': row['question_count'],
+            'type_counts': json.loads(row['type_counts']),
+            'content_hash': row['content_hash']
+        } for row in rows]
+
+    def _exam_id_for_hash(self, content_hash: str) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM exams WHERE content_hash = ?", (content_hash,)).fetchone()
+        return row['id'] if row else None
+
+    def load_exam(self, exam_id: int) -> Dict:
+        """Load an exam in the question_schema.json shape."""
+        exam = self.conn.execute("SELECT title FROM exams WHERE id = ?", (exam_id,)).fetchone()
+        if exam is None:
+            raise KeyError(f"No exam with id {exam_id}")
+        rows = self.conn.execute(
+            "SELECT * FROM questions WHERE exam_id = ? ORDER BY position", (exam_id,)
+        ).fetchall()
+        options: Dict[int, Dict[str, str]] = {}
+        for option in self.conn.execute(
+                "SELECT o.question_rowid, o.key, o.text FROM options o "
+                "JOIN questions q ON q.id = o.question_rowid WHERE q.exam_id = ? ORDER BY o.question_rowid, o.key",
+                (exam_id,)):
+            options.setdefault(option['question_rowid'], {})[option['key']] = option['text']
+
+        return {'title': exam['title'], 'questions': [self._row_to_question(row, options.get(row['id'], {}))
+                                                      for row in rows]}
+
+    def _row_to_question(self, row: sqlite3.Row, options: Dict[str, str]) -> Dict:
+        question = {}
+        if row['question_id'] is not None:
+            question['id'] = row['question_id']
+        question['question'] = row['text']
+        question['options'] = options
+        question['type'] = row['type']
+        question['answer'] = json.loads(row['answer'])
+        if row['extra']:
+            question.update(json.loads(row['extra']))
+        return question
+
+    def search_questions(self, keyword: str, content_hash: Optional[str] = None, limit: int = 200) -> List[Dict]:
+        """Full-text search over question and option text.
+
+        Returns:
+            List[Dict]: Matches with 'exam_title', 'content_hash', 'position' and 'question_id'
+        """
+        match = build_match_query(keyword)
+        if match is None:
+            return []
+
+        sql = ("SELECT q.position, q.question_id, q.text, e.title, e.content_hash FROM question_fts f "
+               "JOIN questions q ON q.id = f.rowid JOIN exams e ON e.id = q.exam_id "
+               "WHERE question_fts MATCH ?")
+        params: list = [match]
+        if content_hash is not None:
+            exam_id = self._exam_id_for_hash(content_hash)
+            if exam_id is None:
+                return []
+            sql += " AND q.exam_id = ?"
+            params.append(exam_id)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        return [{
+            'exam_title': row['title'],
+            'content_hash': row['content_hash'],
+            'position': row['position'],
+            'question_id': row['question_id'],
+            'question': row['text']
+        } for row in self.conn.execute(sql, params)]
+
+
+def main():
+    import argparse
+    from src.utils.exam_catalog import get_exam_catalog
+
+    parser = argparse.ArgumentParser(description="Build or query the SQLite question bank")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("sync", help="Import new or changed exams from the exams folder")
+    search_parser = subparsers.add_parser("search", help="Search question and option text")
+    search_parser.add_argument("keyword", help="Words to search for")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the question bank database")
+    args = parser.parse_args()
+
+    store = QuestionStore(args.db)
+    try:
+        if args.command == "sync":
+            changes = store.sync_with_catalog(get_exam_catalog())
+            print(f"Question bank synced ({changes} exam(s) updated): {args.db}")
+        else:
+            for match in store.search_questions(args.keyword):
+                print(f"[{match['exam_title']} #{match['question_id']}] {match['question']}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from src.utils.paths import DATA_DIR, RESULTS_DIR
+
+DEFAULT_STORE_PATH = os.path.join(DATA_DIR, 'results_aggregate.json')
+STORE_VERSION = 3
+LOG_EXTENSION = '.jsonl'
+
+# The snapshot is rewritten once at least this many files have been logged since the last one
+COMPACT_MIN = 100
+
+
+def question_key(incorrect_answer: Dict) -> str:
+    """Key a missed question by its id, or by its whitespace-normalized text when it has none."""
+    question_id = incorrect_answer.get('question_id')
+    if question_id is not None:
+        return f"id:{question_id}"
+    return "text:" + " ".join(incorrect_answer.get('question', '').split())
+
+
+def store_path_for(results_dir: str) -> str:
+    """Where the aggregate of a results folder is kept: under data/, keyed by the folder."""
+    abs_dir = os.path.abspath(results_dir)
+    if abs_dir == os.path.abspath(RESULTS_DIR):
+        return DEFAULT_STORE_PATH
+    digest = hashlib.sha1(abs_dir.encode()).hexdigest()[:16]
+    return os.path.join(DATA_DIR, f"results_aggregate_{digest}.json")
+
+
+def summarize_result(results_data: Dict) -> Dict:
+    """The parts of a results file the review tab lists, in the results file's own shape."""
+    exam_info = results_data.get('exam_info', {})
+    return {
+        'exam_info': {
+            'title': exam_info.get('title', 'Unknown Exam'),
+            'exam_file_path': exam_info.get('exam_file_path')
+        },
+        'session_info': {
+            'completion_date': results_data.get('session_info', {}).get('completion_date', '')
+        },
+        'performance': results_data.get('performance', {})
+    }
+
+
+def build_results_data(results: Dict, title: str, exam_file_path: Optional[str], shuffle_enabled: bool,
+                       questions_answered: List[int], answered_question_indices: List[int],
+                       completion_date: str) -> Dict:
+    """Build a results file's contents.
+
+    Args:
+        results: Scored results: 'score', 'total_answered', 'total_questions', 'accuracy',
+            'completion_rate', 'wrong_answers_count', 'wrong_answers', 'time_taken',
+            'time_taken_seconds', 'average_answer_seconds' and 'slowest_questions'
+        title: Exam title
+        exam_file_path: Exam file, relative to the project root where possible
+        shuffle_enabled: Whether the questions were shuffled
+        questions_answered: Answered positions in the order the questions were shown
+        answered_question_indices: The same answers as indices into the exam's questions
+        completion_date: ISO timestamp of completion
+
+    Returns:
+        Dict: The results document, as written to quiz_results_*.json
+    """
+    incorrect_question_ids = [wa.get('question_id') for wa in results['wrong_answers']
+                              if wa.get('question_id') is not None]
+    return {
+        "exam_info": {
+            "title": title,
+            "total_questions": results['total_questions'],
+            "shuffle_enabled": shuffle_enabled,
+            "exam_file_path": exam_file_path
+        },
+        "session_info": {
+            "completion_date": completion_date,
+            "time_taken": results['time_taken'],
+            "time_taken_seconds": results['time_taken_seconds']
+        },
+        "performance": {
+            "score": results['score'],
+            "total_answered": results['total_answered'],
+            "accuracy_percentage": round(results['accuracy'], 2),
+            "completion_percentage": round(results['completion_rate'], 2),
+            "incorrect_count": results['wrong_answers_count'],
+            "average_answer_seconds": results['average_answer_seconds']
+        },
+        "detailed_results": {
+            "correct_answers": results['score'],
+            "incorrect_answers": results['wrong_answers'],
+            "questions_answered": questions_answered,
+            "answered_question_indices": answered_question_indices,
+            "incorrect_question_ids": incorrect_question_ids,
+            "slowest_questions": results['slowest_questions']
+        }
+    }
+
+
+class ResultsStore:
+    """Aggregate of the quiz_results_*.json files, updated as results are saved.
+
+    Keeps a manifest of the result files it has seen (size, mtime and a listing
+    summary), per-exam attempt counts and, per question, its miss count and when
+    it was last missed. It is rebuilt from the raw files only when the manifest
+    no longer matches the results folder.
+
+    Every recorded file is appended to a log next to the store (results_aggregate.jsonl),
+    with its incorrect answers. The store file is a snapshot of the counts up to an
+    offset in that log, rewritten only once as many files have been logged since as
+    the manifest holds, so saving a result costs the same however many there are.
+    The incorrect answers themselves are read from the log only when asked for.
+    """
+
+    def __init__(self, results_dir: str = RESULTS_DIR, store_path: str = DEFAULT_STORE_PATH,
+                 compact_min: int = COMPACT_MIN):
+        self.results_dir = results_dir
+        self.store_path = store_path
+        self.log_path = os.path.splitext(store_path)[0] + LOG_EXTENSION
+        self.compact_min = compact_min
+        self.files: Dict[str, Dict] = {}
+        self.exams: Dict[str, Dict] = {}
+        # Results folder mtime when the manifest last matched it
+        self.dir_mtime: Optional[int] = None
+        self._logged = 0  # files logged since the snapshot
+        self._log_file = None
+        # Incorrect answers from the log, loaded the first time they're asked for
+        self._missed: Optional[List[Dict]] = None
+        # The home dialog lists results from a loader thread
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self):
+        offset = 0
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = None
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading results store: {e}")
+            data = None
+        if data and data.get('version') == STORE_VERSION:
+            self.files = data.get('files', {})
+            self.exams = data.get('exams', {})
+            self.dir_mtime = data.get('dir_mtime')
+            offset = data.get('log_offset', 0)
+        # The log is the full record, so without a usable snapshot it is replayed from the start
+        for entry in self._read_log(offset):
+            self._apply(entry)
+            self._logged += 1
+
+    def _read_log(self, offset: int = 0) -> List[Dict]:
+        """Log entries from a byte offset on. Lines torn by a crash are skipped."""
+        entries = []
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Error reading results store log: {e}")
+        return entries
+
+    def _log(self, entry: Dict):
+        """Append one entry to the log, rewriting the snapshot once the log has grown by as many files as it holds."""
+        if self._log_file is None:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            torn = _ends_mid_line(self.log_path)
+            self._log_file = open(self.log_path, 'a', encoding='utf-8')
+            if torn:
+                # Leave the partial line from a crash mid-write on a line of its own
+                self._log_file.write('\n')
+        self._log_file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self._log_file.flush()
+        self._logged += 1
+        if self._logged >= max(self.compact_min, len(self.files)):
+            self.save()
+
+    def _close_log(self):
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def save(self):
+        """Write a snapshot of the manifest and counts, covering the log as it is now."""
+        self._close_log()
+        try:
+            log_offset = os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            log_offset = 0
+        os.makedirs(os.path.dirname(self.store_path), exist_ok=True)
+        tmp_path = f"{self.store_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'files': self.files, 'exams': self.exams,
+                       'dir_mtime': self.dir_mtime, 'log_offset': log_offset}, f)
+        os.replace(tmp_path, self.store_path)
+        self._logged = 0
+
+    def record_result(self, filepath: str, results_data: Dict, save: bool = True):
+        """Fold one results file into the aggregate.
+
+        Args:
+            save: Whether to log it; rebuild() writes the whole log at once instead
+        """
+        with self._lock:
+            entry = self._entry_for(filepath, results_data)
+            self._apply(entry)
+            if save:
+                self._log(entry)
+
+    def _entry_for(self, filepath: str, results_data: Optional[Dict]) -> Dict:
+        """The log entry for a results file; None results_data marks it unreadable."""
+        stat = os.stat(filepath)
+        entry = {'file': os.path.basename(filepath), 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+        if results_data is None:
+            entry['valid'] = False
+        elif 'summary' not in self.files.get(entry['file'], {}):
+            # Re-recording the same file only updates its size and mtime, so it isn't double counted
+            entry['summary'] = summarize_result(results_data)
+            entry['incorrect'] = results_data.get('detailed_results', {}).get('incorrect_answers', [])
+        return entry
+
+    def _apply(self, entry: Dict):
+        if 'dir_mtime' in entry:
+            self.dir_mtime = entry['dir_mtime']
+            return
+        filename = entry['file']
+        if 'summary' not in entry:
+            if entry.get('valid', True) and filename in self.files:
+                self.files[filename].update(size=entry['size'], mtime=entry['mtime'])
+            else:
+                # Unreadable files are remembered so they don't look like drift on every listing
+                self.files[filename] = {'size': entry['size'], 'mtime': entry['mtime'], 'valid': False}
+            return
+
+        summary = entry['summary']
+        self.files[filename] = {'size': entry['size'], 'mtime': entry['mtime'], 'summary': summary}
+
+        title = summary['exam_info']['title']
+        completion_date = summary['session_info']['completion_date']
+        exam = self.exams.setdefault(title, {'attempts': 0, 'last_attempt': '', 'questions': {}})
+        exam['attempts'] += 1
+        exam['last_attempt'] = max(exam['last_attempt'], completion_date)
+
+        for incorrect in entry['incorrect']:
+            stats = exam['questions'].setdefault(question_key(incorrect), {
+                'question_id': incorrect.get('question_id'),
+                'question': incorrect.get('question', ''),
+                'misses': 0,
+                'last_missed': ''
+            })
+            stats['misses'] += 1
+            stats['last_missed'] = max(stats['last_missed'], completion_date)
+        if self._missed is not None:
+            self._missed.extend(_missed_answers(entry))
+
+    def _scan(self) -> Dict[str, os.stat_result]:
+        if not os.path.isdir(self.results_dir):
+            return {}
+        with os.scandir(self.results_dir) as it:
+            return {entry.name: entry.stat() for entry in it
+                    if entry.name.startswith("quiz_results_") and entry.name.endswith(".json")}
+
+    def _results_dir_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.results_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def has_drifted(self) -> bool:
+        """Whether the results folder no longer matches the manifest (files added, removed or edited elsewhere).
+
+        Results files are written to a temp file and swapped in, which changes the
+        folder's mtime, so the files are only stat'ed when that has changed.
+        """
+        dir_mtime = self._results_dir_mtime()
+        if dir_mtime is not None and dir_mtime == self.dir_mtime:
+            return False
+        on_disk = self._scan()
+        if on_disk.keys() != self.files.keys():
+            return True
+        if any(self.files[name]['size'] != stat.st_size or self.files[name]['mtime'] != stat.st_mtime_ns
+               for name, stat in on_disk.items()):
+            return True
+        if dir_mtime != self.dir_mtime:
+            self._log({'dir_mtime': dir_mtime})
+            self.dir_mtime = dir_mtime
+        return False
+
+    def rebuild(self):
+        """Recompute the aggregate from every results file and rewrite the log."""
+        self._close_log()
+        self.files = {}
+        self.exams = {}
+        self._missed = None
+        dir_mtime = self._results_dir_mtime()
+        entries = []
+        for filename in sorted(self._scan()):
+            filepath = os.path.join(self.results_dir, filename)
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    results_data = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error loading result {filename}: {e}")
+                results_data = None
+            try:
+                entry = self._entry_for(filepath, results_data)
+            except OSError as e:
+                print(f"Error loading result {filename}: {e}")
+                continue
+            self._apply(entry)
+            entries.append(entry)
+
+        # Files changed while scanning leave the folder mtime different, so they're picked up next time
+        self.dir_mtime = dir_mtime
+        # Without the old snapshot the new log is replayed from the start, whichever one survives a crash
+        try:
+            os.remove(self.store_path)
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        tmp_path = f"{self.log_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        os.replace(tmp_path, self.log_path)
+        self.save()
+
+    def refresh(self):
+        """Rebuild only if the results folder has drifted from the manifest."""
+        with self._lock:
+            if self.has_drifted():
+                self.rebuild()
+
+    def list_results(self, with_incorrect_only: bool = True) -> List[Dict]:
+        """List result summaries, newest first, each with '_filepath' added."""
+        with self._lock:
+            self.refresh()
+            results = []
+            for filename in sorted(self.files, reverse=True):
+                summary = self.files[filename].get('summary')
+                if summary is None:
+                    continue  # unreadable
+                if with_incorrect_only and not summary['performance'].get('incorrect_count', 0):
+                    continue
+                results.append({**summary, '_filepath': os.path.join(self.results_dir, filename)})
+        return results
+
+    def exam_stats(self, title: str) -> Optional[Dict]:
+        """Attempt count, last attempt and per-question miss stats for an exam title."""
+        self.refresh()
+        return self.exams.get(title)
+
+    def most_missed(self, title: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Questions missed most often, across all exams or for one exam title."""
+        self.refresh()
+        exams = {title: self.exams.get(title)} if title is not None else self.exams
+        questions = []
+        for exam_title, exam in exams.items():
+            if exam is None:
+                continue
+            for stats in exam['questions'].values():
+                question = dict(stats)
+                question['exam_title'] = exam_title
+                questions.append(question)
+        questions.sort(key=lambda q: (q['misses'], q['last_missed']), reverse=True)
+        return questions[:limit]
+
+    def incorrect_answers(self) -> List[Dict]:
+        """Every incorrect answer in the results, newest first, each with 'exam_title' and 'completion_date'."""
+        with self._lock:
+            self.refresh()
+            if self._missed is None:
+                self._missed = [answer for entry in self._read_log() if 'summary' in entry
+                                for answer in _missed_answers(entry)]
+            answers = list(self._missed)
+        answers.sort(key=lambda answer: answer['completion_date'], reverse=True)
+        return answers
+
+
+def _missed_answers(entry: Dict) -> List[Dict]:
+    """The incorrect answers of a logged results file, with its exam title and completion date."""
+    summary = entry['summary']
+    return [{**incorrect, 'completion_date': summary['session_info']['completion_date'],
+             'exam_title': summary['exam_info']['title']}
+            for incorrect in entry['incorrect']]
+
+
+def _ends_mid_line(path: str) -> bool:
+    """Whether a log file ends without a newline, as it does after a crash mid-write."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+    except FileNotFoundError:
+        return False
+
+
+def load_result(filepath: str) -> Dict:
+    """Load a full results file."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+_shared_stores: Dict[str, ResultsStore] = {}
+_shared_store_lock = threading.Lock()
+
+
+def get_results_store(results_dir: Optional[str] = None) -> ResultsStore:
+    """Return the shared results store of a results folder (default: the project's results/)."""
+    results_dir = results_dir or RESULTS_DIR
+    with _shared_store_lock:
+        store = _shared_stores.get(os.path.abspath(results_dir))
+        if store is None:
+            store = _shared_stores[os.path.abspath(results_dir)] = ResultsStore(results_dir, store_path_for(results_dir))
+    return store
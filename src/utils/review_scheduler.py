@@ -0,0 +1,371 @@
+import atexit
+import heapq
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.exam_catalog import exam_key, get_exam_catalog
+from src.utils.paths import DATA_DIR
+from src.utils.results_store import get_results_store
+
+DEFAULT_SCHEDULE_PATH = os.path.join(DATA_DIR, 'review_schedule.json')
+SCHEDULE_VERSION = 1
+LOG_EXTENSION = '.jsonl'
+
+DAY_SECONDS = 24 * 60 * 60
+
+# SM-2 parameters
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+# Rewrite the schedule once the update log has this many lines, or as many as there are cards
+COMPACT_MIN = 1000
+
+
+def card_question_key(question_id, question_text: str) -> str:
+    """Key a question by its id, or by its whitespace-normalized text when it has none."""
+    if question_id is not None:
+        return f"id:{question_id}"
+    return "text:" + " ".join(question_text.split())
+
+
+def end_of_today(now: Optional[float] = None) -> float:
+    """Unix time of the next local midnight."""
+    today = datetime.fromtimestamp(time.time() if now is None else now).date()
+    return datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+
+
+def _ends_mid_line(path: str) -> bool:
+    """Whether a log file ends without a newline, as it does after a crash mid-write."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return False
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+    except FileNotFoundError:
+        return False
+
+
+def sm2_update(card: Dict, quality: int, now: float):
+    """Apply one SM-2 review to a card in place.
+
+    Args:
+        card: Card with 'ease', 'interval' (days), 'reps' and 'due'
+        quality: Recall quality from 0 to 5; below 3 is a lapse
+        now: Unix time of the review
+    """
+    if quality < 3:
+        card['reps'] = 0
+        card['interval'] = 1
+        card['lapses'] = card.get('lapses', 0) + 1
+    else:
+        card['reps'] += 1
+        if card['reps'] == 1:
+            card['interval'] = 1
+        elif card['reps'] == 2:
+            card['interval'] = 6
+        else:
+            card['interval'] = round(card['interval'] * card['ease'])
+    card['ease'] = max(MIN_EASE, card['ease'] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    card['due'] = now + card['interval'] * DAY_SECONDS
+    card['last_review'] = now
+
+
+class ReviewScheduler:
+    """SM-2 schedule for questions that have been answered incorrectly.
+
+    Cards are keyed by exam key (content hash) and question key, so one question
+    has one schedule however many results files it was missed in. When an exam is
+    edited its content hash changes, and adopt() moves its cards to the new key.
+    A question gets a card the first time it is missed; after that every answer to
+    it reschedules it. Each exam has a min-heap of (due, card key) entries, so
+    taking the k cards due today costs O(k log n). Rescheduled cards leave their
+    old entry behind, which is skipped when popped.
+
+    The schedule file is a snapshot. Each card update is appended to a log next
+    to it (review_schedule.jsonl), and the snapshot is only rewritten once the log
+    is as long as the schedule, so an answer costs the same however many cards there are.
+    """
+
+    def __init__(self, schedule_path: str = DEFAULT_SCHEDULE_PATH, compact_min: int = COMPACT_MIN):
+        self.schedule_path = schedule_path
+        self.log_path = os.path.splitext(schedule_path)[0] + LOG_EXTENSION
+        self.compact_min = compact_min
+        self.cards: Dict[str, Dict[str, Dict]] = {}  # exam key -> question key -> card
+        self.titles: Dict[str, str] = {}  # exam key -> exam title
+        self._queues: Dict[str, List[Tuple[float, str]]] = {}
+        self._unsaved = 0  # changes in neither the snapshot nor the log
+        self._logged = 0  # lines in the log
+        self._log_file = None
+        self.loaded = self._load()
+        self._replay_log()
+        for key in self.cards:
+            self._rebuild_queue(key)
+
+    def _load(self) -> bool:
+        try:
+            with open(self.schedule_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading review schedule: {e}")
+            return False
+        if data.get('version') != SCHEDULE_VERSION:
+            return False
+        self.cards = data.get('cards', {})
+        self.titles = data.get('titles', {})
+        return True
+
+    def _replay_log(self):
+        """Apply the updates logged since the snapshot was written. Lines torn by a crash are skipped."""
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._apply(entry)
+                    self._logged += 1
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Error reading review schedule log: {e}")
+            return
+        if self._logged:
+            self.loaded = True
+
+    def _apply(self, entry: Dict):
+        key = entry['k']
+        if 'card' in entry:
+            self.cards.setdefault(key, {})[entry['q']] = entry['card']
+        if 'title' in entry:
+            self.titles[key] = entry['title']
+        if 'from' in entry:
+            self._move(entry['from'], key)
+
+    def _log(self, entry: Dict):
+        """Append one update to the log, rewriting the snapshot once the log has grown as large as it."""
+        if self._log_file is None:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            torn = _ends_mid_line(self.log_path)
+            self._log_file = open(self.log_path, 'a', encoding='utf-8')
+            if torn:
+                # Leave the partial line from a crash mid-write on a line of its own
+                self._log_file.write('\n')
+        self._log_file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self._log_file.flush()
+        self._logged += 1
+        if self._logged >= max(self.compact_min, sum(len(cards) for cards in self.cards.values())):
+            self.save()
+
+    def save(self):
+        """Write a snapshot of the whole schedule and empty the log."""
+        if not self._unsaved and not self._logged and self.loaded:
+            return
+        os.makedirs(os.path.dirname(self.schedule_path), exist_ok=True)
+        tmp_path = f"{self.schedule_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'version': SCHEDULE_VERSION, 'cards': self.cards, 'titles': self.titles}))
+        os.replace(tmp_path, self.schedule_path)
+        self._close_log()
+        try:
+            os.remove(self.log_path)
+        except FileNotFoundError:
+            pass
+        self._unsaved = 0
+        self._logged = 0
+        self.loaded = True
+
+    def close(self):
+        """Save anything the log doesn't already hold and close the log."""
+        if self._unsaved or not self.loaded:
+            self.save()
+        self._close_log()
+
+    def _close_log(self):
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def _move(self, old_key: str, key: str):
+        old_cards = self.cards.pop(old_key, {})
+        self._queues.pop(old_key, None)
+        self.titles.pop(old_key, None)
+        exam_cards = self.cards.setdefault(key, {})
+        for question_key, card in old_cards.items():
+            exam_cards.setdefault(question_key, card)
+
+    def adopt(self, key: str, title: str):
+        """Make key the current key for an exam title, moving over the cards of older versions of the exam.
+
+        Editing an exam changes its content hash. Question keys are ids, or text for
+        questions without one, so cards carry over to the questions that remain.
+        """
+        if self.titles.get(key) != title:
+            self.titles[key] = title
+            self._log({'k': key, 'title': title})
+        if self.cards.get(key):
+            return
+        for old_key in [old for old, old_title in self.titles.items() if old_title == title and old != key]:
+            if self.cards.get(old_key):
+                self._move(old_key, key)
+                self._log({'k': key, 'from': old_key})
+            else:
+                self.titles.pop(old_key, None)
+        if key in self.cards:
+            self._rebuild_queue(key)
+
+    def _rebuild_queue(self, key: str):
+        queue = [(card['due'], question_key) for question_key, card in self.cards[key].items()]
+        heapq.heapify(queue)
+        self._queues[key] = queue
+
+    def _push(self, key: str, question_key: str, card: Dict):
+        queue = self._queues.setdefault(key, [])
+        heapq.heappush(queue, (card['due'], question_key))
+        if len(queue) > 2 * len(self.cards[key]) + 64:
+            # Mostly stale entries: start over from the cards
+            self._rebuild_queue(key)
+
+    def record(self, key: str, question_key: str, correct: bool, now: Optional[float] = None,
+               question_id=None, question_text: str = '') -> Optional[Dict]:
+        """Reschedule a question after an answer.
+
+        Correct answers to questions without a card are ignored; a miss creates the card.
+
+        Returns:
+            Optional[Dict]: The updated card, or None if the question isn't scheduled
+        """
+        now = time.time() if now is None else now
+        exam_cards = self.cards.setdefault(key, {})
+        card = exam_cards.get(question_key)
+        if card is None:
+            if correct:
+                return None
+            card = exam_cards[question_key] = {
+                'question_id': question_id,
+                'question': question_text,
+                'ease': INITIAL_EASE,
+                'interval': 0,
+                'reps': 0,
+                'lapses': 0,
+                'due': now
+            }
+        sm2_update(card, QUALITY_CORRECT if correct else QUALITY_WRONG, now)
+        self._push(key, question_key, card)
+        self._log({'k': key, 'q': question_key, 'card': card})
+        return card
+
+    def add_miss(self, key: str, question_key: str, missed_at: float, question_id=None, question_text: str = ''):
+        """Add a card for a historical miss, due right away, unless the question already has one."""
+        exam_cards = self.cards.setdefault(key, {})
+        if question_key in exam_cards:
+            return
+        card = exam_cards[question_key] = {
+            'question_id': question_id,
+            'question': question_text,
+            'ease': INITIAL_EASE,
+            'interval': 0,
+            'reps': 0,
+            'lapses': 1,
+            'due': missed_at,
+            'last_review': missed_at
+        }
+        self._push(key, question_key, card)
+        self._unsaved += 1
+
+    def due(self, key: str, until: Optional[float] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Cards of one exam due by `until` (default: the end of today), soonest first.
+
+        Returns:
+            List[Dict]: Copies of the due cards, each with 'question_key' added
+        """
+        until = end_of_today() if until is None else until
+        queue = self._queues.get(key, [])
+        exam_cards = self.cards.get(key, {})
+        popped = []
+        due_cards = []
+        while queue and queue[0][0] <= until and (limit is None or len(due_cards) < limit):
+            entry = heapq.heappop(queue)
+            card = exam_cards.get(entry[1])
+            if card is None or card['due'] != entry[0] or entry in popped[-1:]:
+                continue  # stale or duplicate entry
+            popped.append(entry)
+            due_cards.append({**card, 'question_key': entry[1]})
+        for entry in popped:
+            heapq.heappush(queue, entry)
+        return due_cards
+
+    def due_count(self, key: str, until: Optional[float] = None) -> int:
+        return len(self.due(key, until))
+
+    def seed_from_results(self, results_store, catalog):
+        """Create cards for every question missed in the saved results, keyed by exam content hash.
+
+        Results only record the exam title, so each title is resolved to its exam file
+        through the catalog; titles that no longer resolve keep a title key.
+        """
+        for title, exam in results_store.exams.items():
+            exam_file = catalog.resolve(None, title)
+            key = exam_key(catalog.ref_for_path(exam_file) if exam_file else None, title)
+            self.titles[key] = title
+            for stats in exam['questions'].values():
+                try:
+                    missed_at = datetime.fromisoformat(stats['last_missed']).timestamp()
+                except (TypeError, ValueError):
+                    missed_at = time.time()
+                self.add_miss(key, card_question_key(stats.get('question_id'), stats.get('question', '')),
+                              missed_at, stats.get('question_id'), stats.get('question', ''))
+        self.save()
+
+
+class ReviewRecorder:
+    """Feeds one quiz run's graded answers into a ReviewScheduler."""
+
+    def __init__(self, scheduler: ReviewScheduler, quiz_state):
+        self.scheduler = scheduler
+        self.quiz_state = quiz_state
+        try:
+            scheduler.adopt(self.exam_key, quiz_state.original_exam_data['title'])
+        except Exception as e:
+            print(f"Error updating review schedule: {e}")
+
+    @property
+    def exam_key(self) -> str:
+        return exam_key(self.quiz_state.exam_ref, self.quiz_state.original_exam_data['title'])
+
+    def on_answer(self, record: Dict):
+        """Answer listener for QuizEngine.answer_listeners."""
+        try:
+            question = self.quiz_state.bank[record['idx']]
+            self.scheduler.record(self.exam_key, card_question_key(record.get('qid'), question['question']),
+                                  record['ok'], record['ts'], record.get('qid'), question['question'])
+        except Exception as e:
+            print(f"Error scheduling review: {e}")
+
+
+_shared_scheduler: Optional[ReviewScheduler] = None
+
+
+def get_review_scheduler() -> ReviewScheduler:
+    """Return the shared review scheduler, seeded from saved results the first time it is created."""
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = ReviewScheduler()
+        if not _shared_scheduler.loaded:
+            try:
+                results_store = get_results_store()
+                results_store.refresh()
+                _shared_scheduler.seed_from_results(results_store, get_exam_catalog())
+            except Exception as e:
+                print(f"Error seeding review schedule: {e}")
+        atexit.register(_shared_scheduler.close)
+    return _shared_scheduler
@@ -0,0 +1,414 @@
+"""
+In-memory search over the exams, sessions and results the home dialog lists.
+
+The index is built once from listings the app already keeps (the exam catalog,
+the session index and the results aggregate) plus a small vocabulary file per
+exam, so a search never reads exams/, data/sessions or results/.
+
+- Words are looked up in a sorted token array. The tokens sharing a prefix are a
+  contiguous range of it, so it works as a flattened prefix trie, and their
+  postings are stored back to back so that a range is one slice.
+- Dates and scores are sorted once, so a range is two binary searches.
+- Every filter is a boolean mask over the documents, and the masks are ANDed.
+
+Query syntax: words match exam titles and question and option text; the last
+word matches as a prefix. Filters narrow sessions and results:
+
+    from:2025-01  to:2025-03-15  date:2025-11   (a year, month or day)
+    score:>=80  score:<50  score:60-80  score:75
+    has:incorrect
+"""
+import os
+import re
+from bisect import bisect_left
+from collections.abc import Sequence
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.paths import DATA_DIR
+from src.utils.question_store import read_exam_file
+
+# One sorted vocabulary file per exam content hash
+TERMS_DIR = os.path.join(DATA_DIR, 'exam_terms')
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_PERIOD_PATTERN = re.compile(r"^(\d{4})(?:-(\d{1,2}))?(?:-(\d{1,2}))?$")
+_SCORE_PATTERN = re.compile(r"^(>=|<=|>|<)?(\d+(?:\.\d+)?)(?:-(\d+(?:\.\d+)?))?$")
+_FILTERS = ('from', 'to', 'date', 'score', 'has')
+
+# Sorts after every token that starts with a given prefix
+_PREFIX_END = "\U0010ffff"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words in text."""
+    return _WORD_PATTERN.findall(text.lower())
+
+
+def exam_terms(exam: Dict, terms_dir: str = TERMS_DIR) -> List[str]:
+    """The distinct words of an exam's questions and options, cached per content hash.
+
+    Args:
+        exam: Exam listing entry with 'filepath' and 'content_hash'
+        terms_dir: Directory of cached vocabularies
+
+    Returns:
+        List[str]: Sorted distinct words
+    """
+    content_hash = exam.get('content_hash')
+    cache_path = os.path.join(terms_dir, f"{content_hash}.txt") if content_hash else None
+    if cache_path:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read().split()
+        except OSError:
+            pass
+
+    words = set()
+    for question in read_exam_file(exam['filepath'])['questions']:
+        words.update(tokenize(question.get('question', '')))
+        for option in question.get('options', {}).values():
+            words.update(tokenize(option))
+    terms = sorted(words)
+
+    if cache_path:
+        try:
+            os.makedirs(terms_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(terms))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Error saving exam vocabulary: {e}")
+    return terms
+
+
+def _parse_timestamp(value) -> float:
+    """Seconds since the epoch for an ISO date, or NaN."""
+    if not value:
+        return np.nan
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return np.nan
+
+
+def _parse_period(text: str) -> Optional[Tuple[float, float]]:
+    """The [start, end) timestamps of a year, month or day such as 2025, 2025-11 or 2025-11-03."""
+    match = _PERIOD_PATTERN.match(text)
+    if not match:
+        return None
+    year, month, day = (int(part) if part else None for part in match.groups())
+    try:
+        if day is not None:
+            start = date(year, month, day)
+            end = start + timedelta(days=1)
+        elif month is not None:
+            start = date(year, month, 1)
+            end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        else:
+            start = date(year, 1, 1)
+            end = date(year + 1, 1, 1)
+    except ValueError:
+        return None
+    return (datetime.combine(start, datetime.min.time()).timestamp(),
+            datetime.combine(end, datetime.min.time()).timestamp())
+
+
+class SearchQuery:
+    """A parsed search: words plus optional date, score and incorrect-answer filters.
+
+    Filters that are still being typed (e.g. "from:2025-" or "score:>") are ignored rather than
+    matching nothing.
+    """
+
+    def __init__(self):
+        self.words: List[str] = []
+        self.date_from: Optional[float] = None  # inclusive
+        self.date_to: Optional[float] = None  # exclusive
+        self.score_min: Optional[Tuple[float, bool]] = None  # (value, inclusive)
+        self.score_max: Optional[Tuple[float, bool]] = None
+        self.has_incorrect = False
+
+    def has_filters(self) -> bool:
+        """Whether the query filters sessions and results by more than words."""
+        return (self.date_from is not None or self.date_to is not None or self.score_min is not None
+                or self.score_max is not None or self.has_incorrect)
+
+    def is_empty(self) -> bool:
+        return not self.words and not self.has_filters()
+
+
+def parse_query(text: str) -> SearchQuery:
+    """Parse the search box's text (see the module docstring for the syntax)."""
+    query = SearchQuery()
+    for part in text.split():
+        name, separator, value = part.partition(':')
+        name = name.lower()
+        if not separator or name not in _FILTERS:
+            query.words.extend(tokenize(part))
+        elif name in ('from', 'to', 'date'):
+            period = _parse_period(value)
+            if period is not None:
+                if name in ('from', 'date'):
+                    query.date_from = period[0]
+                if name in ('to', 'date'):
+                    query.date_to = period[1]
+        elif name == 'score':
+            match = _SCORE_PATTERN.match(value)
+            if match:
+                operator, low, high = match.groups()
+                low = float(low)
+                if high is not None and operator is None:
+                    query.score_min, query.score_max = (low, True), (float(high), True)
+                elif operator in ('>=', '>'):
+                    query.score_min = (low, operator == '>=')
+                elif operator in ('<=', '<'):
+                    query.score_max = (low, operator == '<=')
+                elif high is None:
+                    query.score_min, query.score_max = (low, True), (low, True)
+        elif value and 'incorrect'.startswith(value.lower()):
+            query.has_incorrect = True
+    return query
+
+
+class PrefixIndex:
+    """Word to document lookups over a sorted token array with back-to-back postings."""
+
+    def __init__(self, doc_tokens: Iterable[Iterable[str]]):
+        doc_sets = [set(tokens) for tokens in doc_tokens]
+        self.size = len(doc_sets)
+        all_tokens = list(chain.from_iterable(doc_sets))
+        self.tokens = sorted(dict.fromkeys(all_tokens))
+        rank = {token: position for position, token in enumerate(self.tokens)}
+        token_ids = np.fromiter(map(rank.__getitem__, all_tokens), dtype=np.int64, count=len(all_tokens))
+        docs = np.repeat(np.arange(self.size, dtype=np.int32),
+                         np.fromiter(map(len, doc_sets), dtype=np.int64, count=self.size))
+        # Postings grouped by token, each in document order
+        self.postings = docs[np.argsort(token_ids, kind='stable')]
+        self.offsets = np.zeros(len(self.tokens) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(token_ids, minlength=len(self.tokens)), out=self.offsets[1:])
+
+    def match(self, word: str, prefix: bool = False) -> np.ndarray:
+        """Boolean mask of the documents containing word, or a word starting with it."""
+        lo = bisect_left(self.tokens, word)
+        if prefix:
+            hi = bisect_left(self.tokens, word + _PREFIX_END, lo)
+        else:
+            hi = lo + 1 if lo < len(self.tokens) and self.tokens[lo] == word else lo
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.postings[self.offsets[lo]:self.offsets[hi]]] = True
+        return mask
+
+
+class _SortedColumn:
+    """A numeric column sorted once, for range lookups. NaN values never match."""
+
+    def __init__(self, values: np.ndarray):
+        self.size = len(values)
+        self.order = np.argsort(values, kind='stable')
+        self.sorted = values[self.order]
+        self.known = self.size - int(np.isnan(values).sum())
+
+    def between(self, low: Optional[Tuple[float, bool]], high: Optional[Tuple[float, bool]]) -> np.ndarray:
+        """Mask of values within (value, inclusive) bounds; None leaves a side open."""
+        known = self.sorted[:self.known]
+        start = 0 if low is None else np.searchsorted(known, low[0], side='left' if low[1] else 'right')
+        end = self.known if high is None else np.searchsorted(known, high[0], side='right' if high[1] else 'left')
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.order[start:max(start, end)]] = True
+        return mask
+
+
+class GroupedRows(Sequence):
+    """Dialog rows for matching documents: ('item', entry) rows, with a ('header', title)
+    row before each run of entries with the same title when titles are given.
+
+    Rows are computed on access, so a search with 50,000 matches costs no more than
+    one with ten until the rows are shown.
+    """
+
+    def __init__(self, entries: List[Dict], ids: np.ndarray, titles: Optional[List[str]] = None,
+                 title_ids: Optional[np.ndarray] = None):
+        self.entries = entries
+        self.ids = ids
+        self.titles = titles
+        if titles is None or not len(ids):
+            self.header_rows = np.empty(0, dtype=np.int64)
+            self.header_titles = np.empty(0, dtype=np.int32)
+        else:
+            row_titles = title_ids[ids]
+            starts = np.flatnonzero(np.concatenate(([True], row_titles[1:] != row_titles[:-1])))
+            self.header_rows = starts + np.arange(len(starts))
+            self.header_titles = row_titles[starts]
+
+    def __len__(self):
+        return len(self.ids) + len(self.header_rows)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self)
+        headers = int(np.searchsorted(self.header_rows, row, side='right'))
+        if headers and self.header_rows[headers - 1] == row:
+            return ('header', self.titles[self.header_titles[headers - 1]])
+        return ('item', self.entries[self.ids[row - headers]])
+
+
+class _Documents:
+    """One kind of listing (sessions or results) with its filter columns."""
+
+    def __init__(self, entries: List[Dict], title_ids: List[int], exam_ids: List[int], dates: List[float],
+                 scores: List[float], incorrect: List[bool], group_ranks: np.ndarray):
+        self.entries = entries
+        self.title_ids = np.array(title_ids, dtype=np.int32)
+        # -1 (no exam) indexes the False appended to exam masks
+        self.exam_ids = np.array(exam_ids, dtype=np.int32)
+        self.dates = _SortedColumn(np.array(dates, dtype=np.float64))
+        self.scores = _SortedColumn(np.array(scores, dtype=np.float64))
+        self.incorrect = np.array(incorrect, dtype=bool)
+        # Display order: grouped by title, newest first within a title
+        self.group_order = np.lexsort((np.arange(len(entries)), group_ranks[self.title_ids])) \
+            if entries else np.empty(0, dtype=np.int64)
+
+
+class SearchIndex:
+    """Search over exams, sessions and results; see the module docstring."""
+
+    def __init__(self, exams: List[Dict], sessions: List[Dict], results: List[Dict],
+                 terms_dir: str = TERMS_DIR):
+        """Build the index.
+
+        Args:
+            exams: Exam listing entries, as ExamRepository.list_exams() returns them
+            sessions: Session summaries, newest first, as SessionManager.find_study_sessions() returns them
+            results: Result summaries, newest first, as ResultsStore.list_results() returns them
+            terms_dir: Directory of cached exam vocabularies
+        """
+        self.exams = exams
+        self.titles: List[str] = []
+        self._title_ids: Dict[str, int] = {}
+
+        exam_tokens = []
+        self._exam_by_hash: Dict[str, int] = {}
+        self._exam_by_filename: Dict[str, int] = {}
+        self._exam_by_title: Dict[str, int] = {}
+        for exam_id, exam in enumerate(exams):
+            tokens = tokenize(exam['title'])
+            try:
+                tokens.extend(exam_terms(exam, terms_dir))
+            except Exception as e:
+                print(f"Error indexing exam {exam.get('filename')}: {e}")
+            exam_tokens.append(tokens)
+            if exam.get('content_hash'):
+                self._exam_by_hash.setdefault(exam['content_hash'], exam_id)
+            self._exam_by_filename.setdefault(exam.get('filename'), exam_id)
+            self._exam_by_title.setdefault(exam['title'], exam_id)
+        self.exam_index = PrefixIndex(exam_tokens)
+        self.exam_types = [set(exam.get('type_counts', {})) for exam in exams]
+
+        self.sessions = self._sessions(sessions)
+        self.results = self._results(results)
+        self.title_index = PrefixIndex(tokenize(title) for title in self.titles)
+
+    def _title_id(self, title: str) -> int:
+        title_id = self._title_ids.get(title)
+        if title_id is None:
+            title_id = self._title_ids[title] = len(self.titles)
+            self.titles.append(title)
+        return title_id
+
+    def _exam_id(self, content_hash: Optional[str], filename: Optional[str], title: str) -> int:
+        if content_hash and content_hash in self._exam_by_hash:
+            return self._exam_by_hash[content_hash]
+        if filename and filename in self._exam_by_filename:
+            return self._exam_by_filename[filename]
+        return self._exam_by_title.get(title, -1)
+
+    def _sessions(self, sessions: List[Dict]) -> _Documents:
+        title_ids, exam_ids, dates, scores, incorrect = [], [], [], [], []
+        for session in sessions:
+            title = session.get('exam_title', 'Unknown Exam')
+            title_ids.append(self._title_id(title))
+            exam_ids.append(self._exam_id((session.get('exam_ref') or {}).get('content_hash'), None, title))
+            dates.append(_parse_timestamp(session.get('session_date')))
+            quiz_mode = session.get('quiz_mode', {})
+            score, answered = quiz_mode.get('score', 0), quiz_mode.get('total_answered', 0)
+            scores.append(score / answered * 100 if answered else np.nan)
+            incorrect.append(answered > score)
+        # Sessions are grouped under titles in alphabetical order
+        ranks = np.empty(len(self.titles), dtype=np.int64)
+        ranks[np.argsort(np.array(self.titles, dtype=object), kind='stable')] = np.arange(len(self.titles))
+        return _Documents(sessions, title_ids, exam_ids, dates, scores, incorrect, ranks)
+
+    def _results(self, results: List[Dict]) -> _Documents:
+        title_ids, exam_ids, dates, scores, incorrect = [], [], [], [], []
+        first_seen: Dict[int, int] = {}
+        for result in results:
+            exam_info = result.get('exam_info', {})
+            title = exam_info.get('title', 'Unknown Exam')
+            title_id = self._title_id(title)
+            first_seen.setdefault(title_id, len(first_seen))
+            title_ids.append(title_id)
+            exam_path = exam_info.get('exam_file_path')
+            exam_ids.append(self._exam_id(None, os.path.basename(exam_path) if exam_path else None, title))
+            dates.append(_parse_timestamp(result.get('session_info', {}).get('completion_date')))
+            performance = result.get('performance', {})
+            scores.append(performance.get('accuracy_percentage', np.nan))
+            incorrect.append(performance.get('incorrect_count', 0) > 0)
+        # Results are grouped under titles in order of their newest result
+        ranks = np.zeros(len(self.titles), dtype=np.int64)
+        for title_id, rank in first_seen.items():
+            ranks[title_id] = rank
+        return _Documents(results, title_ids, exam_ids, dates, scores, incorrect, ranks)
+
+    def _word_masks(self, query: SearchQuery):
+        """Per word: (exam mask, title mask); the last word matches as a prefix."""
+        last = len(query.words) - 1
+        for position, word in enumerate(query.words):
+            prefix = position == last
+            yield self.exam_index.match(word, prefix), self.title_index.match(word, prefix)
+
+    def _filter(self, docs: _Documents, query: SearchQuery, word_masks) -> np.ndarray:
+        mask = np.ones(len(docs.entries), dtype=bool)
+        for exam_mask, title_mask in word_masks:
+            mask &= title_mask[docs.title_ids] | np.append(exam_mask, False)[docs.exam_ids]
+        if query.date_from is not None or query.date_to is not None:
+            low = None if query.date_from is None else (query.date_from, True)
+            high = None if query.date_to is None else (query.date_to, False)
+            mask &= docs.dates.between(low, high)
+        if query.score_min is not None or query.score_max is not None:
+            mask &= docs.scores.between(query.score_min, query.score_max)
+        if query.has_incorrect:
+            mask &= docs.incorrect
+        return docs.group_order[mask[docs.group_order]]
+
+    def search(self, query: SearchQuery, question_type: Optional[str] = None) -> Dict[str, GroupedRows]:
+        """Rows matching a query for each tab.
+
+        Exams match on words only; date, score and incorrect-answer filters apply to
+        sessions and results.
+
+        Args:
+            query: Parsed query
+            question_type: Only list exams with questions of this type
+
+        Returns:
+            Dict[str, GroupedRows]: Rows for 'exams', 'sessions' and 'results'
+        """
+        word_masks = list(self._word_masks(query))
+        exam_mask = np.ones(len(self.exams), dtype=bool)
+        for mask, _ in word_masks:
+            exam_mask &= mask
+        if question_type is not None:
+            exam_mask &= np.fromiter((question_type in types for types in self.exam_types), dtype=bool,
+                                     count=len(self.exams))
+        return {
+            'exams': GroupedRows(self.exams, np.flatnonzero(exam_mask)),
+            'sessions': GroupedRows(self.sessions.entries, self._filter(self.sessions, query, word_masks),
+                                    self.titles, self.sessions.title_ids),
+            'results': GroupedRows(self.results.entries, self._filter(self.results, query, word_masks),
+                                   self.titles, self.results.title_ids)
+        }
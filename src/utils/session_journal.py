@@ -0,0 +1,121 @@
+import json
+import os
+from typing import Dict, List
+
+JOURNAL_EXTENSION = '.jsonl'
+
+
+def journal_path_for(session_filepath: str) -> str:
+    """Return the journal path that belongs to a session file (session_X.json -> session_X.jsonl)."""
+    return os.path.splitext(session_filepath)[0] + JOURNAL_EXTENSION
+
+
+class SessionJournal:
+    """Append-only log of answer events for one session, stored next to its session file.
+
+    The session JSON acts as the snapshot and records the sequence number of the last
+    event it includes ('journal_seq'). Each answer appends one line, so writes cost the
+    same however far into the exam the user is. Compaction writes a new snapshot and
+    then truncates the journal; on resume only the events after 'journal_seq' are replayed.
+    """
+
+    def __init__(self, session_filepath: str, last_seq: int = 0):
+        self.path = journal_path_for(session_filepath)
+        self.seq = last_seq
+        self.pending = 0  # events appended since the last compaction
+        self._file = None
+
+    def append(self, record: Dict) -> int:
+        """Append an answer record and return its sequence number."""
+        if self._file is None:
+            self._drop_torn_tail()
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self.seq += 1
+        self._file.write(json.dumps({'seq': self.seq, **record}, separators=(',', ':')) + '\n')
+        # Flushed to the OS so the event survives the app crashing
+        self._file.flush()
+        self.pending += 1
+        return self.seq
+
+    def _drop_torn_tail(self):
+        """Cut off a partial last line left by a crash mid-write, so new events start on a line of their own."""
+        try:
+            with open(self.path, 'rb+') as f:
+                end = f.seek(0, os.SEEK_END)
+                if end == 0:
+                    return
+                f.seek(end - 1)
+                if f.read(1) == b'\n':
+                    return
+                # Search backwards for the end of the last complete line
+                while end > 0:
+                    start = max(0, end - 4096)
+                    f.seek(start)
+                    newline = f.read(end - start).rfind(b'\n')
+                    if newline != -1:
+                        f.truncate(start + newline + 1)
+                        return
+                    end = start
+                f.truncate(0)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Error repairing session journal {self.path}: {e}")
+
+    def read_tail(self, after_seq: int = 0) -> List[Dict]:
+        """Read the events written after a snapshot's journal_seq.
+
+        A torn final line from a crash mid-write is ignored.
+        """
+        records = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if record.get('seq', 0) > after_seq:
+                        records.append(record)
+        except FileNotFoundError:
+            return records
+        except OSError as e:
+            print(f"Error reading session journal {self.path}: {e}")
+            return records
+
+        if records:
+            self.seq = max(self.seq, records[-1]['seq'])
+        self.pending = len(records)
+        return records
+
+    def compact(self, upto_seq: int):
+        """Drop events up to upto_seq, which a snapshot now on disk includes.
+
+        Events appended while the snapshot was being written are kept.
+        """
+        self.close()
+        try:
+            tail = self.read_tail(upto_seq) if self.seq > upto_seq else []
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for record in tail:
+                    f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error compacting session journal {self.path}: {e}")
+            return
+        self.pending = len(tail)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def delete(self):
+        """Remove the journal file."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
@@ -1,13 +1,77 @@
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from src.utils.results_store import get_results_store, load_result
+from src.utils.session_journal import SessionJournal
+
+# SQLite index with one small summary per session, so listings never parse full session files
+INDEX_FILENAME = "_index.db"
+
+# A persistent rollback journal keeps index writes from adding and removing files in the
+# sessions directory, whose mtime tells us when the index needs reconciling
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    filename TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    summary TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER
+) WITHOUT ROWID;
+"""
+
+# Sessions are saved from a writer thread while the dialog may be listing them
+_index_lock = threading.Lock()
+
+# SQLite connections can't be shared between threads, so each thread keeps its own
+_connections = threading.local()
+
+
+def _connect_index(index_path: str) -> sqlite3.Connection:
+    """This thread's connection to a session index, creating the tables on first use."""
+    connections = getattr(_connections, 'by_path', None)
+    if connections is None:
+        connections = _connections.by_path = {}
+    conn = connections.get(index_path)
+    if conn is None:
+        conn = sqlite3.connect(index_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=PERSIST")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(INDEX_SCHEMA)
+        connections[index_path] = conn
+    return conn
+
+
+def summarize_session(session_data: Dict) -> Dict:
+    """The fields the session list shows, without the wrong-answer and order payloads."""
+    quiz_mode = session_data.get('quiz_mode', {})
+    summary = {
+        'session_date': session_data.get('session_date'),
+        'exam_title': session_data.get('exam_title', 'Unknown Exam'),
+        'exam_ref': session_data.get('exam_ref'),
+        'total_questions': session_data.get('total_questions'),
+        'quiz_mode': {
+            'score': quiz_mode.get('score', 0),
+            'total_answered': quiz_mode.get('total_answered', 0)
+        }
+    }
+    if 'timer_data' in session_data:
+        summary['timer_data'] = session_data['timer_data']
+    return summary
+
 
 class SessionManager:
     """Manages study session data persistence and retrieval."""
     
     def __init__(self, data_dir: str = "data/sessions"):
         self.data_dir = data_dir
+        self.index_path = os.path.join(data_dir, INDEX_FILENAME)
         os.makedirs(data_dir, exist_ok=True)
     
     def save_session(self, session_data: Dict, filepath: Optional[str] = None) -> str:
@@ -23,10 +87,7 @@ class SessionManager:
         """
         # Use provided filepath or generate new one
         if filepath is None:
-            # Generate filename from timestamp for new sessions
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"session_{timestamp}.json"
-            filepath = os.path.join(self.data_dir, filename)
+            filepath = self.new_session_path()
         else:
             # Ensure filepath is in the data directory
             if not os.path.dirname(filepath):
@@ -36,12 +97,23 @@ class SessionManager:
         if "session_date" not in session_data:
             session_data["session_date"] = datetime.now().isoformat()
         
-        # Save to file (will overwrite if exists)
-        with open(filepath, 'w') as f:
-            json.dump(session_data, f, indent=2)
-        
+        # Write to a temp file and swap it in, so a crash mid-save never leaves a truncated session
+        tmp_path = f"{filepath}.tmp"
+        with _index_lock:
+            dir_mtime_before = self._dir_mtime()
+            with open(tmp_path, 'w') as f:
+                json.dump(session_data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+            self._update_index(filepath, session_data, dir_mtime_before)
         return filepath
     
+    def new_session_path(self) -> str:
+        """Generate a timestamp-based filepath for a new session."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join(self.data_dir, f"session_{timestamp}.json")
+    
     def load_session(self, filepath: str) -> Dict:
         """Load a study session from disk.
         
@@ -54,32 +126,128 @@ class SessionManager:
         with open(filepath, 'r') as f:
             return json.load(f)
     
-    def find_study_sessions(self) -> List[Dict]:
-        """Find all available study sessions.
+    def find_study_sessions(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """Find available study sessions, newest first.
+        
+        Reads session summaries from the index rather than the session files. Pass the
+        summary's '_filepath' to load_session() for the full session data.
+        
+        Args:
+            offset: Number of sessions to skip
+            limit: Maximum number of sessions to return (None for all)
+            
+        Returns:
+            List[Dict]: List of session summaries with '_filepath' added
+        """
+        return self.study_session_page(offset, limit)[0]
+    
+    def study_session_page(self, offset: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict], int]:
+        """Like find_study_sessions(), but also return the total number of sessions.
+        
+        Only the requested page of summaries is read from the index.
         
         Returns:
-            List[Dict]: List of session data dictionaries with '_filepath' added
+            Tuple[List[Dict], int]: The page of session summaries and the session count
         """
+        with _index_lock:
+            conn = self._refresh_index()
+            total = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            rows = conn.execute(
+                "SELECT filename, summary FROM sessions ORDER BY filename DESC LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset)
+            ).fetchall()
+        
         sessions = []
+        for filename, summary in rows:
+            session = json.loads(summary)
+            # Add filepath to session data for tracking
+            session['_filepath'] = os.path.join(self.data_dir, filename)
+            sessions.append(session)
+        return sessions, total
+    
+    def count_study_sessions(self) -> int:
+        """Count available study sessions."""
+        with _index_lock:
+            conn = self._refresh_index()
+            return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    
+    def _dir_mtime(self) -> int:
+        return os.stat(self.data_dir).st_mtime_ns
+    
+    def _reconciled_mtime(self, conn: sqlite3.Connection) -> Optional[int]:
+        """The sessions directory mtime the index was last reconciled against."""
+        row = conn.execute("SELECT value FROM meta WHERE key = 'dir_mtime'").fetchone()
+        return row[0] if row else None
+    
+    def _set_reconciled_mtime(self, conn: sqlite3.Connection, mtime: int):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dir_mtime', ?)", (mtime,))
+    
+    def _update_index(self, filepath: str, session_data: Dict, dir_mtime_before: int):
+        """Record a just-saved session's summary in the index.
         
-        # Get all session files
-        session_files = [f for f in os.listdir(self.data_dir) 
-                        if f.startswith("session_") and f.endswith(".json")]
+        Args:
+            dir_mtime_before: The sessions directory mtime from before the save. If the
+                index was in sync then, this save is the only change and it stays in sync.
+        """
+        stat = os.stat(filepath)
+        conn = _connect_index(self.index_path)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (filename, size, mtime, summary) VALUES (?, ?, ?, ?)",
+                (os.path.basename(filepath), stat.st_size, stat.st_mtime_ns,
+                 json.dumps(summarize_session(session_data)))
+            )
+            if os.path.dirname(os.path.abspath(filepath)) == os.path.abspath(self.data_dir) \
+                    and self._reconciled_mtime(conn) == dir_mtime_before:
+                self._set_reconciled_mtime(conn, self._dir_mtime())
+    
+    def _refresh_index(self) -> sqlite3.Connection:
+        """Reconcile the index with the session files on disk, if the directory has changed.
         
-        # Load each session
-        for filename in sorted(session_files, reverse=True):
-            filepath = os.path.join(self.data_dir, filename)
-            try:
-                with open(filepath, 'r') as f:
-                    session_data = json.load(f)
-                    # Add filepath to session data for tracking
-                    session_data['_filepath'] = filepath
-                    sessions.append(session_data)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading session {filename}: {e}")
-                continue
+        Only files that are missing from the index or changed since it was written
+        (e.g. saved by an older version) are parsed. Call with _index_lock held.
         
-        return sessions
+        Returns:
+            sqlite3.Connection: This thread's connection to the reconciled index
+        """
+        conn = _connect_index(self.index_path)
+        reconciled = self._reconciled_mtime(conn)
+        dir_mtime = self._dir_mtime()
+        if dir_mtime == reconciled:
+            return conn
+        
+        indexed = {filename: (size, mtime) for filename, size, mtime
+                   in conn.execute("SELECT filename, size, mtime FROM sessions")}
+        updates = []
+        seen = set()
+        with os.scandir(self.data_dir) as it:
+            for entry in it:
+                if not (entry.name.startswith("session_") and entry.name.endswith(".json")):
+                    continue
+                stat = entry.stat()
+                if indexed.get(entry.name) == (stat.st_size, stat.st_mtime_ns):
+                    seen.add(entry.name)
+                    continue
+                try:
+                    with open(entry.path, 'r') as f:
+                        session_data = json.load(f)
+                except (json.JSONDecodeError, IOError) as e:
+                    print(f"Error loading session {entry.name}: {e}")
+                    continue
+                seen.add(entry.name)
+                updates.append((entry.name, stat.st_size, stat.st_mtime_ns,
+                                json.dumps(summarize_session(session_data))))
+        
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO sessions (filename, size, mtime, summary) VALUES (?, ?, ?, ?)",
+                updates
+            )
+            conn.executemany("DELETE FROM sessions WHERE filename = ?",
+                             [(filename,) for filename in indexed if filename not in seen])
+            # Changes made while scanning bump the mtime again and get picked up next time
+            self._set_reconciled_mtime(conn, dir_mtime)
+        return conn
     
     def clear_all_sessions(self) -> int:
         """Clear all session files.
@@ -93,7 +261,7 @@ class SessionManager:
         session_files = [f for f in os.listdir(self.data_dir) 
                         if f.startswith("session_") and f.endswith(".json")]
         
-        # Delete each session file
+        # Delete each session file and its answer journal
         for filename in session_files:
             filepath = os.path.join(self.data_dir, filename)
             try:
@@ -102,69 +270,45 @@ class SessionManager:
             except OSError as e:
                 print(f"Error deleting session {filename}: {e}")
                 continue
+            SessionJournal(filepath).delete()
+        
+        with _index_lock:
+            conn = _connect_index(self.index_path)
+            with conn:
+                conn.execute("DELETE FROM sessions")
+                self._set_reconciled_mtime(conn, self._dir_mtime())
         
         return deleted_count
     
-    def find_completed_results(self, results_dir: str = "results") -> List[Dict]:
+    def find_completed_results(self, results_dir: Optional[str] = None) -> List[Dict]:
         """Find all completed quiz results from the results directory.
         
         Args:
-            results_dir: Path to the results directory
+            results_dir: Path to the results directory (defaults to the project's results/)
             
         Returns:
             List[Dict]: List of result data dictionaries with incorrect answers
         """
+        # The aggregate store knows which files have incorrect answers without opening the rest
         results = []
-        # Get project root (2 levels up from src/utils/ directory, 3 from file)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(current_dir))
-        results_path = os.path.join(project_root, results_dir)
-        
-        if not os.path.exists(results_path):
-            return results
-        
-        # Get all result JSON files
-        result_files = [f for f in os.listdir(results_path) 
-                        if f.startswith("quiz_results_") and f.endswith(".json")]
-        
-        # Load each result file
-        for filename in sorted(result_files, reverse=True):
-            filepath = os.path.join(results_path, filename)
+        for summary in get_results_store(results_dir).list_results(with_incorrect_only=True):
             try:
-                with open(filepath, 'r') as f:
-                    result_data = json.load(f)
-                    # Only include results with incorrect answers
-                    incorrect_answers = result_data.get('detailed_results', {}).get('incorrect_answers', [])
-                    if incorrect_answers:
-                        results.append(result_data)
+                results.append(load_result(summary['_filepath']))
             except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading result {filename}: {e}")
+                print(f"Error loading result {os.path.basename(summary['_filepath'])}: {e}")
                 continue
         
         return results
     
-    def aggregate_all_incorrect_answers(self, results_dir: str = "results") -> List[Dict]:
+    def aggregate_all_incorrect_answers(self, results_dir: Optional[str] = None) -> List[Dict]:
         """Aggregate all incorrect answers from all completed results.
         
+        Served from the results store's per-question misses, without opening the results files.
+        
         Args:
             results_dir: Path to the results directory
             
         Returns:
-            List[Dict]: Aggregated list of incorrect answers with metadata
+            List[Dict]: Aggregated list of incorrect answers with metadata, newest first
         """
-        all_incorrect = []
-        results = self.find_completed_results(results_dir)
-        
-        for result in results:
-            exam_title = result.get('exam_info', {}).get('title', 'Unknown Exam')
-            completion_date = result.get('session_info', {}).get('completion_date', '')
-            incorrect_answers = result.get('detailed_results', {}).get('incorrect_answers', [])
-            
-            for incorrect in incorrect_answers:
-                # Add metadata about which exam and when
-                incorrect_with_meta = incorrect.copy()
-                incorrect_with_meta['exam_title'] = exam_title
-                incorrect_with_meta['completion_date'] = completion_date
-                all_incorrect.append(incorrect_with_meta)
-        
-        return all_incorrect 
\ No newline at end of file
+        return get_results_store(results_dir).incorrect_answers() 
\ No newline at end of file
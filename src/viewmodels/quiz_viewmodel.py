@@ -1,11 +1,20 @@
-from typing import Optional, List, Dict, Set
-from PyQt6.QtWidgets import QMessageBox
+from typing import Optional, List, Dict
 from PyQt6.QtCore import QObject, pyqtSignal
+from src.models.quiz_engine import COMPLETE, MOVED
 from src.models.quiz_state import QuizState
+from src.utils.exam_repository import ExamRepository, get_exam_repository
+from src.utils.item_analysis import (difficulty_balanced_order, hard_questions, is_stale,
+                                     item_analysis_running, load_item_analysis, refresh_item_analysis)
+from src.utils.outcome_store import OutcomeRecorder, OutcomeStore, get_outcome_store
+from src.utils.review_scheduler import ReviewRecorder, ReviewScheduler, get_review_scheduler
 
 
 class QuizViewModel(QObject):
-    """Main ViewModel for quiz logic, question navigation, and answer validation."""
+    """Main ViewModel for quiz logic, question navigation, and answer validation.
+    
+    Grading and navigation happen in the headless QuizEngine behind quiz_state;
+    this class turns the engine's results into signals for the views.
+    """
     
     # Signals for UI updates
     question_changed = pyqtSignal(dict, int, int)  # question, current_index, total
@@ -19,367 +28,186 @@ class QuizViewModel(QObject):
     study_mode_entered = pyqtSignal(dict)  # filtered_exam_data
     quiz_complete = pyqtSignal(dict)  # results dict
     
-    def __init__(self, quiz_state: QuizState):
+    def __init__(self, quiz_state: QuizState, repository: Optional[ExamRepository] = None,
+                 outcome_store: Optional[OutcomeStore] = None, scheduler: Optional[ReviewScheduler] = None):
         super().__init__()
         self.quiz_state = quiz_state
-        self.current_question_type = "singleChoice"
-        self.selected_options: List[str] = []
+        self.engine = quiz_state.engine
+        self.repository = repository
+        
+        # Every graded answer also goes to the columnar outcome store
+        self.outcome_recorder = OutcomeRecorder(outcome_store or get_outcome_store(), quiz_state)
+        self.engine.answer_listeners.append(self.outcome_recorder.on_answer)
+        
+        # ...and reschedules the question for spaced review
+        self.review_recorder = ReviewRecorder(scheduler or get_review_scheduler(), quiz_state)
+        self.engine.answer_listeners.append(self.review_recorder.on_answer)
+        
+        # Set when a question set needed an item analysis that is still being computed
+        self.analysis_pending = False
+    
+    @property
+    def selected_options(self) -> List[str]:
+        return self.engine.selected_options
+    
+    @selected_options.setter
+    def selected_options(self, value: List[str]):
+        self.engine.selected_options = value
         
     def get_current_question(self) -> Optional[Dict]:
         """Get current question data."""
-        return self.quiz_state.get_current_question()
+        return self.engine.get_current_question()
     
     def select_option(self, option_index: int, is_checked: bool):
         """Handle option selection."""
-        option_key = chr(ord('A') + option_index)
-        
-        if self.current_question_type == "multiChoice":
-            if is_checked:
-                if option_key not in self.selected_options:
-                    self.selected_options.append(option_key)
-            else:
-                if option_key in self.selected_options:
-                    self.selected_options.remove(option_key)
-            
-            if self.selected_options:
-                selected_text = ", ".join(sorted(self.selected_options))
-                self.option_selected.emit(f"Selected: Options {selected_text}", True)
-            else:
-                self.option_selected.emit("No options selected", True)
-        else:
-            self.selected_options = [option_key] if is_checked else []
-            if is_checked:
-                self.option_selected.emit(f"Selected: Option {option_key}", False)
+        selection = self.engine.select(option_index, is_checked)
+        if selection is not None:
+            self.option_selected.emit(*selection)
     
     def validate_answer(self) -> bool:
         """Validate the selected answer and update state. Returns True if answer was validated."""
-        if not self.selected_options:
-            return False
-        
-        question = self.get_current_question()
-        if not question:
+        outcome = self.engine.validate()
+        if outcome is None:
             return False
         
-        correct = question['answer']
-        question_type = question.get('type', 'singleChoice')
-        
-        # Check if answer is correct
-        if question_type == "multiChoice":
-            correct_set = set(correct) if isinstance(correct, list) else {correct}
-            selected_set = set(self.selected_options)
-            is_correct = correct_set == selected_set
-        else:
-            is_correct = self.selected_options[0] == correct if self.selected_options else False
-        
-        # Update state - don't reveal answer if show_answer_at_end is enabled
-        if not self.quiz_state.show_answer_at_end:
-            self.quiz_state.answer_revealed = True
-        
-        # Prepare answer text for storage
-        if question_type == "multiChoice":
-            your_texts = [question['options'][opt] for opt in self.selected_options]
-            correct_list = correct if isinstance(correct, list) else [correct]
-            correct_texts = [question['options'][opt] for opt in correct_list]
-            your_answer_value = "; ".join(your_texts)
-            correct_answer_value = "; ".join(correct_texts)
-        else:
-            your_answer_value = question['options'].get(self.selected_options[0], "")
-            correct_answer_value = question['options'].get(correct, "")
-        
-        if is_correct:
-            self.quiz_state.score += 1
-            if question_type == "multiChoice":
-                feedback = f"✓ Correct! Your answers {', '.join(self.selected_options)} were right."
-            else:
-                feedback = f"✓ Correct! Your answer {self.selected_options[0]} was right."
-            style_class = "correct"
-        else:
-            # Store wrong answer
-            wrong_answer = {
-                'question_id': question.get('id'),
-                'question': question['question'],
-                'your_answer': your_answer_value,
-                'correct_answer': correct_answer_value
-            }
-            
-            # Update wrong_answers list
-            wrong_answers = list(self.quiz_state.wrong_answers)
-            wrong_answers.append(wrong_answer)
-            self.quiz_state.wrong_answers = wrong_answers
-            
-            # Create feedback text
-            if question_type == "multiChoice":
-                selected_text = ", ".join(self.selected_options)
-                correct_text = ", ".join(correct) if isinstance(correct, list) else correct
-                correct_options_text = "\n".join([f"{opt}. {question['options'][opt]}" for opt in correct])
-                feedback = (f"✗ Incorrect. You selected {selected_text}, but the correct answers are {correct_text}.\n\n"
-                           f"Correct Answers:\n{correct_options_text}")
-            else:
-                correct_text = question['options'][correct]
-                feedback = (f"✗ Incorrect. You selected {self.selected_options[0]}, but the correct answer is {correct}.\n\n"
-                           f"Correct Answer: {correct}. {correct_text}")
-            
-            style_class = "incorrect"
-        
-        # Mark question as answered
-        answered = set(self.quiz_state.answered_questions)
-        answered.add(self.quiz_state.current_index)
-        self.quiz_state.answered_questions = answered
-        
-        # Only emit answer validation if we're revealing the answer
-        if not self.quiz_state.show_answer_at_end:
-            self.answer_validated.emit(is_correct, feedback, style_class)
-        else:
-            # In show_answer_at_end mode, mark as "answered" to allow navigation
-            # but don't show feedback
-            self.quiz_state.answer_revealed = True
+        # Feedback is held back until the end when show_answer_at_end is enabled
+        if outcome['revealed']:
+            self.answer_validated.emit(outcome['is_correct'], outcome['feedback'], outcome['style_class'])
         
         self.update_status()
         return True
     
     def next_question(self) -> bool:
         """Move to next question. Returns True if moved, False if quiz complete or validation needed."""
-        if self.quiz_state.review_mode:
-            return self._next_review_question()
-        
-        # In practice mode, allow free navigation without validation
-        if self.quiz_state.practice_mode:
-            if self.quiz_state.current_index + 1 >= self.quiz_state.get_total_questions():
-                # Reached end - don't complete quiz in practice mode
-                return False
-            
-            self.quiz_state.current_index += 1
-            self._reset_question_state()
+        result = self.engine.next()
+        if result == MOVED:
             self._display_current_question()
             return True
-        
-        # Normal mode: require validation
-        # Check if answer needs to be revealed first
-        if not self.quiz_state.answer_revealed:
-            return False
-        
-        # Check if answer was selected
-        if not self.selected_options:
-            return False
-        
-        # Move to next question
-        if self.quiz_state.current_index + 1 >= self.quiz_state.get_total_questions():
-            # Quiz complete
+        if result == COMPLETE:
             self._complete_quiz()
             return True
-        
-        self.quiz_state.current_index += 1
-        self._reset_question_state()
-        self._display_current_question()
-        return True
+        return False
     
     def previous_question(self):
         """Move to previous question."""
-        if self.quiz_state.practice_mode:
-            # In practice mode, allow navigation without validation
-            if self.quiz_state.current_index > 0:
-                self.quiz_state.current_index -= 1
-                self._reset_question_state()
-                self._display_current_question()
-        else:
-            # Normal mode: require validation
-            if self.quiz_state.current_index > 0:
-                self.quiz_state.current_index -= 1
-                self._reset_question_state()
-                self._display_current_question()
+        if self.engine.prev():
+            self._display_current_question()
     
     def jump_to_question(self, index: int):
         """Jump to a specific question (practice mode only)."""
-        if not self.quiz_state.practice_mode:
-            return False
-        
-        if 0 <= index < self.quiz_state.get_total_questions():
-            self.quiz_state.current_index = index
-            self._reset_question_state()
+        if self.engine.jump(index):
             self._display_current_question()
             return True
         return False
     
-    def _next_review_question(self) -> bool:
-        """Handle next question in review mode."""
-        if self.quiz_state.current_index + 1 >= len(self.quiz_state.review_questions):
-            # Reached end of review
-            return False
-        
-        self.quiz_state.current_index += 1
-        self._display_current_question()
-        return True
-    
     def _complete_quiz(self):
         """Handle quiz completion."""
+        results = self.engine.complete()
         # Don't complete quiz in practice mode
-        if self.quiz_state.practice_mode:
+        if results is None:
             return
         
-        # If show_answer_at_end is enabled, reveal all answers before completing
         if self.quiz_state.show_answer_at_end:
-            self._reveal_all_answers()
-        
-        results = {
-            'score': self.quiz_state.score,
-            'total_answered': len(self.quiz_state.answered_questions),
-            'wrong_answers': self.quiz_state.wrong_answers
-        }
+            # Every answer is now shown in review mode
+            self._display_current_question()
         self.quiz_complete.emit(results)
     
     def _reveal_all_answers(self):
         """Reveal all answers for all questions in the quiz."""
-        # This will be called to show all answers at the end
-        # We'll enter a review mode showing all questions with answers
-        all_questions = []
-        
-        for i, question in enumerate(self.quiz_state.exam_data['questions']):
-            question_copy = question.copy()
-            
-            # Find user's answer and whether it was correct
-            question_id = question.get('id')
-            correct = question['answer']
-            question_type = question.get('type', 'singleChoice')
-            
-            # Check if this question was answered
-            if i not in self.quiz_state.answered_questions:
-                continue
-            
-            # Try to find user's selected answer from wrong_answers
-            your_answer = None
-            correct_answer_text = None
-            is_correct = False
-            
-            # Check if this question was answered incorrectly
-            wrong_answer_info = None
-            for wrong in self.quiz_state.wrong_answers:
-                if wrong.get('question_id') == question_id or wrong.get('question') == question['question']:
-                    wrong_answer_info = wrong
-                    your_answer = wrong.get('your_answer', 'Not answered')
-                    correct_answer_text = wrong.get('correct_answer', '')
-                    is_correct = False
-                    break
-            
-            # If not in wrong answers, it was correct - user selected the correct answer
-            if wrong_answer_info is None:
-                # Find correct answer text
-                if question_type == "multiChoice":
-                    correct_list = correct if isinstance(correct, list) else [correct]
-                    correct_answer_text = "; ".join([question['options'].get(opt, opt) for opt in correct_list])
-                    your_answer = correct_answer_text
-                else:
-                    correct_answer_text = question['options'].get(correct, correct)
-                    your_answer = correct_answer_text
-                is_correct = True
-            
-            # Store answer info for review
-            question_copy['answer_info'] = {
-                'your_answer': your_answer,
-                'correct_answer': correct_answer_text,
-                'is_correct': is_correct
-            }
-            all_questions.append(question_copy)
-        
-        # Enter review mode with all questions
-        self.quiz_state.review_questions = all_questions
-        self.quiz_state.review_mode = True
-        self.quiz_state.current_index = 0
-        self.quiz_state.exam_data = {
-            'title': f"{self.quiz_state.original_exam_data['title']} - All Answers",
-            'questions': all_questions
-        }
-        
-        # Display the first question
+        self.engine.reveal_all()
         self._display_current_question()
     
     def enter_review_mode(self) -> bool:
         """Enter review mode for incorrect answers. Returns True if entered successfully."""
-        if not self.quiz_state.wrong_answers:
-            return False
-        
-        # Map wrong answers back to full question data
-        review_questions = []
-        for wrong_answer in self.quiz_state.wrong_answers:
-            question_id = wrong_answer.get('question_id')
-            if question_id is not None:
-                for q in self.quiz_state.original_exam_data['questions']:
-                    if q.get('id') == question_id:
-                        review_q = q.copy()
-                        review_q['wrong_answer_info'] = wrong_answer
-                        review_questions.append(review_q)
-                        break
-            else:
-                # Fallback: find by question text
-                question_text = wrong_answer['question'].strip()
-                for q in self.quiz_state.original_exam_data['questions']:
-                    if q['question'].strip() == question_text:
-                        review_q = q.copy()
-                        review_q['wrong_answer_info'] = wrong_answer
-                        review_questions.append(review_q)
-                        break
-        
-        if not review_questions:
+        if not self.engine.enter_review():
             return False
         
-        # Switch to review mode
-        self.quiz_state.review_questions = review_questions
-        self.quiz_state.review_mode = True
-        self.quiz_state.current_index = 0
-        
-        # Update exam data for review mode
-        self.quiz_state.exam_data = {
-            'title': f"{self.quiz_state.original_exam_data['title']} - Review Mode",
-            'questions': review_questions
-        }
-        
         self.review_mode_entered.emit()
         self._display_current_question()
         return True
     
     def study_wrong_questions(self) -> bool:
         """Filter exam to only include wrong answer questions for study. Returns True if successful."""
-        if not self.quiz_state.review_questions:
+        if not self.engine.study_wrong():
+            return False
+        self._on_study_started()
+        return True
+    
+    def study_matching_questions(self, keyword: str) -> bool:
+        """Filter exam to questions whose text or options match keyword. Returns True if any matched."""
+        content_hash = (self.quiz_state.exam_ref or {}).get('content_hash')
+        if not keyword or content_hash is None:
             return False
         
-        # Get incorrect IDs
-        incorrect_ids = {q.get('wrong_answer_info', {}).get('question_id') 
-                        for q in self.quiz_state.review_questions}
-        incorrect_ids = {id for id in incorrect_ids if id is not None}
-        
-        # Filter questions by ID
-        filtered_questions = []
-        for q in self.quiz_state.original_exam_data['questions']:
-            if q.get('id') in incorrect_ids:
-                filtered_questions.append(q.copy())
-        
-        # Fallback if no IDs
-        if not filtered_questions:
-            for review_q in self.quiz_state.review_questions:
-                question_text = review_q.get('question', '').strip()
-                for orig_q in self.quiz_state.original_exam_data['questions']:
-                    if orig_q.get('question', '').strip() == question_text:
-                        filtered_questions.append(orig_q.copy())
-                        break
-        
-        filtered_exam = {
-            'title': f"{self.quiz_state.original_exam_data['title']} - Study Wrong Answers",
-            'questions': filtered_questions
-        }
-        
-        # Reset state for new quiz
-        self.quiz_state.exam_data = filtered_exam
-        self.quiz_state.review_mode = False
-        self.quiz_state.current_index = 0
-        self.quiz_state.score = 0
-        self.quiz_state.answered_questions = set()
-        self.quiz_state.wrong_answers = []
-        self.quiz_state.answer_revealed = False
-        self._reset_question_state()
-        
-        self.study_mode_entered.emit(filtered_exam)
-        self._display_current_question()
+        bank = self.quiz_state.bank
+        repository = self.repository or get_exam_repository()
+        matches = repository.search_questions(keyword, content_hash, limit=len(bank))
+        positions = sorted({match['position'] for match in matches if match['position'] < len(bank)})
+        if not self.engine.study(positions, f"Matching \"{keyword}\""):
+            return False
+        self._on_study_started()
+        return True
+    
+    def study_due_questions(self) -> bool:
+        """Filter exam to questions due for spaced review by the end of today. Returns True if any are due."""
+        due_cards = self.review_recorder.scheduler.due(self.review_recorder.exam_key)
+        positions = set()
+        for card in due_cards:
+            if card['question_id'] is not None:
+                index = self.quiz_state.find_question_index(question_id=card['question_id'])
+            else:
+                index = self.quiz_state.find_question_index(question_text=card['question'])
+            if index is not None:
+                positions.add(index)
+        if not self.engine.study(sorted(positions), "Due Today"):
+            return False
+        self._on_study_started()
         return True
     
+    def _item_analysis(self) -> Optional[Dict]:
+        """This exam's item analysis.
+        
+        An out of date analysis is used as is while the batch job reruns in the
+        background. When the exam has never been analyzed the job is started in the
+        background, None is returned and analysis_pending is set.
+        """
+        self.analysis_pending = False
+        exam_file_path = self.quiz_state.exam_file_path
+        if not exam_file_path:
+            return None
+        content_hash = (self.quiz_state.exam_ref or {}).get('content_hash')
+        analysis = load_item_analysis(exam_file_path, content_hash)
+        if analysis is None:
+            refresh_item_analysis(exam_files=[exam_file_path])
+            self.analysis_pending = item_analysis_running()
+        elif is_stale(analysis):
+            refresh_item_analysis()
+        return analysis
+    
+    def study_hard_questions(self) -> bool:
+        """Filter exam to questions most people get wrong. Returns True if there are any."""
+        analysis = self._item_analysis()
+        if analysis is None:
+            return False
+        if not self.engine.study(hard_questions(analysis), "Hard Questions"):
+            return False
+        self._on_study_started()
+        return True
+    
+    def study_difficulty_balanced(self) -> bool:
+        """Reorder the exam so hard, medium and easy questions alternate. Returns True if successful."""
+        analysis = self._item_analysis()
+        if analysis is None or not analysis['responses'] or len(analysis['questions']) != len(self.quiz_state.bank):
+            return False
+        if not self.engine.study(difficulty_balanced_order(analysis), "Difficulty Balanced"):
+            return False
+        self._on_study_started()
+        return True
+    
+    def _on_study_started(self):
+        self.study_mode_entered.emit(self.quiz_state.exam_data)
+        self._display_current_question()
+    
     def _display_current_question(self):
         """Display the current question."""
         question = self.get_current_question()
@@ -389,9 +217,6 @@ class QuizViewModel(QObject):
         total = self.quiz_state.get_total_questions()
         current = self.quiz_state.current_index
         
-        # Update question type
-        self.current_question_type = question.get('type', 'singleChoice')
-        
         # Update navigation state
         can_prev = current > 0
         can_next = current < total - 1
@@ -413,11 +238,6 @@ class QuizViewModel(QObject):
             self.question_changed.emit(question, current, total)
             self._reset_selection()
     
-    def _reset_question_state(self):
-        """Reset state for a new question."""
-        self.selected_options = []
-        self.quiz_state.answer_revealed = False
-    
     def _reset_selection(self):
         """Reset selection indicator."""
         self.selected_options = []
@@ -425,12 +245,5 @@ class QuizViewModel(QObject):
     
     def update_status(self):
         """Update status bar text."""
-        if self.quiz_state.review_mode:
-            status = f"Review Mode: {self.quiz_state.current_index + 1}/{len(self.quiz_state.review_questions)}"
-        else:
-            if self.quiz_state.answered_questions:
-                status = f"Score: {self.quiz_state.score}/{len(self.quiz_state.answered_questions)}"
-            else:
-                status = "Not started"
-        self.status_text_changed.emit(status)
+        self.status_text_changed.emit(self.engine.status_text())
 
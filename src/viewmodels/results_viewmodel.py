@@ -4,44 +4,62 @@ from datetime import datetime
 from typing import Dict, Optional
 from PyQt6.QtCore import QObject, pyqtSignal
 from src.models.quiz_state import QuizState
+from src.utils.item_analysis import refresh_item_analysis
+from src.utils.outcome_store import OutcomeRecorder
+from src.utils.paths import PROJECT_ROOT, RESULTS_DIR
+from src.utils.results_store import build_results_data, get_results_store
 from src.viewmodels.timer_viewmodel import TimerViewModel
 
-
 class ResultsViewModel(QObject):
     """ViewModel for quiz results and file saving."""
     
     results_ready = pyqtSignal(dict)  # Emits results data dict
     
-    def __init__(self, quiz_state: QuizState, timer_viewmodel: TimerViewModel):
+    def __init__(self, quiz_state: QuizState, timer_viewmodel: TimerViewModel,
+                 outcome_recorder: Optional[OutcomeRecorder] = None):
         super().__init__()
         self.quiz_state = quiz_state
         self.timer_viewmodel = timer_viewmodel
+        self.outcome_recorder = outcome_recorder
     
     def calculate_results(self) -> Dict:
         """Calculate and return results data."""
         total_time = self.timer_viewmodel.get_total_elapsed_time()
-        total_questions = len(self.quiz_state.exam_data['questions'])
-        answered_questions = len(self.quiz_state.answered_questions)
-        accuracy = (self.quiz_state.score / answered_questions * 100) if answered_questions > 0 else 0
-        completion_rate = (answered_questions / total_questions * 100) if total_questions > 0 else 0
+        results = self.quiz_state.engine.results()
+        results['time_taken'] = self.timer_viewmodel.format_time(total_time)
+        results['time_taken_seconds'] = int(total_time.total_seconds())
+        results.update(self._timing_stats())
+        return results
+    
+    def _timing_stats(self, limit: int = 5) -> Dict:
+        """Per-answer timing for this run, from the outcome store."""
+        recorder = self.outcome_recorder
+        if recorder is None or recorder.attempt is None:
+            return {'average_answer_seconds': 0.0, 'slowest_questions': []}
+        summary = recorder.store.attempt_summary(recorder.attempt)
+        slowest = recorder.store.slowest_questions(attempt=recorder.attempt, limit=limit)
         
+        bank = self.quiz_state.bank
+        slowest_questions = []
+        for question, seconds in zip(slowest['question'].tolist(), slowest['mean_seconds'].tolist()):
+            # Negative values are bank indexes of questions without an id
+            index = -question - 1 if question < 0 else self.quiz_state.find_question_index(question_id=question)
+            text = bank[index]['question'] if index is not None and 0 <= index < len(bank) else ''
+            slowest_questions.append({
+                'question_id': question if question >= 0 else None,
+                'question': text,
+                'seconds': round(seconds, 1)
+            })
         return {
-            'score': self.quiz_state.score,
-            'total_answered': answered_questions,
-            'total_questions': total_questions,
-            'accuracy': accuracy,
-            'completion_rate': completion_rate,
-            'time_taken': self.timer_viewmodel.format_time(total_time),
-            'time_taken_seconds': int(total_time.total_seconds()),
-            'wrong_answers_count': len(self.quiz_state.wrong_answers),
-            'wrong_answers': self.quiz_state.wrong_answers
+            'average_answer_seconds': round(summary['mean_seconds'], 1),
+            'slowest_questions': slowest_questions
         }
     
     def save_results_to_file(self):
         """Save detailed quiz results to a file."""
         try:
             # Create results directory if it doesn't exist
-            results_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'results')
+            results_dir = RESULTS_DIR
             os.makedirs(results_dir, exist_ok=True)
             
             # Generate filename with timestamp
@@ -52,46 +70,26 @@ class ResultsViewModel(QObject):
             # Calculate statistics
             results = self.calculate_results()
             
-            # Get incorrect question IDs
-            incorrect_question_ids = [wa.get('question_id') for wa in self.quiz_state.wrong_answers 
-                                    if wa.get('question_id') is not None]
-            
             # Get exam file path (relative to project root if absolute)
             exam_file_path = self.quiz_state.exam_file_path
             if exam_file_path and os.path.isabs(exam_file_path):
-                project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
                 try:
-                    exam_file_path = os.path.relpath(exam_file_path, project_root)
+                    exam_file_path = os.path.relpath(exam_file_path, PROJECT_ROOT)
                 except:
                     pass
             
             # Prepare comprehensive results data
-            results_data = {
-                "exam_info": {
-                    "title": self.quiz_state.exam_data['title'],
-                    "total_questions": results['total_questions'],
-                    "shuffle_enabled": self.quiz_state.shuffle_enabled,
-                    "exam_file_path": exam_file_path
-                },
-                "session_info": {
-                    "completion_date": datetime.now().isoformat(),
-                    "time_taken": results['time_taken'],
-                    "time_taken_seconds": results['time_taken_seconds']
-                },
-                "performance": {
-                    "score": results['score'],
-                    "total_answered": results['total_answered'],
-                    "accuracy_percentage": round(results['accuracy'], 2),
-                    "completion_percentage": round(results['completion_rate'], 2),
-                    "incorrect_count": results['wrong_answers_count']
-                },
-                "detailed_results": {
-                    "correct_answers": results['score'],
-                    "incorrect_answers": results['wrong_answers'],
-                    "questions_answered": list(self.quiz_state.answered_questions),
-                    "incorrect_question_ids": incorrect_question_ids
-                }
-            }
+            quiz_view = self.quiz_state.engine.quiz_view
+            results_data = build_results_data(
+                results,
+                title=self.quiz_state.exam_data['title'],
+                exam_file_path=exam_file_path,
+                shuffle_enabled=self.quiz_state.shuffle_enabled,
+                questions_answered=list(self.quiz_state.answered_questions),
+                answered_question_indices=sorted(quiz_view.bank_index(position)
+                                                 for position in self.quiz_state.answered_questions),
+                completion_date=datetime.now().isoformat()
+            )
             
             # Save to JSON file
             with open(filepath, 'w') as f:
@@ -99,6 +97,18 @@ class ResultsViewModel(QObject):
             
             print(f"Quiz results saved to: {filepath}")
             
+            if self.outcome_recorder is not None:
+                self.outcome_recorder.store.flush()
+            
+            # Fold the new result into the review-tab aggregate
+            try:
+                get_results_store().record_result(filepath, results_data)
+            except (OSError, ValueError) as e:
+                print(f"Error updating results store: {e}")
+            
+            # Fold it into the question difficulty estimates too
+            refresh_item_analysis()
+            
             # Also create a human-readable text summary
             text_filename = f"quiz_summary_{timestamp}.txt"
             text_filepath = os.path.join(results_dir, text_filename)
@@ -1,13 +1,52 @@
 import sys
 import signal
 import atexit
-from datetime import datetime
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from datetime import datetime, timedelta
+from typing import Dict
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
 from src.models.quiz_state import QuizState
+from src.utils.session_journal import SessionJournal
+from src.utils.session_manager import SessionManager
+
+# Compact the answer journal into the session file after this many events
+COMPACT_EVERY = 200
+
+# Write a snapshot this long after the last change the answer journal doesn't capture
+SAVE_DEBOUNCE_MS = 3000
+
+
+class _SaveSignals(QObject):
+    finished = pyqtSignal(str, int, bool)  # filepath, journal_seq, success
+
+
+class _SessionWriter(QRunnable):
+    """Serializes and writes one session snapshot off the GUI thread."""
+    
+    def __init__(self, session_manager: SessionManager, session_data: Dict, filepath: str):
+        super().__init__()
+        self.session_manager = session_manager
+        self.session_data = session_data
+        self.filepath = filepath
+        self.signals = _SaveSignals()
+    
+    def run(self):
+        try:
+            self.session_manager.save_session(self.session_data, self.filepath)
+            success = True
+        except Exception as e:
+            print(f"Error saving session: {e}")
+            success = False
+        self.signals.finished.emit(self.filepath, self.session_data['journal_seq'], success)
 
 
 class SessionViewModel(QObject):
-    """ViewModel for session management and auto-save."""
+    """ViewModel for session management and auto-save.
+    
+    Answers go to an append-only journal. Full snapshots are written after changes
+    the journal can't replay (debounced), every COMPACT_EVERY answers and by a
+    periodic safety net when anything changed, and are serialized on a worker
+    thread. Saves on exit, quit and completion are written synchronously.
+    """
     
     session_saved = pyqtSignal(bool)  # Emits True if saved successfully
     emergency_save_completed = pyqtSignal()
@@ -16,13 +55,42 @@ class SessionViewModel(QObject):
         super().__init__()
         self.quiz_state = quiz_state
         self.timer_viewmodel = timer_viewmodel
+        self.session_manager = SessionManager()
         self.auto_save_timer = QTimer()
         self.auto_save_timer.timeout.connect(self.auto_save_session)
         
+        # Debounced save after moves the journal can't replay; answers only go to the journal
+        self.debounce_timer = QTimer()
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(SAVE_DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.auto_save_session)
+        self.quiz_state.current_index_changed.connect(self._on_index_changed)
+        # Where the Next after the last answer lands. Journal replay restores that move (a snapshot
+        # taken before it resumes on the answered question), so it doesn't need a snapshot
+        self._next_after_answer = None
+        
+        # One writer thread keeps snapshots in order
+        self.write_pool = QThreadPool()
+        self.write_pool.setMaxThreadCount(1)
+        self._writers = set()
+        self._saved_revision = self.quiz_state.revision
+        
+        # Answers are appended to a journal between full session saves
+        self.journal = None
+        self._snapshot_view = None
+        if self.quiz_state.session_filepath:
+            last_seq = (self.quiz_state.session_data or {}).get('journal_seq', 0)
+            self.journal = SessionJournal(self.quiz_state.session_filepath, last_seq)
+            records = self.journal.read_tail(last_seq)
+            if records:
+                self.quiz_state.engine.replay(records)
+            self._snapshot_view = self.quiz_state.engine.quiz_view
+        self.quiz_state.engine.answer_listeners.append(self._on_answer_recorded)
+    
     def setup_crash_protection(self):
         """Set up crash detection and auto-save mechanisms"""
-        # Set up periodic auto-save
-        self.auto_save_timer.start(30000)  # Auto-save every 30 seconds
+        # Safety net for changes the debounce missed; skipped when nothing changed
+        self.auto_save_timer.start(30000)
         
         # Set up signal handlers for crash detection
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -31,6 +99,13 @@ class SessionViewModel(QObject):
         # Register cleanup function for normal exit
         atexit.register(self.cleanup_on_exit)
     
+    def release_crash_protection(self):
+        """Stop auto-saving once the quiz has ended, letting pending writes land"""
+        self.auto_save_timer.stop()
+        self.debounce_timer.stop()
+        self.write_pool.waitForDone()
+        atexit.unregister(self.cleanup_on_exit)
+    
     def signal_handler(self, signum, frame):
         """Handle system signals (SIGINT, SIGTERM)"""
         print(f"Received signal {signum}, saving session...")
@@ -44,10 +119,36 @@ class SessionViewModel(QObject):
         except:
             pass  # Ignore errors during cleanup
     
+    def is_dirty(self) -> bool:
+        """Whether the state has changed since the last snapshot."""
+        return self.quiz_state.revision != self._saved_revision
+    
+    def _on_answer_recorded(self, record: dict):
+        """Journal an answer, writing a full snapshot first if the journal can't be replayed onto the last one."""
+        view = self.quiz_state.engine.quiz_view
+        self._next_after_answer = min(record['pos'] + 1, len(view) - 1)
+        try:
+            if self.journal is None or view is not self._snapshot_view:
+                # New session or a new question view: the snapshot already includes this answer
+                self.save_session_data(background=True)
+                return
+            self.journal.append(record)
+            if self.journal.pending >= COMPACT_EVERY:
+                self.save_session_data(auto_save=True, background=True)
+        except Exception as e:
+            print(f"Error journaling answer: {e}")
+    
+    def _on_index_changed(self, index: int):
+        """Debounce a snapshot unless the move is the Next after an answer."""
+        if self.quiz_state.review_mode or index != self._next_after_answer:
+            self.debounce_timer.start()
+    
     def auto_save_session(self):
-        """Auto-save session data periodically"""
+        """Auto-save session data if anything changed since the last save"""
+        if not self.is_dirty():
+            return
         try:
-            self.save_session_data(auto_save=True)
+            self.save_session_data(auto_save=True, background=True)
         except Exception as e:
             print(f"Auto-save error: {e}")
     
@@ -71,65 +172,95 @@ class SessionViewModel(QObject):
         except Exception as e:
             print(f"Emergency save failed: {e}")
     
-    def save_session_data(self, auto_save=False, emergency=False, completed=False, quit_by_user=False):
-        """Save current session data including timer"""
+    def build_session_data(self, auto_save=False, emergency=False, completed=False, quit_by_user=False) -> Dict:
+        """Build the session snapshot payload from the current state."""
+        # Preserve original session date if available, otherwise use current time
+        if self.quiz_state.original_session_date:
+            session_date = self.quiz_state.original_session_date
+        else:
+            session_date = datetime.now().isoformat()
+            self.quiz_state.original_session_date = session_date
+        
+        # Get elapsed time safely
         try:
-            from src.utils.session_manager import SessionManager
-            from datetime import timedelta
-            
-            # Preserve original session date if available, otherwise use current time
-            if self.quiz_state.original_session_date:
-                session_date = self.quiz_state.original_session_date
+            if self.timer_viewmodel is not None:
+                total_elapsed = self.timer_viewmodel.get_total_elapsed_time()
             else:
-                session_date = datetime.now().isoformat()
-                self.quiz_state.original_session_date = session_date
-            
-            # Get elapsed time safely
-            try:
-                if self.timer_viewmodel is not None:
-                    total_elapsed = self.timer_viewmodel.get_total_elapsed_time()
-                else:
-                    total_elapsed = timedelta(0)
-            except:
                 total_elapsed = timedelta(0)
-            
-            session_data = {
-                'session_date': session_date,
-                'exam_title': self.quiz_state.exam_data['title'],
-                'total_questions': len(self.quiz_state.exam_data['questions']),
-                'quiz_mode': {
-                    'score': self.quiz_state.score,
-                    'total_answered': len(self.quiz_state.answered_questions),
-                    'wrong_answers': self.quiz_state.wrong_answers
-                },
-                'timer_data': {
-                    'elapsed_seconds': int(total_elapsed.total_seconds()),
-                    'completed': completed,
-                    'auto_saved': auto_save,
-                    'emergency_saved': emergency,
-                    'quit_by_user': quit_by_user
-                }
+        except:
+            total_elapsed = timedelta(0)
+        
+        return {
+            'session_date': session_date,
+            'exam_title': self.quiz_state.exam_data['title'],
+            'exam_ref': self.quiz_state.exam_ref,
+            'total_questions': len(self.quiz_state.exam_data['questions']),
+            'quiz_mode': self.quiz_state.engine.progress_snapshot(),
+            'journal_seq': self.journal.seq if self.journal is not None else 0,
+            'timer_data': {
+                'elapsed_seconds': int(total_elapsed.total_seconds()),
+                'completed': completed,
+                'auto_saved': auto_save,
+                'emergency_saved': emergency,
+                'quit_by_user': quit_by_user
             }
+        }
+    
+    def save_session_data(self, auto_save=False, emergency=False, completed=False, quit_by_user=False, background=False):
+        """Save current session data including timer.
+        
+        Args:
+            background: Serialize and write on the writer thread instead of blocking the caller
+        """
+        try:
+            session_data = self.build_session_data(auto_save, emergency, completed, quit_by_user)
             
-            # Save session
-            session_manager = SessionManager()
-            saved_filepath = session_manager.save_session(session_data, self.quiz_state.session_filepath)
+            # Claim the filepath now so journaled answers have a home before the first write lands
+            if self.quiz_state.session_filepath is None:
+                self.quiz_state.session_filepath = self.session_manager.new_session_path()
+            filepath = self.quiz_state.session_filepath
+            if self.journal is None:
+                self.journal = SessionJournal(filepath, session_data['journal_seq'])
+            self._snapshot_view = self.quiz_state.engine.quiz_view
+            self._saved_revision = self.quiz_state.revision
+            self.debounce_timer.stop()
             
-            # Store filepath for future saves
-            self.quiz_state.session_filepath = saved_filepath
+            if background:
+                writer = _SessionWriter(self.session_manager, session_data, filepath)
+                writer.setAutoDelete(False)
+                writer.signals.finished.connect(self._on_save_finished)
+                self._writers.add(writer)
+                self.write_pool.start(writer)
+                return
+            
+            # Let queued background writes land first so this one is the newest on disk
+            self.write_pool.waitForDone()
+            self.session_manager.save_session(session_data, filepath)
+            self._on_save_finished(filepath, session_data['journal_seq'], True)
             
             if auto_save:
                 print("Auto-save completed")
-            
-            try:
-                self.session_saved.emit(True)
-            except:
-                pass  # Signal may not be available if object is being deleted
-            
+        
         except Exception as e:
             print(f"Error saving session: {e}")
+            self._saved_revision = -1  # retry on the next auto-save
             try:
                 self.session_saved.emit(False)
             except:
                 pass  # Ignore if object is being deleted
-
+    
+    def _on_save_finished(self, filepath: str, journal_seq: int, success: bool):
+        """Compact the journal once a snapshot is on disk."""
+        sender = self.sender()
+        if sender is not None:
+            self._writers = {writer for writer in self._writers if writer.signals is not sender}
+        if success:
+            if self.journal is not None:
+                # The snapshot now covers every answer up to journal_seq
+                self.journal.compact(journal_seq)
+        else:
+            self._saved_revision = -1  # retry on the next auto-save
+        try:
+            self.session_saved.emit(success)
+        except:
+            pass  # Signal may not be available if object is being deleted
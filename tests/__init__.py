@@ -0,0 +1,3 @@
+"""
+Regression tests for the quiz application.
+"""
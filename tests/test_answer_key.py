@@ -0,0 +1,29 @@
+"""Grading one answer at a time and in batches."""
+import numpy as np
+
+from src.models.answer_key import AnswerKeys, grade_batch
+
+QUESTIONS = [
+    {'question': "Single", 'options': {'A': "a", 'B': "b", 'C': "c"}, 'answer': "B"},
+    {'question': "Multi", 'type': "multiChoice", 'options': {'A': "a", 'B': "b", 'C': "c"}, 'answer': ["A", "C"]},
+]
+
+SUBMISSIONS = [
+    [["B"], ["A", "C"]],
+    [["B", "A"], ["C", "A"]],
+    [["A", "B"], ["A"]],
+    [["B", "Z"], ["A", "C", "Z"]],
+    [[], ["A", "B", "C"]],
+]
+
+
+def test_grade_and_grade_batch_agree():
+    keys = AnswerKeys(QUESTIONS)
+    masks = np.array([[keys[q].mask_of(selected) for q, selected in enumerate(row)] for row in SUBMISSIONS],
+                     dtype=np.uint64)
+
+    graded = grade_batch(keys.masks(), masks)
+
+    one_at_a_time = [[keys[q].grade(selected) for q, selected in enumerate(row)] for row in SUBMISSIONS]
+    assert graded['correct'].tolist() == one_at_a_time
+    assert one_at_a_time[1] == [False, True]  # more than one option on a single-choice question is wrong
@@ -0,0 +1,24 @@
+"""Parsing and grading answer-sheet cells."""
+import pytest
+
+from src.utils.exam_generator import generate_exam
+from src.utils.grade_sheets import SheetGrader
+
+
+@pytest.fixture
+def grader(tmp_path) -> SheetGrader:
+    exam_path = str(tmp_path / "exam.json")
+    generate_exam(exam_path, 3, multi_ratio=0)
+    return SheetGrader(exam_path)
+
+
+def test_unknown_keys_are_answered_and_wrong(grader):
+    key = grader.keys[0].correct_keys[0]
+    cells = {'': (False, False), '  ': (False, False), key: (True, True),
+             'Z': (True, False), f"{key};Z": (True, False), 'XYZ': (True, False)}
+
+    _, totals = grader.grade_rows([(str(i), [(0, cell)]) for i, cell in enumerate(cells)])
+
+    answered = [answered for answered, _ in cells.values()]
+    assert totals['answered_counts'].tolist() == [int(a) for a in answered]
+    assert totals['correct'][0] == 1
@@ -0,0 +1,52 @@
+"""Keeping the results aggregate in sync with the results folder."""
+import json
+
+from src.utils.results_store import ResultsStore
+
+
+def write_result(results_dir, number: int, missed_ids) -> str:
+    path = results_dir / f"quiz_results_{number:04d}.json"
+    path.write_text(json.dumps({
+        'exam_info': {'title': "Exam"},
+        'session_info': {'completion_date': f"2025-01-{number + 1:02d}T12:00:00"},
+        'performance': {'incorrect_count': len(missed_ids)},
+        'detailed_results': {'incorrect_answers': [
+            {'question_id': q, 'question': f"Question {q}", 'your_answer': "A", 'correct_answer': "B"}
+            for q in missed_ids]}
+    }))
+    return str(path)
+
+
+def test_unreadable_file_does_not_force_rebuilds(tmp_path, monkeypatch):
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    write_result(results_dir, 0, [1])
+    (results_dir / "quiz_results_0001.json").write_text("{")
+    store = ResultsStore(str(results_dir), str(tmp_path / "results_aggregate.json"))
+    store.refresh()
+    assert store.files["quiz_results_0001.json"]['valid'] is False
+
+    rebuilds = []
+    monkeypatch.setattr(ResultsStore, "rebuild", lambda self: rebuilds.append(self))
+    store.refresh()
+    ResultsStore(str(results_dir), str(tmp_path / "results_aggregate.json")).refresh()
+    assert not rebuilds
+
+
+def test_recorded_misses_survive_reload(tmp_path):
+    results_dir = tmp_path / "results"
+    results_dir.mkdir()
+    store_path = str(tmp_path / "results_aggregate.json")
+    store = ResultsStore(str(results_dir), store_path, compact_min=2)
+    store.refresh()
+    for number in range(5):
+        path = write_result(results_dir, number, [1, number + 10])
+        with open(path) as f:
+            store.record_result(path, json.load(f))
+
+    reloaded = ResultsStore(str(results_dir), store_path)
+    reloaded.refresh()
+    assert reloaded.exams["Exam"]['attempts'] == 5
+    assert reloaded.exams["Exam"]['questions']["id:1"]['misses'] == 5
+    assert len(reloaded.incorrect_answers()) == 10
+    assert reloaded.incorrect_answers()[0]['completion_date'] == "2025-01-05T12:00:00"
@@ -0,0 +1,76 @@
+"""Resuming a saved session from its snapshot and answer journal."""
+from src.models.quiz_engine import IDENTITY_ORDER, QuizEngine
+from src.utils.exam_generator import generate_exam_data
+from src.utils.session_journal import SessionJournal
+
+
+def answer(engine: QuizEngine, positions, correct: bool = True):
+    """Answer the questions at the given positions, right or wrong."""
+    for position in positions:
+        engine.current_index = position
+        key = engine.answer_keys[engine.quiz_view.bank_index(position)]
+        selected = key.correct_keys if correct else [k for k in key.option_keys if k not in key.correct_keys][:1]
+        engine.validate(selected)
+        engine.reset_question_state()
+
+
+def session_data(engine: QuizEngine, journal_seq: int, filepath: str) -> dict:
+    return {'_filepath': filepath, 'quiz_mode': engine.progress_snapshot(), 'journal_seq': journal_seq}
+
+
+def answered_bank_indices(engine: QuizEngine) -> set:
+    return {engine.quiz_view.bank_index(position) for position in engine.answered_questions}
+
+
+def test_exam_order_resumes_unshuffled_with_shuffle_on(tmp_path):
+    exam_data = generate_exam_data(40)
+    filepath = str(tmp_path / "session_20250101_120000.json")
+    engine = QuizEngine(exam_data)
+    journal = SessionJournal(filepath)
+    engine.answer_listeners.append(journal.append)
+
+    answer(engine, [0, 1, 2])
+    snapshot = session_data(engine, journal.seq, filepath)
+    assert snapshot['quiz_mode']['question_order'] == IDENTITY_ORDER
+    answer(engine, [3], correct=False)
+    answer(engine, [4])
+    journal.close()
+
+    resumed = QuizEngine(exam_data, shuffle_enabled=True, session_data=snapshot)
+    resumed.replay(SessionJournal(filepath).read_tail(snapshot['journal_seq']))
+
+    assert list(resumed.quiz_view.order) == list(range(40))
+    assert resumed.answered_questions == engine.answered_questions
+    assert answered_bank_indices(resumed) == answered_bank_indices(engine)
+    assert resumed.score == engine.score == 4
+    assert [w['question'] for w in resumed.wrong_answers] == [w['question'] for w in engine.wrong_answers]
+
+
+def test_shuffled_order_resumes_unchanged(tmp_path):
+    exam_data = generate_exam_data(40)
+    filepath = str(tmp_path / "session_20250101_120000.json")
+    engine = QuizEngine(exam_data, shuffle_enabled=True)
+    journal = SessionJournal(filepath)
+    engine.answer_listeners.append(journal.append)
+
+    answer(engine, [0, 5])
+    snapshot = session_data(engine, journal.seq, filepath)
+    answer(engine, [6, 7], correct=False)
+    journal.close()
+
+    resumed = QuizEngine(exam_data, shuffle_enabled=True, session_data=snapshot)
+    resumed.replay(SessionJournal(filepath).read_tail(snapshot['journal_seq']))
+
+    assert list(resumed.quiz_view.order) == list(engine.quiz_view.order)
+    assert answered_bank_indices(resumed) == answered_bank_indices(engine)
+    assert resumed.score == 2
+    assert len(resumed.wrong_answers) == 2
+
+
+def test_legacy_session_without_positions_is_reshuffled():
+    exam_data = generate_exam_data(40)
+    legacy = {'quiz_mode': {'score': 0, 'total_answered': 0, 'question_order': None}}
+
+    orders = {tuple(QuizEngine(exam_data, shuffle_enabled=True, session_data=legacy).quiz_view.order)
+              for _ in range(5)}
+    assert orders != {tuple(range(40))}